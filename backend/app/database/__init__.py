@@ -1,12 +1,25 @@
+import fcntl
 import json
 import os
-from typing import List, Dict
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Optional
 from pathlib import Path
 
+from app.database.catalog_index import CatalogIndex, FACETS
+from app.database.version_channel import CatalogVersionChannel
+from app.services.metrics import CATALOG_LOAD_SECONDS, CATALOG_RELOAD_SECONDS
+from app.services.tracing import get_tracer
+
 
 class DataLoader:
     """Load and manage catalog data"""
     
+    PRODUCT_CATALOG_FILE = "product_catalog.json"
+    AI_TOOLS_CATALOG_FILE = "ai_tools_catalog.json"
+    VERSION_CHANNEL_FILE = ".catalog_version"
+    WRITE_LOCK_FILE = ".catalog.lock"
+    
     def __init__(self, data_dir: str = None):
         if data_dir is None:
             # Get the data directory relative to this file
@@ -16,40 +29,160 @@ class DataLoader:
         self.data_dir = Path(data_dir)
         self._product_catalog = None
         self._ai_tools_catalog = None
+        self._product_index: Optional[CatalogIndex] = None
+        self._ai_tools_index: Optional[CatalogIndex] = None
+        
+        # Shared with every worker process; None if the file is unusable
+        self.version_channel = CatalogVersionChannel.open(
+            self.data_dir / self.VERSION_CHANNEL_FILE
+        )
+        
+        # Version of the catalogs this process serves; derived caches key on it
+        self.catalog_version = self.shared_catalog_version() or 0
+        
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+    
+    @property
+    def product_catalog_path(self) -> Path:
+        return self.data_dir / self.PRODUCT_CATALOG_FILE
+    
+    @property
+    def ai_tools_catalog_path(self) -> Path:
+        return self.data_dir / self.AI_TOOLS_CATALOG_FILE
     
     def load_product_catalog(self) -> List[Dict]:
         """Load product catalog from JSON"""
-        if self._product_catalog is None:
-            catalog_path = self.data_dir / "product_catalog.json"
-            with open(catalog_path, 'r') as f:
-                data = json.load(f)
-                self._product_catalog = data.get('products', [])
-        return self._product_catalog
+        with get_tracer().span('catalog.load', catalog='products') as span:
+            span.set_attribute('catalog.cached', self._product_catalog is not None)
+            if self._product_catalog is None:
+                self._product_catalog = self._read_catalog(self.product_catalog_path, 'products')
+            span.set_attribute('catalog.size', len(self._product_catalog))
+            return self._product_catalog
     
     def load_ai_tools_catalog(self) -> List[Dict]:
         """Load AI tools catalog from JSON"""
-        if self._ai_tools_catalog is None:
-            catalog_path = self.data_dir / "ai_tools_catalog.json"
-            with open(catalog_path, 'r') as f:
-                data = json.load(f)
-                self._ai_tools_catalog = data.get('ai_tools', [])
-        return self._ai_tools_catalog
+        with get_tracer().span('catalog.load', catalog='ai_tools') as span:
+            span.set_attribute('catalog.cached', self._ai_tools_catalog is not None)
+            if self._ai_tools_catalog is None:
+                self._ai_tools_catalog = self._read_catalog(self.ai_tools_catalog_path, 'ai_tools')
+            span.set_attribute('catalog.size', len(self._ai_tools_catalog))
+            return self._ai_tools_catalog
+    
+    def product_index(self) -> CatalogIndex:
+        """Indexes over the loaded product catalog, rebuilt when it is replaced"""
+        products = self.load_product_catalog()
+        if self._product_index is None or self._product_index.items is not products:
+            self._product_index = CatalogIndex(products, FACETS['products'])
+        return self._product_index
+    
+    def ai_tools_index(self) -> CatalogIndex:
+        """Indexes over the loaded AI tools catalog, rebuilt when it is replaced"""
+        tools = self.load_ai_tools_catalog()
+        if self._ai_tools_index is None or self._ai_tools_index.items is not tools:
+            self._ai_tools_index = CatalogIndex(tools, FACETS['ai_tools'])
+        return self._ai_tools_index
+    
+    def save_product_catalog(self, products: List[Dict]) -> None:
+        """Write the product catalog and publish it as a new version"""
+        self._write_catalog(self.product_catalog_path, {'products': products})
+        self.invalidate()
+    
+    def save_ai_tools_catalog(self, tools: List[Dict]) -> None:
+        """Write the AI tools catalog and publish it as a new version"""
+        self._write_catalog(self.ai_tools_catalog_path, {'ai_tools': tools})
+        self.invalidate()
+    
+    @contextmanager
+    def write_lock(self) -> Iterator[None]:
+        """
+        Serialize catalog read-modify-write cycles across threads and workers
+        
+        Holds an in-process lock plus an exclusive lock on a file next to
+        the catalogs. On entry the loaded catalogs are brought up to the
+        latest published version, so a save made by another worker is never
+        overwritten with stale data. Re-entrant within a thread. Blocks
+        while another writer holds it; async code must enter it, and do its
+        save, from a worker thread.
+        """
+        with self._write_lock:
+            if self._write_depth:
+                self._write_depth += 1
+                try:
+                    yield
+                finally:
+                    self._write_depth -= 1
+                return
+            
+            lock_fd = os.open(self.data_dir / self.WRITE_LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX)
+                shared_version = self.shared_catalog_version()
+                if shared_version is not None and shared_version != self.catalog_version:
+                    self.reload(shared_version)
+                self._write_depth = 1
+                try:
+                    yield
+                finally:
+                    self._write_depth = 0
+            finally:
+                os.close(lock_fd)
+    
+    def invalidate(self) -> None:
+        """
+        Drop loaded catalogs so the next access reloads them
+        
+        Also publishes a new version so other workers pick up the change.
+        """
+        self._product_catalog = None
+        self._ai_tools_catalog = None
+        if self.version_channel:
+            self.catalog_version = self.version_channel.publish()
+        else:
+            self.catalog_version += 1
+    
+    def reload(self, version: Optional[int] = None) -> None:
+        """
+        Read both catalogs from disk and swap them in together
+        
+        Requests keep using the previous lists until the swap, so this can
+        run in the background while the worker serves traffic.
+        """
+        if version is None:
+            version = self.shared_catalog_version() or self.catalog_version + 1
+        
+        with CATALOG_RELOAD_SECONDS.time():
+            products = self._read_catalog(self.product_catalog_path, 'products')
+            tools = self._read_catalog(self.ai_tools_catalog_path, 'ai_tools')
+        
+        self._product_catalog, self._ai_tools_catalog, self.catalog_version = (
+            products, tools, version
+        )
+    
+    def shared_catalog_version(self) -> Optional[int]:
+        """Latest version published by any worker, if the channel is available"""
+        if self.version_channel is None:
+            return None
+        return self.version_channel.read()
     
     def get_product_by_id(self, product_id: str) -> Dict:
         """Get a specific product by ID"""
-        products = self.load_product_catalog()
-        for product in products:
-            if product['id'] == product_id:
-                return product
-        return None
+        return self.product_index().get(product_id)
     
     def get_tool_by_id(self, tool_id: str) -> Dict:
         """Get a specific AI tool by ID"""
-        tools = self.load_ai_tools_catalog()
-        for tool in tools:
-            if tool['id'] == tool_id:
-                return tool
-        return None
+        return self.ai_tools_index().get(tool_id)
+    
+    def _read_catalog(self, path: Path, key: str) -> List[Dict]:
+        with CATALOG_LOAD_SECONDS.time(key), open(path, 'r') as f:
+            return json.load(f).get(key, [])
+    
+    def _write_catalog(self, path: Path, data: Dict) -> None:
+        """Atomically replace a catalog file"""
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
 
 
 # Singleton instance
@@ -0,0 +1,146 @@
+"""
+Catalog index - lookups, filters and facet counts over one catalog list
+"""
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+# Catalog -> facet name -> path of the field inside an item
+FACETS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    'products': {
+        'category': ('category',),
+        'ecosystem': ('matching_criteria', 'ecosystem'),
+        'price_range': ('matching_criteria', 'price_range')
+    },
+    'ai_tools': {
+        'category': ('category',),
+        'specialization': ('matching_criteria', 'specialization'),
+        'cost_efficiency': ('matching_criteria', 'cost_efficiency')
+    }
+}
+
+# Facet value of items that do not set the field
+UNSPECIFIED = 'unspecified'
+
+
+def _facet_value(item: Dict, path: Tuple[str, ...]) -> str:
+    value: Any = item
+    for key in path:
+        if not isinstance(value, dict):
+            return UNSPECIFIED
+        value = value.get(key)
+    if value is None or value == '':
+        return UNSPECIFIED
+    return str(value)
+
+
+class CatalogIndex:
+    """
+    Indexes built once over a loaded catalog list
+    
+    Holds the position of every id and, per facet, the sorted positions of
+    the items with each value. Facet counts, id lookups and filtered pages
+    then cost as much as the postings involved rather than a scan of the
+    catalog. Values match case-insensitively; counts use the spelling seen
+    first. The index never changes: a new catalog list gets a new index.
+    """
+    
+    def __init__(self, items: List[Dict], facets: Dict[str, Tuple[str, ...]]):
+        self.items = items
+        self.facets = facets
+        self.positions: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in facets}
+        self._labels: Dict[str, Dict[str, str]] = {facet: {} for facet in facets}
+        
+        for position, item in enumerate(items):
+            # First occurrence wins, as with a linear search
+            self.positions.setdefault(item.get('id'), position)
+            for facet, path in facets.items():
+                label = _facet_value(item, path)
+                key = label.lower()
+                self._labels[facet].setdefault(key, label)
+                self._postings[facet].setdefault(key, []).append(position)
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def get(self, item_id: str) -> Optional[Dict]:
+        position = self.positions.get(item_id)
+        return None if position is None else self.items[position]
+    
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Item count per value of every facet, largest first"""
+        return {
+            facet: {
+                self._labels[facet][key]: len(positions)
+                for key, positions in sorted(postings.items(), key=lambda entry: -len(entry[1]))
+            }
+            for facet, postings in self._postings.items()
+        }
+    
+    def query(
+        self,
+        filters: Optional[Dict[str, str]] = None,
+        offset: int = 0,
+        limit: int = 50
+    ) -> Tuple[int, List[Dict]]:
+        """
+        Items matching every facet filter, in catalog order
+        
+        Returns:
+            (number of matching items, the ``limit`` items after ``offset``)
+        
+        Raises:
+            ValueError: Filter on a facet this catalog does not have
+        """
+        filters = {facet: value for facet, value in (filters or {}).items() if value}
+        unknown = set(filters) - set(self.facets)
+        if unknown:
+            raise ValueError(f"Unknown filter(s): {', '.join(sorted(unknown))}")
+        
+        if not filters:
+            return len(self.items), self.items[offset:offset + limit]
+        
+        postings = sorted(
+            (self._postings[facet].get(str(value).lower(), []) for facet, value in filters.items()),
+            key=len
+        )
+        smallest, others = postings[0], postings[1:]
+        matches = [
+            position for position in smallest
+            if all(_contains(other, position) for other in others)
+        ]
+        return len(matches), [self.items[position] for position in matches[offset:offset + limit]]
+    
+    def page(
+        self,
+        filters: Optional[Dict[str, str]] = None,
+        page: int = 1,
+        page_size: int = 50,
+        fields: Tuple[str, ...] = ('id', 'name', 'category')
+    ) -> Dict[str, Any]:
+        """
+        One page of matching items, trimmed to ``fields``, with facet counts
+        
+        Raises:
+            ValueError: Bad page numbers or an unknown filter
+        """
+        if page < 1 or page_size < 1:
+            raise ValueError("page and page_size must be positive")
+        matched, items = self.query(filters, offset=(page - 1) * page_size, limit=page_size)
+        has_more = page * page_size < matched
+        return {
+            'count': len(self.items),
+            'matched': matched,
+            'page': page,
+            'page_size': page_size,
+            'pages': -(-matched // page_size),
+            'has_more': has_more,
+            'next_page': page + 1 if has_more else None,
+            'facets': self.counts(),
+            'items': [{field: item.get(field) for field in fields} for item in items]
+        }
+
+
+def _contains(positions: List[int], position: int) -> bool:
+    i = bisect_left(positions, position)
+    return i < len(positions) and positions[i] == position
@@ -0,0 +1,55 @@
+"""
+Catalog version channel - a version counter shared by all local processes
+"""
+from pathlib import Path
+from typing import Optional
+import fcntl
+import mmap
+import os
+import struct
+
+_COUNTER = struct.Struct("<Q")
+
+
+class CatalogVersionChannel:
+    """
+    Monotonic catalog version kept in a small memory-mapped file
+    
+    Every worker maps the same file, so reading the current version is a
+    plain memory read. Publishing increments the counter under an
+    exclusive file lock, which also works for processes that were not
+    forked from a common parent.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size < _COUNTER.size:
+            os.ftruncate(self._fd, _COUNTER.size)
+        self._map = mmap.mmap(self._fd, _COUNTER.size)
+    
+    @classmethod
+    def open(cls, path: Path) -> Optional["CatalogVersionChannel"]:
+        """Open the channel, or return None where the file cannot be shared"""
+        try:
+            return cls(path)
+        except OSError:
+            return None
+    
+    def read(self) -> int:
+        """Current published version"""
+        return _COUNTER.unpack_from(self._map, 0)[0]
+    
+    def publish(self) -> int:
+        """Announce a new catalog version and return it"""
+        # Lock a fresh descriptor: flock locks belong to the open file, and
+        # forked workers share the descriptor opened in the parent
+        lock_fd = os.open(self.path, os.O_RDWR)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            version = self.read() + 1
+            _COUNTER.pack_into(self._map, 0, version)
+            self._map.flush()
+            return version
+        finally:
+            os.close(lock_fd)
@@ -2,13 +2,19 @@
 ZeroDay3 Matching AI - FastAPI Backend
 Main application entry point
 """
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from app.startup import preload, warm_up, memory_usage, worker_index, startup_report
 
-from config import get_settings
-from app.models import HealthCheck
-from app.routers import matching, catalog, admin
+with startup_report.stage("import:fastapi"):
+    from fastapi import FastAPI
+    from fastapi.responses import PlainTextResponse
+    from fastapi.middleware.cors import CORSMiddleware
+    from contextlib import asynccontextmanager
+
+with startup_report.stage("import:app"):
+    from config import get_settings
+    from app.models import HealthCheck
+    from app.routers import matching, catalog, admin, jobs
+    from app.services.metrics import registry as metrics_registry
 
 
 settings = get_settings()
@@ -21,25 +27,70 @@ async def lifespan(app: FastAPI):
     print(f"Starting {settings.app_name} v{settings.app_version}")
     print("Loading data catalogs...")
     
-    # Pre-load catalogs
-    from app.database import get_data_loader
-    data_loader = get_data_loader()
-    products = data_loader.load_product_catalog()
-    tools = data_loader.load_ai_tools_catalog()
-    print(f"Loaded {len(products)} products and {len(tools)} AI tools")
+    # Pre-load catalogs (already done by the parent under app.server)
+    counts = preload()
+    print(f"Loaded {counts['products']} products and {counts['ai_tools']} AI tools")
     
     # Initialize Gemini service
     from app.services.gemini_admin import get_gemini_service
-    gemini_service = get_gemini_service()
+    with startup_report.stage("gemini_init"):
+        gemini_service = get_gemini_service()
     if gemini_service.model:
         print("Gemini AI service initialized")
+    elif gemini_service.backend.available:
+        print(f"Admin commands interpreted by the {gemini_service.backend.name} backend")
     else:
         print("Warning: Gemini AI service not configured (GEMINI_API_KEY not set)")
     
+    # Exercise the match path before accepting traffic
+    warm_up()
+    print(f"Startup: {startup_report.summary()}")
+    
+    # Follow catalog versions published by other workers
+    from app.services.catalog_watcher import get_catalog_watcher
+    catalog_watcher = get_catalog_watcher()
+    catalog_watcher.start()
+    
+    # Git admin commands need the repository checked out at REPOSITORY_PATH
+    from app.services.admin_processes import get_process_runner
+    process_runner = get_process_runner()
+    if not process_runner.is_git_repository:
+        print(
+            f"Warning: {process_runner.repository_path} is not a git repository "
+            f"(REPOSITORY_PATH); git admin commands are disabled"
+        )
+    
+    # Write admin command records in the background
+    from app.services.audit_log import get_audit_log
+    audit_log = get_audit_log()
+    audit_log.start()
+    
+    # Pick up bulk jobs left unfinished by a previous run
+    from app.services.bulk_jobs import get_bulk_job_manager
+    bulk_job_manager = get_bulk_job_manager()
+    resumed = bulk_job_manager.resume()
+    if resumed:
+        print(f"Resumed {resumed} bulk job(s)")
+    bulk_job_manager.start()
+    
+    memory = memory_usage()
+    if 'rss_kb' in memory:
+        print(
+            f"Worker {worker_index()} (pid {memory['pid']}) memory: "
+            f"rss={memory['rss_kb']} kB shared={memory['shared_kb']} kB"
+        )
+    
     yield
     
     # Shutdown
     print("Shutting down...")
+    await catalog_watcher.stop()
+    bulk_job_manager.shutdown()
+    await audit_log.stop()
+    from app.services.tracing import get_tracer
+    get_tracer().close()
+    from app.services.executor import get_match_executor
+    get_match_executor().shutdown()
 
 
 # Create FastAPI app
@@ -63,6 +114,7 @@ app.add_middleware(
 app.include_router(matching.router, prefix=settings.api_prefix)
 app.include_router(catalog.router, prefix=settings.api_prefix)
 app.include_router(admin.router, prefix=settings.api_prefix)
+app.include_router(jobs.router, prefix=settings.api_prefix)
 
 
 @app.get("/", response_model=HealthCheck)
@@ -89,6 +141,17 @@ async def api_health_check():
     )
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """
+    Prometheus metrics for this worker process
+    """
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
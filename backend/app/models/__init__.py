@@ -28,6 +28,11 @@ class CompanyMatchRequest(BaseModel):
         default_factory=list,
         description="Any technical constraints or requirements"
     )
+    latency_budget_ms: Optional[int] = Field(
+        None,
+        description="Answer within this many milliseconds, returning a partial result if needed",
+        ge=1
+    )
 
 
 class IndividualMatchRequest(BaseModel):
@@ -49,6 +54,30 @@ class IndividualMatchRequest(BaseModel):
         default_factory=list,
         description="Primary use cases"
     )
+    latency_budget_ms: Optional[int] = Field(
+        None,
+        description="Answer within this many milliseconds, returning a partial result if needed",
+        ge=1
+    )
+
+
+# Optional response sections that can be requested with ``include=``.
+# Ids, names, categories and scores are always returned.
+COMPANY_RESPONSE_SECTIONS = (
+    'reasoning',
+    'deployment_guide',
+    'technical_truth',
+    'deployment_strategy',
+    'estimated_impact'
+)
+
+INDIVIDUAL_RESPONSE_SECTIONS = (
+    'reasoning',
+    'technical_specs',
+    'technical_truth',
+    'comparison_matrix',
+    'buying_guide'
+)
 
 
 class TechnicalBreakdown(BaseModel):
@@ -64,9 +93,9 @@ class AIToolRecommendation(BaseModel):
     tool_name: str
     category: str
     match_score: float = Field(..., ge=0.0, le=1.0)
-    reasoning: str
-    deployment_guide: Dict[str, Any]
-    technical_truth: TechnicalBreakdown
+    reasoning: Optional[str] = None
+    deployment_guide: Optional[Dict[str, Any]] = None
+    technical_truth: Optional[TechnicalBreakdown] = None
 
 
 class ProductRecommendation(BaseModel):
@@ -75,17 +104,18 @@ class ProductRecommendation(BaseModel):
     product_name: str
     category: str
     match_score: float = Field(..., ge=0.0, le=1.0)
-    reasoning: str
-    technical_specs: Dict[str, Any]
-    technical_truth: TechnicalBreakdown
+    reasoning: Optional[str] = None
+    technical_specs: Optional[Dict[str, Any]] = None
+    technical_truth: Optional[TechnicalBreakdown] = None
 
 
 class CompanyMatchResponse(BaseModel):
     """Response model for company workflow matching"""
     intent_analysis: Dict[str, Any]
     recommendations: List[AIToolRecommendation]
-    deployment_strategy: str
-    estimated_impact: str
+    deployment_strategy: Optional[str] = None
+    estimated_impact: Optional[str] = None
+    partial: Optional[bool] = None  # Set when a latency budget was given
 
 
 class IndividualMatchResponse(BaseModel):
@@ -93,7 +123,8 @@ class IndividualMatchResponse(BaseModel):
     intent_analysis: Dict[str, Any]
     recommendations: List[ProductRecommendation]
     comparison_matrix: Optional[Dict[str, Any]] = None
-    buying_guide: str
+    buying_guide: Optional[str] = None
+    partial: Optional[bool] = None  # Set when a latency budget was given
 
 
 class Product(BaseModel):
@@ -1,11 +1,32 @@
 """
 Admin endpoints for managing the system with Gemini AI
 """
-from fastapi import APIRouter, HTTPException, Depends, Header
-from typing import Optional, List, Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, File, Header, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from contextlib import aclosing
+from typing import AsyncIterator, Optional, List, Dict, Any
 from pydantic import BaseModel
+from datetime import datetime, timezone
+import asyncio
+import csv
+import time
 
+from app.database import get_data_loader
 from app.services.gemini_admin import get_gemini_service
+from app.services.audit_log import get_audit_log
+from app.services.command_parser import get_command_parser
+from app.services.command_cache import get_command_cache
+from app.services.executor import get_match_executor
+from app.services.catalog_import import get_catalog_importer, detect_format
+from app.services.admin_processes import get_process_runner, command_argv, PROCESS_TIMEOUTS
+from app.services.catalog_watcher import get_catalog_watcher
+from app.services.single_flight import get_single_flight
+from app.services.admission import get_admission_controller
+from app.services.profiler import get_request_profiler
+from app.services.tracing import get_tracer
+from app.routers.matching import sse_message
+from app.startup import memory_usage, worker_index, startup_report
 from config import get_settings
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -27,6 +48,7 @@ class AdminCommandResponse(BaseModel):
     message: Optional[str] = None
     output: Optional[str] = None
     error: Optional[str] = None
+    source: Optional[str] = None  # 'local' (fast-path parser), 'cache', the LLM backend or 'fallback'
     timestamp: str
 
 
@@ -71,14 +93,25 @@ async def execute_admin_command(
     - "Run the tests"
     - "Show recent git commits"
     """
-    try:
-        gemini_service = get_gemini_service()
-        result = await gemini_service.execute_command(request.message)
+    started = time.perf_counter()
+    with get_tracer().span("POST /admin/execute", root=True, message_chars=len(request.message)) as span:
+        try:
+            gemini_service = get_gemini_service()
+            result = await gemini_service.execute_command(request.message)
+            span.set_attribute("command", str(result.get("command")))
+            span.set_attribute("source", str(result.get("source")))
+            span.set_attribute("success", bool(result.get("success")))
+            failure = None
+        except Exception as e:
+            failure = f"Command execution failed: {str(e)}"
+            result = {"success": False, "error": failure}
         
-        return AdminCommandResponse(**result)
+        # Queued only; written to the audit log in the background
+        await get_audit_log().record(request.message, result, (time.perf_counter() - started) * 1000)
+        if failure:
+            raise HTTPException(status_code=500, detail=failure)
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Command execution failed: {str(e)}")
+        return AdminCommandResponse(**result)
 
 
 @router.get("/status")
@@ -91,6 +124,8 @@ async def admin_status(authenticated: bool = Depends(verify_admin_token)):
     # Check if Gemini is configured
     gemini_configured = gemini_service.model is not None
     
+    command_cache_stats = await run_in_threadpool(get_command_cache().stats)
+    
     return {
         "status": "operational",
         "gemini_configured": gemini_configured,
@@ -100,10 +135,237 @@ async def admin_status(authenticated: bool = Depends(verify_admin_token)):
             "catalog_management": True,
             "system_monitoring": True,
             "git_integration": True
+        },
+        "command_parser": get_command_parser().stats(),
+        "llm": {
+            "backend": gemini_service.backend.stats(),
+            "batching": gemini_service.batcher.stats()
+        },
+        "command_cache": command_cache_stats,
+        "audit_log": get_audit_log().stats(),
+        "processes": get_process_runner().stats(),
+        "process": {
+            "worker": worker_index(),
+            "memory": memory_usage(),
+            "startup_ms": startup_report.totals()
+        },
+        "catalog": get_catalog_watcher().stats(),
+        "match_pipeline": {
+            "admission": get_admission_controller().stats(),
+            "coalescing": get_single_flight().stats(),
+            "executor": get_match_executor().stats()
         }
     }
 
 
+async def process_events(command: str, argv: List[str]) -> AsyncIterator[bytes]:
+    """Server-Sent Events for one process run: ``line`` per output line, then ``exit``"""
+    timeout = PROCESS_TIMEOUTS[command]
+    try:
+        # Closing the stream, e.g. when the client disconnects, kills the process
+        async with aclosing(get_process_runner().stream(argv, timeout)) as output:
+            async for kind, value in output:
+                if kind == "line":
+                    yield sse_message("line", {"line": value})
+                else:
+                    yield sse_message("exit", {"returncode": value, "success": value == 0})
+    except asyncio.TimeoutError:
+        yield sse_message("error", {"error": f"{command} timed out after {timeout:g} seconds"})
+    except OSError as e:
+        yield sse_message("error", {"error": str(e)})
+
+
+@router.get("/processes/{command}/stream")
+async def stream_process(
+    command: str,
+    count: Optional[int] = Query(None, description="Commits to show (git_log)"),
+    authenticated: bool = Depends(verify_admin_token)
+):
+    """
+    Run ``run_tests``, ``git_status`` or ``git_log`` and stream its output as Server-Sent Events
+    
+    Disconnecting stops the process.
+    """
+    if command not in PROCESS_TIMEOUTS:
+        raise HTTPException(status_code=404, detail=f"Command {command} does not run a process")
+    try:
+        argv = command_argv(command, {"count": count} if count is not None else {})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(
+        process_events(command, argv),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/catalog")
+async def browse_catalog(
+    kind: str = Query(..., pattern="^(products|ai_tools)$"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(settings.admin_catalog_page_size, ge=1, le=settings.admin_catalog_max_page_size),
+    category: Optional[str] = None,
+    ecosystem: Optional[str] = Query(None, description="Products only"),
+    price_range: Optional[str] = Query(None, description="Products only"),
+    specialization: Optional[str] = Query(None, description="AI tools only"),
+    cost_efficiency: Optional[str] = Query(None, description="AI tools only"),
+    authenticated: bool = Depends(verify_admin_token)
+):
+    """
+    One page of products or AI tools, filtered by facet, with counts per facet value
+    
+    Served from indexes kept per catalog version, so the cost does not
+    grow with the size of the catalog.
+    """
+    data_loader = get_data_loader()
+    index = data_loader.product_index() if kind == "products" else data_loader.ai_tools_index()
+    filters = {
+        "category": category,
+        "ecosystem": ecosystem,
+        "price_range": price_range,
+        "specialization": specialization,
+        "cost_efficiency": cost_efficiency
+    }
+    try:
+        return index.page(filters, page=page, page_size=page_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/catalog/import")
+async def import_catalog(
+    kind: str = Query(..., pattern="^(products|ai_tools)$"),
+    file: UploadFile = File(..., description="CSV or NDJSON, one product or AI tool per row"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Default: from the file name"),
+    replace_existing: bool = Query(True, description="Replace items whose id already exists"),
+    dry_run: bool = Query(False, description="Validate and report without saving"),
+    authenticated: bool = Depends(verify_admin_token)
+):
+    """
+    Bulk import products or AI tools
+    
+    Valid rows are saved as one new catalog version; invalid rows are
+    listed in the report with their row number and validation errors.
+    """
+    max_bytes = settings.catalog_import_max_mb * 1024 * 1024
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds {settings.catalog_import_max_mb} MB")
+    
+    fmt = format or detect_format(file.filename, file.content_type)
+    try:
+        return await run_in_threadpool(
+            get_catalog_importer().run, kind, file.file, fmt, replace_existing, dry_run
+        )
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Upload must be UTF-8 encoded")
+    except csv.Error as e:
+        raise HTTPException(status_code=400, detail=f"Malformed CSV: {e}")
+
+
+@router.get("/profiles")
+async def list_profiles(authenticated: bool = Depends(verify_admin_token)):
+    """
+    List stored request profiles, newest first
+    """
+    return {"profiles": get_request_profiler().list_reports()}
+
+
+@router.get("/profiles/{report_id}")
+async def get_profile(
+    report_id: str,
+    limit: int = Query(25, ge=1, le=500),
+    sort: str = Query("tottime", pattern="^(tottime|cumtime)$"),
+    app_only: bool = Query(True, description="Only functions from the app's services, routers and database"),
+    authenticated: bool = Depends(verify_admin_token)
+):
+    """
+    Hottest functions of a profiled request
+    
+    Profile a match request by sending ``X-Profile: 1`` and the admin
+    token; the response's ``X-Profile-Report`` header holds the id.
+    """
+    report = get_request_profiler().report(report_id, limit=limit, sort=sort, app_only=app_only)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"Profile {report_id} not found")
+    return report
+
+
+@router.get("/traces")
+async def list_traces(
+    limit: int = Query(50, ge=1, le=1000),
+    name: Optional[str] = Query(None, description="Root span name, e.g. POST /match/company"),
+    min_duration_ms: float = Query(0.0, ge=0),
+    authenticated: bool = Depends(verify_admin_token)
+):
+    """
+    Recent request traces held by this worker, newest first
+    """
+    return {"traces": get_tracer().traces(limit=limit, name=name, min_duration_ms=min_duration_ms)}
+
+
+@router.get("/traces/{trace_id}")
+async def get_trace(trace_id: str, authenticated: bool = Depends(verify_admin_token)):
+    """
+    One trace with all of its spans, as OpenTelemetry (OTLP/JSON) resource spans
+    """
+    trace = get_tracer().get_trace(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail=f"Trace {trace_id} not found")
+    return trace
+
+
+def _epoch(moment: datetime) -> float:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+@router.get("/audit")
+async def audit_trail(
+    since: Optional[datetime] = Query(None, description="ISO 8601; inclusive"),
+    until: Optional[datetime] = Query(None, description="ISO 8601; exclusive"),
+    command: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    authenticated: bool = Depends(verify_admin_token)
+):
+    """
+    Admin commands executed in a time range, newest first
+    
+    Records reach the log in batches, so the last second or so of
+    commands may not be listed yet. Times without a zone are UTC.
+    """
+    records = await run_in_threadpool(
+        get_audit_log().query,
+        since=_epoch(since) if since else None,
+        until=_epoch(until) if until else None,
+        command=command,
+        limit=limit
+    )
+    return {"count": len(records), "records": records}
+
+
+@router.get("/command-cache")
+async def list_command_cache(
+    limit: int = Query(100, ge=1, le=1000),
+    authenticated: bool = Depends(verify_admin_token)
+):
+    """
+    Cached Gemini interpretations of admin messages, most recently used first
+    """
+    command_cache = get_command_cache()
+    entries = await run_in_threadpool(command_cache.entries, limit=limit)
+    return {"stats": await run_in_threadpool(command_cache.stats), "entries": entries}
+
+
+@router.delete("/command-cache")
+async def clear_command_cache(authenticated: bool = Depends(verify_admin_token)):
+    """
+    Drop every cached interpretation
+    """
+    return {"removed": await run_in_threadpool(get_command_cache().clear)}
+
+
 @router.get("/commands")
 async def list_available_commands(authenticated: bool = Depends(verify_admin_token)):
     """
@@ -113,7 +375,7 @@ async def list_available_commands(authenticated: bool = Depends(verify_admin_tok
         "commands": [
             {
                 "name": "catalog_info",
-                "description": "Get information about products and AI tools",
+                "description": "Browse products and AI tools by page, with counts per category and facet",
                 "example": "Show me all products"
             },
             {
@@ -0,0 +1,129 @@
+"""
+Bulk matching job endpoints
+"""
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse, JSONResponse
+from typing import Optional
+import asyncio
+import shutil
+
+from app.routers.matching import parse_include, INCLUDE_DESCRIPTION
+from app.services.bulk_jobs import get_bulk_job_manager, TRACKS, COMPLETED
+from config import get_settings
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+settings = get_settings()
+
+# Upload bytes collected before each write to disk
+UPLOAD_WRITE_BYTES = 1024 * 1024
+
+
+@router.post("", status_code=202)
+async def submit_job(
+    request: Request,
+    track: str = Query(..., pattern="^(company|individual)$"),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    top_k: int = Query(3, ge=1, le=1000)
+):
+    """
+    Submit an NDJSON file of match requests as a background job
+    
+    Send one request object per line (the same body as ``POST
+    /match/{track}``) as the raw request body. The job runs in chunks
+    between interactive requests; poll ``GET /jobs/{job_id}`` for progress
+    and download ``GET /jobs/{job_id}/results`` when it is completed.
+    
+    File I/O runs on worker threads; the upload is written in 1 MB pieces.
+    """
+    sections = parse_include(include, TRACKS[track][3])
+    manager = get_bulk_job_manager()
+    job = await asyncio.to_thread(manager.create_job, track, sections, top_k=top_k)
+    job_dir = manager.jobs_dir / job["id"]
+    
+    max_bytes = settings.bulk_max_upload_mb * 1024 * 1024
+    size = 0
+    lines = 0
+    last_byte = b"\n"
+    pending = []
+    pending_bytes = 0
+    f = await asyncio.to_thread(open, manager.input_path(job["id"]), "wb")
+    try:
+        async for chunk in request.stream():
+            if not chunk:
+                continue
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Upload exceeds {settings.bulk_max_upload_mb} MB"
+                )
+            lines += chunk.count(b"\n")
+            last_byte = chunk[-1:]
+            pending.append(chunk)
+            pending_bytes += len(chunk)
+            if pending_bytes >= UPLOAD_WRITE_BYTES:
+                await asyncio.to_thread(f.write, b"".join(pending))
+                pending, pending_bytes = [], 0
+        if pending:
+            await asyncio.to_thread(f.write, b"".join(pending))
+        
+    except BaseException:
+        await asyncio.to_thread(f.close)
+        await asyncio.to_thread(shutil.rmtree, job_dir, ignore_errors=True)
+        raise
+    
+    await asyncio.to_thread(f.close)
+    
+    if last_byte != b"\n":
+        lines += 1
+    if lines == 0:
+        await asyncio.to_thread(shutil.rmtree, job_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail="Job input is empty")
+    
+    job = await asyncio.to_thread(manager.submit, job, size, lines)
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job["id"], "status": job["status"], "input_lines": lines}
+    )
+
+
+@router.get("")
+async def list_jobs():
+    """
+    List bulk jobs, newest first
+    """
+    return {"jobs": get_bulk_job_manager().list_jobs()}
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """
+    Status and progress of a bulk job
+    """
+    job = get_bulk_job_manager().get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.get("/{job_id}/results")
+async def get_job_results(job_id: str):
+    """
+    Download a completed job's results as NDJSON
+    
+    Each line is ``{"line": n, "result": {...}}`` or, for an input line
+    that failed, ``{"line": n, "error": "..."}``; ``n`` is the 1-based
+    input line number.
+    """
+    manager = get_bulk_job_manager()
+    job = manager.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if job["status"] != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job['status']}")
+    
+    return FileResponse(
+        manager.output_path(job_id),
+        media_type="application/x-ndjson",
+        filename=f"{job_id}.ndjson"
+    )
@@ -1,8 +1,15 @@
 """
 Matching endpoints for company and individual tracks
 """
-from fastapi import APIRouter, HTTPException
-from typing import List
+import json
+import time
+
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel
+from typing import AsyncIterator, Dict, Any, Iterator, Optional, Tuple, FrozenSet, Type
 
 from app.models import (
     CompanyMatchRequest,
@@ -11,18 +18,197 @@ from app.models import (
     IndividualMatchResponse,
     AIToolRecommendation,
     ProductRecommendation,
-    TechnicalBreakdown
+    COMPANY_RESPONSE_SECTIONS,
+    INDIVIDUAL_RESPONSE_SECTIONS
 )
 from app.services.analyze_intent import get_intent_analyzer
 from app.services.cross_reference import get_cross_reference_engine
-from app.services.generate_instructions import get_instruction_generator
+from app.services import match_pipeline
+from app.services.executor import get_match_executor
+from app.services.single_flight import get_single_flight
+from app.services.admission import get_admission_controller, DEGRADE, REJECT
+from app.services.metrics import MATCH_REQUEST_SECONDS, MATCH_REQUESTS
+from app.services.profiler import get_request_profiler
+from app.services.tracing import get_tracer, current_span
 from app.database import get_data_loader
+from config import get_settings
 
 router = APIRouter(prefix="/match", tags=["matching"])
+settings = get_settings()
+
+INCLUDE_DESCRIPTION = (
+    "Comma-separated optional sections to return. Omit for all sections; "
+    "pass 'none' (or an empty value) for ids and scores only."
+)
+
+
+def parse_include(include: Optional[str], available: Tuple[str, ...]) -> FrozenSet[str]:
+    """Parse an ``include=`` query value into the set of requested sections"""
+    if include is None or include.strip() == 'all':
+        return frozenset(available)
+    
+    sections = frozenset(
+        part.strip() for part in include.split(',')
+        if part.strip() and part.strip() != 'none'
+    )
+    unknown = sections - set(available)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include section(s): {', '.join(sorted(unknown))}. "
+                   f"Available: {', '.join(available)}"
+        )
+    return sections
+
+
+def encode_payload(payload: Dict[str, Any], model: Type[BaseModel]) -> bytes:
+    """
+    Serialize a pipeline payload straight to JSON bytes
+    
+    The payload is already shaped like ``model``; FastAPI's response_model
+    validation is skipped by returning a Response. Conformance is only
+    checked in debug mode.
+    """
+    if settings.debug:
+        model.model_validate(payload)
+    return orjson.dumps(payload)
+
+
+def json_response(content: bytes) -> Response:
+    return Response(content=content, media_type="application/json")
+
+
+def request_key(
+    track: str,
+    request: BaseModel,
+    text_field: str,
+    sections: FrozenSet[str],
+    budget_ms: Optional[int] = None
+) -> tuple:
+    """
+    Canonical key for coalescing identical match requests
+    
+    The free-text field is only ever analyzed lowercased, so case does not
+    change the result. The catalog version keeps requests that straddle a
+    catalog change apart, and the latency budget keeps budgeted (possibly
+    partial) results apart from full ones.
+    """
+    fields = request.model_dump(exclude={'latency_budget_ms'})
+    fields[text_field] = fields[text_field].lower()
+    return (
+        track,
+        json.dumps(fields, sort_keys=True),
+        tuple(sorted(sections)),
+        get_data_loader().catalog_version,
+        budget_ms
+    )
+
+
+def latency_budget(request: BaseModel, x_latency_budget_ms: Optional[str]) -> Optional[int]:
+    """Effective latency budget in ms: the tighter of the request field and the header"""
+    budgets = [request.latency_budget_ms] if request.latency_budget_ms else []
+    if x_latency_budget_ms:
+        try:
+            header_budget = int(x_latency_budget_ms)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="X-Latency-Budget-Ms must be an integer")
+        if header_budget < 1:
+            raise HTTPException(status_code=400, detail="X-Latency-Budget-Ms must be positive")
+        budgets.append(header_budget)
+    return min(budgets) if budgets else None
+
+
+async def run_coalesced(key: tuple, func, *args) -> bytes:
+    """Run ``func`` on the match executor, shared with identical in-flight requests"""
+    single_flight = get_single_flight()
+    current_span().set_attribute('match.coalesced', single_flight.is_in_flight(key))
+    return await single_flight.do(
+        key,
+        lambda: get_match_executor().run(func, *args)
+    )
+
+
+def admit() -> str:
+    """Take an admission decision; overload beyond the degraded tier is answered 503"""
+    decision = get_admission_controller().acquire()
+    if decision == REJECT:
+        raise HTTPException(
+            status_code=503,
+            detail="Matching is overloaded, retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    return decision
+
+
+async def match_admission() -> AsyncIterator[str]:
+    """Admission control for match requests; yields the decision for this request"""
+    decision = admit()
+    try:
+        yield decision
+    finally:
+        get_admission_controller().release(decision)
+
+
+def admitted_sections(sections: FrozenSet[str], admission: str) -> FrozenSet[str]:
+    """Sections to build under ``admission``: ids and scores only when degraded"""
+    return frozenset() if admission == DEGRADE else sections
+
+
+def profiling_requested(x_profile: Optional[str], x_admin_token: Optional[str]) -> bool:
+    """True when the caller asked to profile this request; requires the admin token"""
+    if x_profile not in ('1', 'true'):
+        return False
+    if x_admin_token != settings.admin_secret_key:
+        raise HTTPException(status_code=403, detail="Profiling requires a valid admin token")
+    return True
+
+
+async def run_profiled(func, *args) -> Response:
+    """
+    Run ``func`` alone under the profiler, bypassing request coalescing
+    
+    The report id is returned in the ``X-Profile-Report`` header; fetch the
+    report from ``GET /api/admin/profiles/{id}``.
+    """
+    body, report_id = await get_match_executor().run(get_request_profiler().run, func, *args)
+    response = json_response(body)
+    response.headers['X-Profile-Report'] = report_id
+    return response
+
+
+def _company_body(
+    request: CompanyMatchRequest,
+    sections: FrozenSet[str],
+    deadline: Optional[float] = None
+) -> bytes:
+    payload = match_pipeline.run_company_match(request, sections, deadline=deadline)
+    with match_pipeline.stage('company', 'serialization') as span:
+        body = encode_payload(payload, CompanyMatchResponse)
+        span.set_attribute('response_bytes', len(body))
+        return body
+
+
+def _individual_body(
+    request: IndividualMatchRequest,
+    sections: FrozenSet[str],
+    deadline: Optional[float] = None
+) -> bytes:
+    payload = match_pipeline.run_individual_match(request, sections, deadline=deadline)
+    with match_pipeline.stage('individual', 'serialization') as span:
+        body = encode_payload(payload, IndividualMatchResponse)
+        span.set_attribute('response_bytes', len(body))
+        return body
 
 
 @router.post("/company", response_model=CompanyMatchResponse)
-async def match_company_workflow(request: CompanyMatchRequest):
+async def match_company_workflow(
+    request: CompanyMatchRequest,
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    x_profile: Optional[str] = Header(None),
+    x_admin_token: Optional[str] = Header(None),
+    x_latency_budget_ms: Optional[str] = Header(None),
+    admission: str = Depends(match_admission)
+):
     """
     Match company workflow to AI tools
     
@@ -30,73 +216,58 @@ async def match_company_workflow(request: CompanyMatchRequest):
     1. Submission: Company inputs a specific friction point
     2. Mapping: System identifies the best LLM or Agentic Workflow
     3. Instruction: Generates deployment guide
+    
+    Sections not listed in ``include`` are neither generated nor returned.
+    Under overload only ids and scores are returned, flagged by the
+    ``X-Degraded`` header. Send ``X-Profile: 1`` with the admin token to
+    profile the request.
+    
+    With a latency budget (``latency_budget_ms`` or the
+    ``X-Latency-Budget-Ms`` header) the best result found in time is
+    returned and ``partial`` says whether it was cut short.
     """
-    try:
-        # Step 1: Analyze Intent
-        intent_analyzer = get_intent_analyzer()
-        intent_analysis = intent_analyzer.analyze_company_intent(
-            request.friction_point,
-            company_size=request.company_size,
-            industry=request.industry,
-            technical_constraints=request.technical_constraints
-        )
-        
-        # Step 2: Cross-reference with AI tools catalog
-        data_loader = get_data_loader()
-        ai_tools = data_loader.load_ai_tools_catalog()
-        
-        cross_ref_engine = get_cross_reference_engine()
-        matches = cross_ref_engine.match_ai_tools(intent_analysis, ai_tools)
-        
-        # Step 3: Generate deployment instructions
-        instruction_generator = get_instruction_generator()
-        
-        # Take top 3 matches
-        top_matches = matches[:3]
-        recommendations = []
-        
-        for tool, score in top_matches:
-            deployment_info = instruction_generator.generate_deployment_guide(
-                tool, intent_analysis, score
-            )
+    started = time.perf_counter()
+    sections = admitted_sections(parse_include(include, COMPANY_RESPONSE_SECTIONS), admission)
+    profile = profiling_requested(x_profile, x_admin_token)
+    budget_ms = latency_budget(request, x_latency_budget_ms)
+    deadline = started + budget_ms / 1000 if budget_ms else None
+    
+    with get_tracer().span(
+        'POST /match/company', root=True, track='company', sections=sorted(sections),
+        profiled=profile, admission=admission, latency_budget_ms=budget_ms or 0
+    ) as span:
+        try:
+            if profile:
+                response = await run_profiled(_company_body, request, sections, deadline)
+            else:
+                response = json_response(await run_coalesced(
+                    request_key('company', request, 'friction_point', sections, budget_ms),
+                    _company_body, request, sections, deadline
+                ))
+            MATCH_REQUESTS.inc('company', 'ok')
+            if admission == DEGRADE:
+                response.headers['X-Degraded'] = 'sections-omitted'
+            if span.trace_id:
+                response.headers['X-Trace-Id'] = span.trace_id
+            return response
             
-            recommendations.append(
-                AIToolRecommendation(
-                    tool_id=deployment_info['tool_id'],
-                    tool_name=deployment_info['tool_name'],
-                    category=deployment_info['category'],
-                    match_score=deployment_info['match_score'],
-                    reasoning=deployment_info['reasoning'],
-                    deployment_guide=deployment_info['deployment_guide'],
-                    technical_truth=TechnicalBreakdown(**deployment_info['technical_truth'])
-                )
-            )
-        
-        # Generate overall strategy
-        deployment_strategy = instruction_generator.generate_deployment_strategy(
-            [rec.dict() for rec in recommendations],
-            intent_analysis
-        )
-        
-        # Estimate impact
-        estimated_impact = instruction_generator.estimate_impact(
-            intent_analysis,
-            [rec.dict() for rec in recommendations]
-        )
-        
-        return CompanyMatchResponse(
-            intent_analysis=intent_analysis,
-            recommendations=recommendations,
-            deployment_strategy=deployment_strategy,
-            estimated_impact=estimated_impact
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Matching error: {str(e)}")
+        except Exception as e:
+            MATCH_REQUESTS.inc('company', 'error')
+            raise HTTPException(status_code=500, detail=f"Matching error: {str(e)}")
+            
+        finally:
+            MATCH_REQUEST_SECONDS.observe(time.perf_counter() - started, 'company')
 
 
 @router.post("/individual", response_model=IndividualMatchResponse)
-async def match_individual_product(request: IndividualMatchRequest):
+async def match_individual_product(
+    request: IndividualMatchRequest,
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    x_profile: Optional[str] = Header(None),
+    x_admin_token: Optional[str] = Header(None),
+    x_latency_budget_ms: Optional[str] = Header(None),
+    admission: str = Depends(match_admission)
+):
     """
     Match individual to products
     
@@ -104,69 +275,321 @@ async def match_individual_product(request: IndividualMatchRequest):
     1. Submission: Individual inputs a need
     2. Evaluation: System bypasses marketing hype
     3. Selection: Provides specific recommendation with technical breakdown
+    
+    Sections not listed in ``include`` are neither generated nor returned.
+    Under overload only ids and scores are returned, flagged by the
+    ``X-Degraded`` header. Send ``X-Profile: 1`` with the admin token to
+    profile the request.
+    
+    With a latency budget (``latency_budget_ms`` or the
+    ``X-Latency-Budget-Ms`` header) the best result found in time is
+    returned and ``partial`` says whether it was cut short.
     """
-    try:
-        # Step 1: Analyze Intent
-        intent_analyzer = get_intent_analyzer()
-        intent_analysis = intent_analyzer.analyze_individual_intent(
-            request.need,
-            budget_range=request.budget_range,
-            ecosystem_preference=request.ecosystem_preference,
-            primary_use_cases=request.primary_use_cases
-        )
-        
-        # Step 2: Cross-reference with product catalog
-        data_loader = get_data_loader()
-        products = data_loader.load_product_catalog()
-        
-        cross_ref_engine = get_cross_reference_engine()
-        matches = cross_ref_engine.match_products(intent_analysis, products)
-        
-        # Step 3: Generate product recommendations
-        instruction_generator = get_instruction_generator()
-        
-        # Take top 3 matches
-        top_matches = matches[:3]
-        recommendations = []
-        
-        for product, score in top_matches:
-            product_info = instruction_generator.generate_product_recommendation(
-                product, intent_analysis, score
-            )
+    started = time.perf_counter()
+    sections = admitted_sections(parse_include(include, INDIVIDUAL_RESPONSE_SECTIONS), admission)
+    profile = profiling_requested(x_profile, x_admin_token)
+    budget_ms = latency_budget(request, x_latency_budget_ms)
+    deadline = started + budget_ms / 1000 if budget_ms else None
+    
+    with get_tracer().span(
+        'POST /match/individual', root=True, track='individual', sections=sorted(sections),
+        profiled=profile, admission=admission, latency_budget_ms=budget_ms or 0
+    ) as span:
+        try:
+            if profile:
+                response = await run_profiled(_individual_body, request, sections, deadline)
+            else:
+                response = json_response(await run_coalesced(
+                    request_key('individual', request, 'need', sections, budget_ms),
+                    _individual_body, request, sections, deadline
+                ))
+            MATCH_REQUESTS.inc('individual', 'ok')
+            if admission == DEGRADE:
+                response.headers['X-Degraded'] = 'sections-omitted'
+            if span.trace_id:
+                response.headers['X-Trace-Id'] = span.trace_id
+            return response
             
-            recommendations.append(
-                ProductRecommendation(
-                    product_id=product_info['product_id'],
-                    product_name=product_info['product_name'],
-                    category=product_info['category'],
-                    match_score=product_info['match_score'],
-                    reasoning=product_info['reasoning'],
-                    technical_specs=product_info['technical_specs'],
-                    technical_truth=TechnicalBreakdown(**product_info['technical_truth'])
-                )
-            )
-        
-        # Generate buying guide
-        buying_guide = instruction_generator.generate_buying_guide(
-            [rec.dict() for rec in recommendations],
-            intent_analysis
-        )
-        
-        # Create comparison matrix if multiple recommendations
-        comparison_matrix = None
-        if len(recommendations) > 1:
-            comparison_matrix = {
-                'products': [rec.product_name for rec in recommendations],
-                'categories': [rec.category for rec in recommendations],
-                'match_scores': [rec.match_score for rec in recommendations]
-            }
+        except Exception as e:
+            MATCH_REQUESTS.inc('individual', 'error')
+            raise HTTPException(status_code=500, detail=f"Matching error: {str(e)}")
+            
+        finally:
+            MATCH_REQUEST_SECONDS.observe(time.perf_counter() - started, 'individual')
+
+
+def sse_message(event: str, data: Dict[str, Any]) -> bytes:
+    """Encode one Server-Sent Event"""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+async def sse_events(track: str, events: Iterator[Tuple[str, Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """
+    Drive a pipeline event generator on the match executor and encode its events
+    
+    Each step runs on the executor like a regular match, so streaming does
+    not block the event loop. Ends with a ``done`` event, or an ``error``
+    event if the pipeline fails part-way.
+    """
+    executor = get_match_executor()
+    started = time.perf_counter()
+    
+    with get_tracer().span(f'POST /match/{track}/stream', root=True, track=track) as span:
+        count = 0
+        try:
+            while True:
+                item = await executor.run(next, events, None)
+                if item is None:
+                    break
+                event, data = item
+                if event == 'recommendation':
+                    count += 1
+                yield sse_message(event, data)
+            
+            MATCH_REQUESTS.inc(f'{track}_stream', 'ok')
+            yield sse_message('done', {'recommendations': count})
+            
+        except Exception as e:
+            MATCH_REQUESTS.inc(f'{track}_stream', 'error')
+            span.set_error(e)
+            yield sse_message('error', {'detail': f"Matching error: {str(e)}"})
+            
+        finally:
+            try:
+                events.close()
+            except ValueError:
+                # Still running on the executor after a disconnect; it ends on its own
+                pass
+            span.set_attribute('recommendations', count)
+            MATCH_REQUEST_SECONDS.observe(time.perf_counter() - started, f'{track}_stream')
+
+
+def sse_response(track: str, events: Iterator[Tuple[str, Dict[str, Any]]], decision: str) -> StreamingResponse:
+    """Stream ``events``; the admission slot is held until the stream ends"""
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    if decision == DEGRADE:
+        headers['X-Degraded'] = 'sections-omitted'
+    return StreamingResponse(
+        sse_events(track, events),
+        media_type="text/event-stream",
+        headers=headers,
+        background=BackgroundTask(get_admission_controller().release, decision)
+    )
+
+
+STREAM_TOP_K_DESCRIPTION = "Number of recommendations to stream"
+
+
+@router.post("/company/stream")
+async def stream_company_workflow(
+    request: CompanyMatchRequest,
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    top_k: int = Query(3, ge=1, le=1000, description=STREAM_TOP_K_DESCRIPTION)
+):
+    """
+    Company workflow as Server-Sent Events
+    
+    Emits ``intent`` first, then one ``recommendation`` event per tool as
+    soon as it is scored and rendered (with its ``rank``), then ``summary``
+    with the deployment strategy and estimated impact, and finally ``done``.
+    """
+    sections = parse_include(include, COMPANY_RESPONSE_SECTIONS)
+    decision = admit()
+    sections = admitted_sections(sections, decision)
+    return sse_response(
+        'company',
+        match_pipeline.stream_company_match(request, sections, top_k),
+        decision
+    )
+
+
+@router.post("/individual/stream")
+async def stream_individual_product(
+    request: IndividualMatchRequest,
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    top_k: int = Query(3, ge=1, le=1000, description=STREAM_TOP_K_DESCRIPTION)
+):
+    """
+    Individual workflow as Server-Sent Events
+    
+    Emits ``intent``, one ``recommendation`` event per product, then
+    ``summary`` with the comparison matrix and buying guide, and ``done``.
+    """
+    sections = parse_include(include, INDIVIDUAL_RESPONSE_SECTIONS)
+    decision = admit()
+    sections = admitted_sections(sections, decision)
+    return sse_response(
+        'individual',
+        match_pipeline.stream_individual_match(request, sections, top_k),
+        decision
+    )
+
+
+def _expanded_tool_body(tool: Dict, request: CompanyMatchRequest, sections: FrozenSet[str]) -> bytes:
+    intent_analysis = match_pipeline.analyze_company(request)
+    [(_, score)] = get_cross_reference_engine().match_ai_tools(
+        intent_analysis, [tool], match_pipeline.text_similarities('ai_tools', request.friction_point, [tool])
+    )
+    recommendation, _ = match_pipeline.tool_recommendation(tool, score, intent_analysis, sections)
+    return encode_payload(recommendation, AIToolRecommendation)
+
+
+def _expanded_product_body(product: Dict, request: IndividualMatchRequest, sections: FrozenSet[str]) -> bytes:
+    intent_analysis = match_pipeline.analyze_individual(request)
+    [(_, score)] = get_cross_reference_engine().match_products(
+        intent_analysis, [product], match_pipeline.text_similarities('products', request.need, [product])
+    )
+    recommendation, _ = match_pipeline.product_recommendation(product, score, intent_analysis, sections)
+    return encode_payload(recommendation, ProductRecommendation)
+
+
+@router.post("/company/recommendations/{tool_id}", response_model=AIToolRecommendation)
+async def expand_company_recommendation(
+    tool_id: str,
+    request: CompanyMatchRequest,
+    admission: str = Depends(match_admission)
+):
+    """
+    Expand a single AI tool recommendation with all sections
+    
+    Send the same body as ``POST /match/company``; only the requested tool
+    is scored and its deployment guide generated. Under overload only the
+    id and score are returned, flagged by the ``X-Degraded`` header.
+    """
+    tool = get_data_loader().get_tool_by_id(tool_id)
+    if not tool:
+        raise HTTPException(status_code=404, detail=f"Tool {tool_id} not found")
+    
+    sections = admitted_sections(frozenset(COMPANY_RESPONSE_SECTIONS), admission)
+    try:
+        response = json_response(await run_coalesced(
+            request_key(f'company/{tool_id}', request, 'friction_point', sections),
+            _expanded_tool_body, tool, request, sections
+        ))
         
-        return IndividualMatchResponse(
-            intent_analysis=intent_analysis,
-            recommendations=recommendations,
-            comparison_matrix=comparison_matrix,
-            buying_guide=buying_guide
-        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Matching error: {str(e)}")
+    
+    if admission == DEGRADE:
+        response.headers['X-Degraded'] = 'sections-omitted'
+    return response
+
+
+@router.post("/individual/recommendations/{product_id}", response_model=ProductRecommendation)
+async def expand_individual_recommendation(
+    product_id: str,
+    request: IndividualMatchRequest,
+    admission: str = Depends(match_admission)
+):
+    """
+    Expand a single product recommendation with all sections
+    
+    Send the same body as ``POST /match/individual``; only the requested
+    product is scored and described. Under overload only the id and score
+    are returned, flagged by the ``X-Degraded`` header.
+    """
+    product = get_data_loader().get_product_by_id(product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail=f"Product {product_id} not found")
+    
+    sections = admitted_sections(frozenset(INDIVIDUAL_RESPONSE_SECTIONS), admission)
+    try:
+        response = json_response(await run_coalesced(
+            request_key(f'individual/{product_id}', request, 'need', sections),
+            _expanded_product_body, product, request, sections
+        ))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Matching error: {str(e)}")
+    
+    if admission == DEGRADE:
+        response.headers['X-Degraded'] = 'sections-omitted'
+    return response
+
+
+# Context fields accepted by the as-you-type preview, per track
+PREVIEW_CONTEXT_FIELDS = {
+    'company': ('company_size', 'industry', 'technical_constraints'),
+    'individual': ('budget_range', 'ecosystem_preference', 'primary_use_cases')
+}
+
+# Longest typed text kept per preview session for text similarity
+PREVIEW_MAX_TEXT_CHARS = 10000
+
+
+@router.websocket("/preview")
+async def match_preview(websocket: WebSocket, track: str = "company"):
+    """
+    As-you-type match preview
+    
+    Connect with ``?track=company`` or ``?track=individual`` and send JSON
+    messages while the user types:
+        
+        {"append": "newly typed text", "context": {...}, "reset": false}
+    
+    Each message is answered with the current intent analysis and the top 3
+    candidates. Only the appended text is analyzed; the catalog is re-scored
+    only when the matched keywords or the context actually changed (or the
+    text, when text similarity is blended in). Scoring runs on the match
+    executor and ranks exactly like ``/match`` for the same text.
+    """
+    if track not in PREVIEW_CONTEXT_FIELDS:
+        await websocket.close(code=1008, reason=f"Unknown track: {track}")
+        return
+    
+    await websocket.accept()
+    
+    state = get_intent_analyzer().start_session(track)
+    context: Dict[str, Any] = {}
+    text = ''
+    snapshot = None
+    blend_text = get_cross_reference_engine().text_similarity_weight > 0
+    
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                await websocket.send_json({"error": "Expected a JSON object"})
+                continue
+            
+            changed = snapshot is None
+            
+            if message.get('reset'):
+                state.reset()
+                text = ''
+                changed = True
+            
+            new_context = message.get('context')
+            if isinstance(new_context, dict):
+                new_context = {
+                    key: value for key, value in new_context.items()
+                    if key in PREVIEW_CONTEXT_FIELDS[track]
+                }
+                if new_context != context:
+                    context = new_context
+                    changed = True
+            
+            appended = message.get('append') or ''
+            if isinstance(appended, str) and appended:
+                if state.append(appended):
+                    changed = True
+                if len(text) < PREVIEW_MAX_TEXT_CHARS:
+                    text += appended[:PREVIEW_MAX_TEXT_CHARS - len(text)]
+                    changed = changed or blend_text
+            
+            if changed:
+                intent_analysis = state.analyze(**context)
+                snapshot = {
+                    'intent_analysis': intent_analysis,
+                    'candidates': await get_match_executor().run(
+                        match_pipeline.preview_candidates, track, intent_analysis, 3, text
+                    )
+                }
+            
+            await websocket.send_json({**snapshot, 'length': state.length, 'changed': changed})
+    
+    except WebSocketDisconnect:
+        pass
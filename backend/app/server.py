@@ -0,0 +1,211 @@
+"""
+Pre-fork server - load catalogs once, then fork workers that share them
+
+Usage:
+    python -m app.server [--workers N] [--host HOST] [--port PORT]
+
+The parent imports the app, loads both catalogs and builds the match
+services, freezes the heap with ``gc.freeze()`` and only then forks. Each
+worker inherits that state through copy-on-write pages instead of
+re-parsing the catalogs, and all workers accept on one shared socket.
+Crashed workers are restarted with exponential backoff, and a worker that
+keeps crashing is given up.
+"""
+from collections import deque
+from typing import Deque, Dict
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from config import get_settings
+from app.startup import preload, warm_up, startup_report, WORKER_INDEX_ENV
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    """Create the listening socket shared by all workers"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _serve(app, sock: socket.socket, index: int) -> None:
+    """Run one uvicorn server on the shared socket"""
+    os.environ[WORKER_INDEX_ENV] = str(index)
+    config = uvicorn.Config(app, proxy_headers=True, server_header=False)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(app, sock: socket.socket, index: int) -> int:
+    """Fork a worker process and return its pid"""
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        gc.enable()
+        try:
+            _serve(app, sock, index)
+        finally:
+            os._exit(0)
+    return pid
+
+
+class RestartPolicy:
+    """
+    When to restart a crashed worker, per worker index
+    
+    The delay doubles with each consecutive crash, from ``delay`` up to
+    ``max_delay``; a worker that ran for ``window`` seconds starts over.
+    More than ``max_restarts`` crashes within ``window`` seconds and the
+    worker is given up.
+    """
+    
+    def __init__(self, delay: float, max_delay: float, max_restarts: int, window: float):
+        self.delay = delay
+        self.max_delay = max_delay
+        self.max_restarts = max_restarts
+        self.window = window
+        self._crashes: Dict[int, Deque[float]] = {}
+        self._consecutive: Dict[int, int] = {}
+    
+    def next_delay(self, index: int, uptime: float, now: float) -> float:
+        """
+        Seconds to wait before restarting worker ``index``
+        
+        Returns:
+            The delay, or -1 when the worker crashes too often to restart
+        """
+        crashes = self._crashes.setdefault(index, deque())
+        crashes.append(now)
+        while crashes and crashes[0] <= now - self.window:
+            crashes.popleft()
+        if len(crashes) > self.max_restarts:
+            return -1
+        
+        consecutive = 1 if uptime >= self.window else self._consecutive.get(index, 0) + 1
+        self._consecutive[index] = consecutive
+        return min(self.delay * 2 ** (consecutive - 1), self.max_delay)
+
+
+def run(workers: int, host: str, port: int) -> None:
+    """Preload shared state, then serve with ``workers`` processes"""
+    # Keep the collector from touching (and un-sharing) preloaded objects
+    gc.disable()
+    
+    from app.main import app
+    
+    counts = preload()
+    warm_up()
+    print(
+        f"Preloaded {counts['products']} products and {counts['ai_tools']} AI tools "
+        f"({startup_report.summary()})"
+    )
+    
+    sock = _bind_socket(host, port)
+    
+    if workers <= 1:
+        gc.enable()
+        _serve(app, sock, 0)
+        return
+    
+    gc.collect()
+    gc.freeze()
+    
+    settings = get_settings()
+    policy = RestartPolicy(
+        settings.worker_restart_delay,
+        settings.worker_restart_max_delay,
+        settings.worker_max_restarts,
+        settings.worker_restart_window
+    )
+    children: Dict[int, int] = {}
+    started: Dict[int, float] = {}
+    pending: Dict[int, float] = {}  # Worker index -> when to restart it
+    for index in range(workers):
+        children[_spawn(app, sock, index)] = index
+        started[index] = time.monotonic()
+    print(f"Started {workers} workers on {host}:{port}")
+    
+    stopping = False
+    
+    def _stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+    
+    while children or (pending and not stopping):
+        now = time.monotonic()
+        for index, restart_at in list(pending.items()):
+            if restart_at <= now and not stopping:
+                del pending[index]
+                children[_spawn(app, sock, index)] = index
+                started[index] = now
+        
+        try:
+            if pending:
+                # Poll so restarts that come due are not held up by os.wait()
+                pid, status = os.waitpid(-1, os.WNOHANG)
+                if pid == 0:
+                    time.sleep(min(0.1, max(0.0, min(pending.values()) - now)))
+                    continue
+            else:
+                pid, status = os.wait()
+        except ChildProcessError:
+            if pending and not stopping:
+                time.sleep(min(0.1, max(0.0, min(pending.values()) - now)))
+                continue
+            break
+        except InterruptedError:
+            continue
+        
+        index = children.pop(pid, None)
+        if index is None or stopping:
+            continue
+        
+        now = time.monotonic()
+        delay = policy.next_delay(index, now - started[index], now)
+        if delay < 0:
+            print(
+                f"Worker {index} (pid {pid}) exited with status {status}; it exited "
+                f"{policy.max_restarts + 1} times within {policy.window:g}s, giving up on it"
+            )
+            continue
+        print(f"Worker {index} (pid {pid}) exited with status {status}, restarting in {delay:g}s")
+        pending[index] = now + delay
+    
+    sock.close()
+    if not stopping:
+        print("No workers left, exiting")
+        sys.exit(1)
+
+
+def main(argv=None) -> None:
+    settings = get_settings()
+    
+    parser = argparse.ArgumentParser(description="Run the API with pre-forked workers")
+    parser.add_argument("--workers", type=int, default=settings.workers)
+    parser.add_argument("--host", default=settings.host)
+    parser.add_argument("--port", type=int, default=settings.port)
+    args = parser.parse_args(argv)
+    
+    run(args.workers, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
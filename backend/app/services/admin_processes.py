@@ -0,0 +1,164 @@
+"""
+AdminProcesses Service - Run repository commands for admins without blocking the event loop
+"""
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from pathlib import Path
+import asyncio
+
+from config import get_settings
+
+# Command name -> timeout in seconds
+PROCESS_TIMEOUTS = {
+    "run_tests": 30.0,
+    "git_status": 10.0,
+    "git_log": 10.0
+}
+
+MAX_GIT_LOG_COUNT = 100
+
+# Relative repository paths are taken from here, not from the working directory
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def resolve_repository_path(path: str) -> Path:
+    """Absolute repository path; a relative ``path`` is relative to the backend directory"""
+    repository_path = Path(path).expanduser()
+    if not repository_path.is_absolute():
+        repository_path = BACKEND_DIR / repository_path
+    return repository_path.resolve()
+
+
+def command_argv(command: str, parameters: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    Argument vector for an admin command that runs a process
+    
+    Raises:
+        ValueError: Unknown command or invalid parameters
+    """
+    parameters = parameters or {}
+    if command == "run_tests":
+        return ["python3", "test_api.py"]
+    if command == "git_status":
+        return ["git", "status", "--short"]
+    if command == "git_log":
+        try:
+            count = int(parameters.get("count", 5))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid commit count: {parameters.get('count')!r}")
+        if not 1 <= count <= MAX_GIT_LOG_COUNT:
+            raise ValueError(f"Commit count must be between 1 and {MAX_GIT_LOG_COUNT}")
+        return ["git", "log", f"-{count}", "--oneline"]
+    raise ValueError(f"Command {command} does not run a process")
+
+
+class ProcessRunner:
+    """
+    Run subprocesses in the repository with asyncio
+    
+    At most ``max_concurrent`` processes run at once, and the rest wait for
+    a slot. A process that outlives its timeout, or whose output stream is
+    abandoned by the client, is killed. Git commands are refused unless the
+    repository path is the root of a git repository.
+    """
+    
+    def __init__(self, repository_path: str, max_concurrent: int = 2):
+        self.repository_path = resolve_repository_path(repository_path)
+        self.is_git_repository = (self.repository_path / ".git").exists()
+        self.max_concurrent = max_concurrent
+        self.running = 0
+        self.started = 0
+        self.killed = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+    
+    async def run(self, argv: List[str], timeout: float) -> Tuple[int, str, str]:
+        """
+        Run ``argv`` to completion
+        
+        Returns:
+            (return code, stdout, stderr)
+        
+        Raises:
+            asyncio.TimeoutError: The process was killed after ``timeout`` seconds
+        """
+        async with self._semaphore:
+            process = await self._start(argv, asyncio.subprocess.PIPE)
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+            finally:
+                await self._finish(process)
+        return process.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+    
+    async def stream(self, argv: List[str], timeout: float) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Run ``argv``, yielding ``('line', text)`` per output line, then ``('exit', code)``
+        
+        stderr is merged into stdout. Closing the iterator early kills the process.
+        
+        Raises:
+            asyncio.TimeoutError: The process was killed after ``timeout`` seconds
+        """
+        async with self._semaphore:
+            process = await self._start(argv, asyncio.subprocess.STDOUT)
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            try:
+                while True:
+                    line = await asyncio.wait_for(process.stdout.readline(), timeout=deadline - loop.time())
+                    if not line:
+                        break
+                    yield "line", line.decode(errors="replace").rstrip("\n")
+                await asyncio.wait_for(process.wait(), timeout=max(deadline - loop.time(), 0.1))
+                yield "exit", process.returncode
+            finally:
+                await self._finish(process)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "repository_path": str(self.repository_path),
+            "git_repository": self.is_git_repository,
+            "max_concurrent": self.max_concurrent,
+            "running": self.running,
+            "started": self.started,
+            "killed": self.killed
+        }
+    
+    async def _start(self, argv: List[str], stderr: int) -> asyncio.subprocess.Process:
+        if argv[0] == "git" and not self.is_git_repository:
+            raise OSError(f"{self.repository_path} is not a git repository; set REPOSITORY_PATH")
+        process = await asyncio.create_subprocess_exec(
+            *argv,
+            cwd=str(self.repository_path),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=stderr
+        )
+        self.running += 1
+        self.started += 1
+        return process
+    
+    async def _finish(self, process: asyncio.subprocess.Process) -> None:
+        """Kill the process if it is still running and reap it"""
+        self.running -= 1
+        if process.returncode is None:
+            self.killed += 1
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+
+# Singleton instance
+_process_runner = None
+
+
+def get_process_runner() -> ProcessRunner:
+    """Get singleton process runner instance"""
+    global _process_runner
+    if _process_runner is None:
+        settings = get_settings()
+        _process_runner = ProcessRunner(
+            settings.repository_path,
+            max_concurrent=settings.admin_max_subprocesses
+        )
+    return _process_runner
@@ -0,0 +1,106 @@
+"""
+AdmissionController Service - Bound concurrent match work and shed the excess
+"""
+from typing import Any, Callable, Dict, Optional
+
+from app.services.executor import get_match_executor
+from app.services.metrics import registry
+from config import get_settings
+
+# Admission decisions
+ADMIT = "admit"
+DEGRADE = "degrade"
+REJECT = "reject"
+
+MATCH_ADMISSIONS = registry.counter(
+    "zd3_match_admissions_total",
+    "Match requests by admission decision",
+    ("decision",)
+)
+
+
+class AdmissionController:
+    """
+    Decide per request whether to serve it fully, degraded or not at all
+    
+    Up to ``max_concurrent`` match requests are served in full, as long as
+    the executor backlog stays under ``max_queue_depth``. The next
+    ``max_degraded`` are served ids and scores only, which skips text
+    generation, the most expensive stage. Anything beyond that is rejected
+    straight away, so callers can retry instead of waiting out a timeout.
+    Runs on the event loop only, so the counters need no lock.
+    """
+    
+    def __init__(
+        self,
+        max_concurrent: int = 32,
+        max_degraded: int = 32,
+        max_queue_depth: int = 16,
+        queue_depth: Optional[Callable[[], int]] = None
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_degraded = max_degraded
+        self.max_queue_depth = max_queue_depth
+        self.queue_depth = queue_depth or (lambda: 0)
+        self.in_flight = 0
+        self.full = 0
+        self.admitted = 0
+        self.degraded = 0
+        self.rejected = 0
+    
+    def acquire(self) -> str:
+        """Return a decision; every non-rejected decision must be released"""
+        if self.in_flight >= self.max_concurrent + self.max_degraded:
+            decision = REJECT
+            self.rejected += 1
+        else:
+            if self.full < self.max_concurrent and self.queue_depth() < self.max_queue_depth:
+                decision = ADMIT
+                self.full += 1
+                self.admitted += 1
+            else:
+                decision = DEGRADE
+                self.degraded += 1
+            self.in_flight += 1
+        
+        MATCH_ADMISSIONS.inc(decision)
+        return decision
+    
+    def release(self, decision: str) -> None:
+        if decision == REJECT:
+            return
+        self.in_flight -= 1
+        if decision == ADMIT:
+            self.full -= 1
+    
+    def stats(self) -> Dict[str, Any]:
+        total = self.admitted + self.degraded + self.rejected
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_degraded": self.max_degraded,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_depth": self.queue_depth(),
+            "in_flight": self.in_flight,
+            "admitted": self.admitted,
+            "degraded": self.degraded,
+            "rejected": self.rejected,
+            "shed_ratio": (self.degraded + self.rejected) / total if total else 0.0
+        }
+
+
+# Singleton instance
+_admission_controller = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get singleton admission controller for the match endpoints"""
+    global _admission_controller
+    if _admission_controller is None:
+        settings = get_settings()
+        _admission_controller = AdmissionController(
+            max_concurrent=settings.match_max_concurrent,
+            max_degraded=settings.match_max_degraded,
+            max_queue_depth=settings.match_max_queue_depth,
+            queue_depth=lambda: get_match_executor().queue_depth
+        )
+    return _admission_controller
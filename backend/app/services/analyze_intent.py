@@ -2,7 +2,7 @@
 AnalyzeIntent Service - Parse and categorize user input
 Determines whether request is Company or Individual track
 """
-from typing import Dict, List, Any
+from typing import Dict, List, Any, FrozenSet, Set
 import re
 
 
@@ -36,6 +36,57 @@ class IntentAnalyzer:
         'ecosystem': ['apple', 'windows', 'samsung', 'ecosystem', 'integration']
     }
     
+    # Business problem domains (first match wins, in declaration order)
+    PROBLEM_DOMAINS = {
+        'customer_support': ['customer support', 'support ticket', 'help desk', 'customer service'],
+        'content_creation': ['content', 'writing', 'blog', 'marketing copy', 'social media'],
+        'data_analysis': ['data analysis', 'analytics', 'insights', 'reporting', 'dashboard'],
+        'code_automation': ['code', 'development', 'programming', 'testing', 'devops'],
+        'workflow_automation': ['workflow', 'process', 'automation', 'task'],
+        'communication': ['communication', 'email', 'messaging', 'collaboration']
+    }
+    
+    # Company requirement indicators
+    REQUIREMENT_INDICATORS = {
+        'API_Compatibility': ['api', 'integration', 'connect'],
+        'Task_Automation_Potential': ['automate', 'automation', 'automatic'],
+        'Scalability': ['scale', 'growth', 'volume', 'many'],
+        'Customization': ['custom', 'specific', 'tailored'],
+        'Cost_Efficiency': ['cost', 'budget', 'affordable', 'cheap']
+    }
+    
+    # Automation level indicators
+    HIGH_AUTOMATION_KEYWORDS = ['fully automate', 'completely automate', 'no human']
+    MODERATE_AUTOMATION_KEYWORDS = ['help', 'assist', 'support', 'augment']
+    
+    COMPLEXITY_INDICATORS = [
+        'multiple', 'complex', 'advanced', 'sophisticated',
+        'integration', 'custom', 'enterprise', 'large-scale'
+    ]
+    
+    # Individual use cases (first match wins, in declaration order)
+    USE_CASES = {
+        'ml_development': ['machine learning', 'ai development', 'model training', 'data science'],
+        'video_editing': ['video editing', '8k', '4k', 'video production', 'premiere'],
+        'creative_work': ['design', 'creative', 'photoshop', 'illustration', 'art'],
+        'software_development': ['coding', 'programming', 'development', 'developer', 'ide'],
+        'gaming': ['gaming', 'games', 'gamer'],
+        'general_productivity': ['productivity', 'office', 'work', 'email', 'documents']
+    }
+    
+    # Priority indicators
+    PRIORITY_INDICATORS = {
+        'performance': ['best', 'top', 'highest', 'maximum'],
+        'portability': ['portable', 'light', 'travel'],
+        'cost': ['budget', 'affordable', 'cheap', 'value'],
+        'battery_life': ['battery', 'unplugged', 'battery life']
+    }
+    
+    TECHNICAL_TERMS = [
+        'gpu', 'cpu', 'vram', 'cuda', 'thunderbolt', 'pcie',
+        'ml', 'tensorflow', 'pytorch', 'llm', 'api'
+    ]
+    
     def analyze_company_intent(self, friction_point: str, **kwargs) -> Dict[str, Any]:
         """
         Analyze company workflow friction point
@@ -47,8 +98,29 @@ class IntentAnalyzer:
         Returns:
             Dictionary with intent analysis
         """
-        text_lower = friction_point.lower()
+        return self._build_company_intent(friction_point.lower(), **kwargs)
+    
+    def analyze_individual_intent(self, need: str, **kwargs) -> Dict[str, Any]:
+        """
+        Analyze individual product need
+        
+        Args:
+            need: Description of what the individual needs
+            **kwargs: Additional context (budget, ecosystem, etc.)
+        
+        Returns:
+            Dictionary with intent analysis
+        """
+        return self._build_individual_intent(need.lower(), **kwargs)
+    
+    def _build_company_intent(self, text_lower, **kwargs) -> Dict[str, Any]:
+        """
+        Build company intent analysis
         
+        ``text_lower`` is either the lowercased input text or a set of the
+        vocabulary keywords it contains; the helpers below only ever test
+        ``keyword in text`` so both give identical results.
+        """
         # Identify problem domain
         problem_domain = self._identify_problem_domain(text_lower)
         
@@ -74,19 +146,8 @@ class IntentAnalyzer:
             'complexity_score': self._calculate_complexity(text_lower)
         }
     
-    def analyze_individual_intent(self, need: str, **kwargs) -> Dict[str, Any]:
-        """
-        Analyze individual product need
-        
-        Args:
-            need: Description of what the individual needs
-            **kwargs: Additional context (budget, ecosystem, etc.)
-        
-        Returns:
-            Dictionary with intent analysis
-        """
-        text_lower = need.lower()
-        
+    def _build_individual_intent(self, text_lower, **kwargs) -> Dict[str, Any]:
+        """Build individual intent analysis (see ``_build_company_intent``)"""
         # Identify use case category
         use_case = self._identify_use_case(text_lower)
         
@@ -111,16 +172,7 @@ class IntentAnalyzer:
     
     def _identify_problem_domain(self, text: str) -> str:
         """Identify the business problem domain"""
-        domains = {
-            'customer_support': ['customer support', 'support ticket', 'help desk', 'customer service'],
-            'content_creation': ['content', 'writing', 'blog', 'marketing copy', 'social media'],
-            'data_analysis': ['data analysis', 'analytics', 'insights', 'reporting', 'dashboard'],
-            'code_automation': ['code', 'development', 'programming', 'testing', 'devops'],
-            'workflow_automation': ['workflow', 'process', 'automation', 'task'],
-            'communication': ['communication', 'email', 'messaging', 'collaboration']
-        }
-        
-        for domain, keywords in domains.items():
+        for domain, keywords in self.PROBLEM_DOMAINS.items():
             if any(keyword in text for keyword in keywords):
                 return domain
         
@@ -128,56 +180,32 @@ class IntentAnalyzer:
     
     def _extract_requirements(self, text: str) -> List[str]:
         """Extract key requirements from text"""
-        requirements = []
-        
-        if any(word in text for word in ['api', 'integration', 'connect']):
-            requirements.append('API_Compatibility')
-        
-        if any(word in text for word in ['automate', 'automation', 'automatic']):
-            requirements.append('Task_Automation_Potential')
-        
-        if any(word in text for word in ['scale', 'growth', 'volume', 'many']):
-            requirements.append('Scalability')
-        
-        if any(word in text for word in ['custom', 'specific', 'tailored']):
-            requirements.append('Customization')
-        
-        if any(word in text for word in ['cost', 'budget', 'affordable', 'cheap']):
-            requirements.append('Cost_Efficiency')
+        requirements = [
+            requirement
+            for requirement, keywords in self.REQUIREMENT_INDICATORS.items()
+            if any(word in text for word in keywords)
+        ]
         
         return requirements if requirements else ['General_Purpose']
     
     def _assess_automation_potential(self, text: str) -> str:
         """Assess how much automation is needed"""
-        if any(word in text for word in ['fully automate', 'completely automate', 'no human']):
+        if any(word in text for word in self.HIGH_AUTOMATION_KEYWORDS):
             return 'high'
-        elif any(word in text for word in ['help', 'assist', 'support', 'augment']):
+        elif any(word in text for word in self.MODERATE_AUTOMATION_KEYWORDS):
             return 'moderate'
         else:
             return 'low'
     
     def _calculate_complexity(self, text: str) -> float:
         """Calculate problem complexity score (0-1)"""
-        complexity_indicators = [
-            'multiple', 'complex', 'advanced', 'sophisticated',
-            'integration', 'custom', 'enterprise', 'large-scale'
-        ]
-        
-        matches = sum(1 for indicator in complexity_indicators if indicator in text)
-        return min(matches / len(complexity_indicators), 1.0)
+        indicators = self.COMPLEXITY_INDICATORS
+        matches = sum(1 for indicator in indicators if indicator in text)
+        return min(matches / len(indicators), 1.0)
     
     def _identify_use_case(self, text: str) -> str:
         """Identify primary use case for individual"""
-        use_cases = {
-            'ml_development': ['machine learning', 'ai development', 'model training', 'data science'],
-            'video_editing': ['video editing', '8k', '4k', 'video production', 'premiere'],
-            'creative_work': ['design', 'creative', 'photoshop', 'illustration', 'art'],
-            'software_development': ['coding', 'programming', 'development', 'developer', 'ide'],
-            'gaming': ['gaming', 'games', 'gamer'],
-            'general_productivity': ['productivity', 'office', 'work', 'email', 'documents']
-        }
-        
-        for use_case, keywords in use_cases.items():
+        for use_case, keywords in self.USE_CASES.items():
             if any(keyword in text for keyword in keywords):
                 return use_case
         
@@ -194,31 +222,18 @@ class IntentAnalyzer:
     
     def _determine_priorities(self, text: str) -> List[str]:
         """Determine what's most important to the user"""
-        priorities = []
-        
         # Infer from emphasis
-        if any(word in text for word in ['best', 'top', 'highest', 'maximum']):
-            priorities.append('performance')
-        
-        if any(word in text for word in ['portable', 'light', 'travel']):
-            priorities.append('portability')
-        
-        if any(word in text for word in ['budget', 'affordable', 'cheap', 'value']):
-            priorities.append('cost')
-        
-        if any(word in text for word in ['battery', 'unplugged', 'battery life']):
-            priorities.append('battery_life')
+        priorities = [
+            priority
+            for priority, keywords in self.PRIORITY_INDICATORS.items()
+            if any(word in text for word in keywords)
+        ]
         
         return priorities if priorities else ['balanced']
     
     def _assess_user_sophistication(self, text: str) -> str:
         """Assess user's technical sophistication"""
-        technical_terms = [
-            'gpu', 'cpu', 'vram', 'cuda', 'thunderbolt', 'pcie',
-            'ml', 'tensorflow', 'pytorch', 'llm', 'api'
-        ]
-        
-        matches = sum(1 for term in technical_terms if term in text)
+        matches = sum(1 for term in self.TECHNICAL_TERMS if term in text)
         
         if matches >= 3:
             return 'expert'
@@ -226,6 +241,86 @@ class IntentAnalyzer:
             return 'intermediate'
         else:
             return 'beginner'
+    
+    @classmethod
+    def keyword_vocabulary(cls, track_type: str) -> FrozenSet[str]:
+        """Every keyword the analysis of ``track_type`` can test for"""
+        if track_type == 'company':
+            groups = [
+                *cls.PROBLEM_DOMAINS.values(),
+                *cls.REQUIREMENT_INDICATORS.values(),
+                cls.HIGH_AUTOMATION_KEYWORDS,
+                cls.MODERATE_AUTOMATION_KEYWORDS,
+                cls.COMPLEXITY_INDICATORS
+            ]
+        else:
+            groups = [
+                *cls.USE_CASES.values(),
+                *cls.TECHNICAL_INDICATORS.values(),
+                *cls.PRIORITY_INDICATORS.values(),
+                cls.TECHNICAL_TERMS
+            ]
+        return frozenset(keyword for group in groups for keyword in group)
+    
+    def start_session(self, track_type: str) -> 'IncrementalIntentState':
+        """Create incremental analyzer state for an as-you-type session"""
+        return IncrementalIntentState(self, track_type)
+
+
+class IncrementalIntentState:
+    """
+    Incremental intent analysis over text that only ever grows
+    
+    Keeps the set of vocabulary keywords seen so far plus the last few
+    characters of input, so each ``append`` only scans the new text and a
+    short overlap window. Cost per update depends on the size of the
+    appended text, not on the total input length.
+    """
+    
+    def __init__(self, analyzer: IntentAnalyzer, track_type: str):
+        if track_type not in ('company', 'individual'):
+            raise ValueError(f"Unknown track type: {track_type}")
+        
+        self.analyzer = analyzer
+        self.track_type = track_type
+        self.vocabulary = analyzer.keyword_vocabulary(track_type)
+        self.hits: Set[str] = set()
+        self.length = 0
+        self._overlap = max(len(keyword) for keyword in self.vocabulary) - 1
+        self._tail = ''
+    
+    def append(self, text: str) -> bool:
+        """
+        Feed newly typed text
+        
+        Returns:
+            True if the set of matched keywords changed
+        """
+        if not text:
+            return False
+        
+        window = self._tail + text.lower()
+        self.length += len(text)
+        self._tail = window[-self._overlap:] if self._overlap else ''
+        
+        new_hits = {
+            keyword for keyword in self.vocabulary
+            if keyword not in self.hits and keyword in window
+        }
+        self.hits.update(new_hits)
+        return bool(new_hits)
+    
+    def reset(self) -> None:
+        """Forget all text seen so far"""
+        self.hits.clear()
+        self.length = 0
+        self._tail = ''
+    
+    def analyze(self, **kwargs) -> Dict[str, Any]:
+        """Build the current intent analysis from the matched keywords"""
+        if self.track_type == 'company':
+            return self.analyzer._build_company_intent(self.hits, **kwargs)
+        return self.analyzer._build_individual_intent(self.hits, **kwargs)
 
 
 # Singleton instance
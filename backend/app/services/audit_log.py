@@ -0,0 +1,261 @@
+"""
+AuditLog Service - Durable trail of admin commands, written in batches off the request path
+"""
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from pathlib import Path
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+
+from app.services.metrics import registry
+from config import get_settings
+
+AUDIT_RECORDS = registry.counter(
+    "zd3_audit_records_total",
+    "Admin command audit records by outcome",
+    ("outcome",)
+)
+
+# Longest output or message text kept per record
+MAX_TEXT_CHARS = 2000
+
+# Flushes between retention passes
+PRUNE_EVERY = 50
+
+
+def _truncate(value: Optional[str]) -> Optional[str]:
+    if value is None or len(value) <= MAX_TEXT_CHARS:
+        return value
+    return value[:MAX_TEXT_CHARS] + f"... [{len(value) - MAX_TEXT_CHARS} more characters]"
+
+
+class AuditLog:
+    """
+    Queue admin command records in memory and append them to SQLite in batches
+    
+    ``record()`` only puts the record on a bounded queue. A background task
+    takes up to ``batch_size`` records (giving a batch that is not full
+    ``flush_interval`` to fill) and inserts them in one transaction on a
+    worker thread. When the queue is full, callers wait up to
+    ``enqueue_timeout`` for room; past that the record is dropped and
+    counted, so a stalled disk never holds up admin commands. Records
+    older than ``retention_days`` or beyond the newest ``max_records`` are
+    deleted as the log grows. Time-range queries use an index on ``ts``.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        queue_size: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        enqueue_timeout: float = 0.05,
+        retention_days: float = 30,
+        max_records: int = 100000
+    ):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.retention_days = retention_days
+        self.max_records = max_records
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.last_error: Optional[str] = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._batch: List[tuple] = []  # Taken off the queue, not yet handed to a writer
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the flusher after writing whatever is still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        batch, self._batch = self._batch, []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            await asyncio.to_thread(self._write, batch)
+    
+    async def record(
+        self,
+        message: str,
+        result: Dict[str, Any],
+        latency_ms: float,
+        ts: Optional[float] = None
+    ) -> bool:
+        """
+        Queue one executed admin command; returns False if it was dropped
+        
+        Args:
+            message: The admin's message as received
+            result: Response of the command (command, parameters, success, ...)
+            latency_ms: Time taken to interpret and execute the command
+        """
+        entry = (
+            time.time() if ts is None else ts,
+            message,
+            result.get("command"),
+            json.dumps(result.get("parameters"), default=str),
+            result.get("source"),
+            1 if result.get("success") else 0,
+            _truncate(result.get("error")),
+            _truncate(result.get("message") or result.get("output")),
+            round(latency_ms, 3)
+        )
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(self._queue.put(entry), timeout=self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                AUDIT_RECORDS.inc("dropped")
+                return False
+        return True
+    
+    def query(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        command: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Records with ``since <= ts < until`` (epoch seconds), newest first"""
+        sql = (
+            "SELECT id, ts, message, command, parameters, source, success, error, result, latency_ms "
+            "FROM audit WHERE ts >= ? AND ts < ?"
+        )
+        args: List[Any] = [since if since is not None else 0.0, until if until is not None else float("inf")]
+        if command:
+            sql += " AND command = ?"
+            args.append(command)
+        sql += " ORDER BY ts DESC LIMIT ?"
+        args.append(limit)
+        
+        with self._lock:
+            rows = self._connect().execute(sql, args).fetchall()
+        return [
+            {
+                "id": record_id,
+                "timestamp": datetime.fromtimestamp(ts, timezone.utc).isoformat(),
+                "message": message,
+                "command": command,
+                "parameters": json.loads(parameters),
+                "source": source,
+                "success": bool(success),
+                "error": error,
+                "result": result,
+                "latency_ms": latency_ms
+            }
+            for record_id, ts, message, command, parameters, source, success, error, result, latency_ms in rows
+        ]
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "running": self._task is not None,
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "last_error": self.last_error
+        }
+    
+    async def _run(self) -> None:
+        while True:
+            self._batch.append(await self._queue.get())
+            self._take_queued()
+            if len(self._batch) < self.batch_size:
+                # Let a few more records arrive so they share a transaction
+                await asyncio.sleep(self.flush_interval)
+                self._take_queued()
+            
+            batch, self._batch = self._batch, []
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except (sqlite3.Error, OSError) as e:
+                self.last_error = str(e)
+                self.dropped += len(batch)
+                AUDIT_RECORDS.inc("dropped", amount=len(batch))
+    
+    def _take_queued(self) -> None:
+        while len(self._batch) < self.batch_size and not self._queue.empty():
+            self._batch.append(self._queue.get_nowait())
+    
+    def _write(self, batch: List[tuple]) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO audit "
+                    "(ts, message, command, parameters, source, success, error, result, latency_ms) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    batch
+                )
+            self.batches += 1
+            if (self.batches - 1) % PRUNE_EVERY == 0:
+                self._prune(conn)
+        self.written += len(batch)
+        AUDIT_RECORDS.inc("written", amount=len(batch))
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS audit ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL NOT NULL, message TEXT NOT NULL, "
+                "command TEXT, parameters TEXT NOT NULL, source TEXT, success INTEGER NOT NULL, "
+                "error TEXT, result TEXT, latency_ms REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS audit_ts ON audit (ts)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+    
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Drop records past the retention period, then all but the newest ``max_records``"""
+        with conn:
+            conn.execute("DELETE FROM audit WHERE ts < ?", (time.time() - self.retention_days * 86400,))
+            conn.execute(
+                "DELETE FROM audit WHERE id <= "
+                "(SELECT id FROM audit ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (self.max_records,)
+            )
+
+
+# Singleton instance
+_audit_log = None
+
+
+def get_audit_log() -> AuditLog:
+    """Get singleton audit log instance"""
+    global _audit_log
+    if _audit_log is None:
+        settings = get_settings()
+        _audit_log = AuditLog(
+            settings.audit_log_path,
+            queue_size=settings.audit_queue_size,
+            batch_size=settings.audit_batch_size,
+            flush_interval=settings.audit_flush_interval_seconds,
+            enqueue_timeout=settings.audit_enqueue_timeout_ms / 1000,
+            retention_days=settings.audit_retention_days,
+            max_records=settings.audit_max_records
+        )
+    return _audit_log
@@ -0,0 +1,343 @@
+"""
+BulkJobs Service - Run NDJSON files of match requests as resumable background jobs
+"""
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+import orjson
+
+from app.models import (
+    CompanyMatchRequest,
+    IndividualMatchRequest,
+    COMPANY_RESPONSE_SECTIONS,
+    INDIVIDUAL_RESPONSE_SECTIONS
+)
+from app.services import match_pipeline
+from app.services.executor import get_match_executor
+from config import get_settings
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# Per track: request model, pipeline entry point, free-text field, available sections
+TRACKS: Dict[str, Tuple[type, Callable, str, Tuple[str, ...]]] = {
+    'company': (
+        CompanyMatchRequest, match_pipeline.run_company_match, 'friction_point', COMPANY_RESPONSE_SECTIONS
+    ),
+    'individual': (
+        IndividualMatchRequest, match_pipeline.run_individual_match, 'need', INDIVIDUAL_RESPONSE_SECTIONS
+    )
+}
+
+INPUT_FILE = "input.ndjson"
+OUTPUT_FILE = "output.ndjson"
+JOB_FILE = "job.json"
+LOCK_FILE = "lock"
+
+# Longest pause before a line while interactive matches are waiting
+MAX_YIELD_SECONDS = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+class BulkJobManager:
+    """
+    Local job queue for bulk matching
+    
+    Each job lives in its own directory with the uploaded input, the NDJSON
+    output and a ``job.json`` holding status and a checkpoint (input offset,
+    output size, lines done). Chunks are processed on a small dedicated
+    pool, never on the match executor, and every line first yields while
+    interactive requests are in flight, so an interactive request never
+    waits behind more than one bulk match. The output is fsynced before the
+    checkpoint moves, so after a restart a job resumes from its last
+    chunk, dropping any output written after the checkpoint.
+    
+    A job is run by whichever process holds its lock file, so with several
+    workers every job still runs exactly once. The lock goes away with the
+    process holding it; every ``resume_interval`` seconds each worker
+    queues unfinished jobs again, so a job whose worker died is taken over
+    from its checkpoint instead of waiting for a restart.
+    """
+    
+    def __init__(
+        self,
+        jobs_dir: str,
+        workers: int = 1,
+        chunk_size: int = 500,
+        resume_interval: float = 30.0
+    ):
+        self.jobs_dir = Path(jobs_dir)
+        self.chunk_size = chunk_size
+        self.resume_interval = resume_interval
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk")
+        self._stopping = threading.Event()
+        self._meta_lock = threading.Lock()
+        self._queued: Set[str] = set()  # Jobs waiting or running in this process
+        self._queued_lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+    
+    def create_job(self, track: str, sections: FrozenSet[str], top_k: int = 3) -> Dict[str, Any]:
+        """Create an empty job directory; fill its input, then call ``submit``"""
+        job_id = uuid.uuid4().hex
+        job_dir = self.jobs_dir / job_id
+        job_dir.mkdir(parents=True)
+        
+        job = {
+            "id": job_id,
+            "track": track,
+            "sections": sorted(sections),
+            "top_k": top_k,
+            "status": QUEUED,
+            "created_at": datetime.utcnow().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "input_bytes": 0,
+            "input_lines": 0,
+            "processed_lines": 0,
+            "error_lines": 0,
+            "checkpoint": {"input_offset": 0, "output_bytes": 0},
+            "error": None
+        }
+        self._write_job(job)
+        return job
+    
+    def input_path(self, job_id: str) -> Path:
+        return self.jobs_dir / job_id / INPUT_FILE
+    
+    def output_path(self, job_id: str) -> Path:
+        return self.jobs_dir / job_id / OUTPUT_FILE
+    
+    def submit(self, job: Dict[str, Any], input_bytes: int, input_lines: int) -> Dict[str, Any]:
+        """Record the uploaded input size and queue the job"""
+        job["input_bytes"] = input_bytes
+        job["input_lines"] = input_lines
+        self._write_job(job)
+        self._enqueue(job["id"])
+        return job
+    
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job status with progress, or None if unknown"""
+        if not job_id.isalnum():
+            return None
+        try:
+            job = self._read_job(job_id)
+        except (OSError, ValueError):
+            return None
+        
+        input_bytes = job["input_bytes"]
+        job["progress"] = (
+            round(job["checkpoint"]["input_offset"] / input_bytes, 4) if input_bytes else 0.0
+        )
+        return job
+    
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """All known jobs, newest first"""
+        if not self.jobs_dir.exists():
+            return []
+        jobs = [self.get_job(path.name) for path in self.jobs_dir.iterdir() if path.is_dir()]
+        return sorted(
+            (job for job in jobs if job is not None),
+            key=lambda job: job["created_at"],
+            reverse=True
+        )
+    
+    def resume(self) -> int:
+        """Queue every unfinished job found on disk and not already queued here; returns how many"""
+        resumed = 0
+        for job in self.list_jobs():
+            if job["status"] in (QUEUED, RUNNING) and self._enqueue(job["id"]):
+                resumed += 1
+        return resumed
+    
+    def start(self) -> None:
+        """Periodically take over unfinished jobs, e.g. those of a worker that died"""
+        if self._sweeper is None and self.resume_interval > 0:
+            self._sweeper = threading.Thread(target=self._sweep, name="bulk-sweeper", daemon=True)
+            self._sweeper.start()
+    
+    def shutdown(self) -> None:
+        """Stop after the current chunk; unfinished jobs resume on the next start"""
+        self._stopping.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _enqueue(self, job_id: str) -> bool:
+        with self._queued_lock:
+            if job_id in self._queued or self._stopping.is_set():
+                return False
+            self._queued.add(job_id)
+        self._pool.submit(self._run, job_id)
+        return True
+    
+    def _sweep(self) -> None:
+        while not self._stopping.wait(self.resume_interval):
+            try:
+                self.resume()
+            except Exception:
+                logger.exception("Scanning for unfinished bulk jobs failed")
+    
+    def _run(self, job_id: str) -> None:
+        try:
+            self._run_locked(job_id)
+        finally:
+            with self._queued_lock:
+                self._queued.discard(job_id)
+    
+    def _run_locked(self, job_id: str) -> None:
+        job_dir = self.jobs_dir / job_id
+        lock_fd = os.open(job_dir / LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            # Another process is running this job
+            os.close(lock_fd)
+            return
+        
+        try:
+            job = self._read_job(job_id)
+            if job["status"] in (COMPLETED, FAILED):
+                return
+            
+            job["status"] = RUNNING
+            job["started_at"] = job["started_at"] or datetime.utcnow().isoformat()
+            self._write_job(job)
+            
+            if self._process(job):
+                job["status"] = COMPLETED
+                job["finished_at"] = datetime.utcnow().isoformat()
+                self._write_job(job)
+            
+        except Exception as e:
+            job = self._read_job(job_id)
+            job["status"] = FAILED
+            job["error"] = str(e)
+            job["finished_at"] = datetime.utcnow().isoformat()
+            self._write_job(job)
+            logger.exception("Bulk job %s failed", job_id)
+            
+        finally:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+            os.close(lock_fd)
+    
+    def _process(self, job: Dict[str, Any]) -> bool:
+        """Process remaining chunks; False if stopped before the end"""
+        model, run_match, text_field, _ = TRACKS[job["track"]]
+        sections = frozenset(job["sections"])
+        checkpoint = job["checkpoint"]
+        output_path = self.output_path(job["id"])
+        
+        with open(self.input_path(job["id"]), "rb") as fin, open(output_path, "ab") as fout:
+            # Drop output written after the last checkpoint
+            fout.truncate(checkpoint["output_bytes"])
+            fin.seek(checkpoint["input_offset"])
+            
+            while not self._stopping.is_set():
+                lines = list(islice(fin, self.chunk_size))
+                if not lines:
+                    return True
+                
+                first_line = job["processed_lines"] + 1
+                output, errors = self._process_chunk(
+                    lines, first_line, model, run_match, text_field, sections, job["top_k"]
+                )
+                
+                fout.write(output)
+                fout.flush()
+                os.fsync(fout.fileno())
+                
+                checkpoint["input_offset"] = fin.tell()
+                checkpoint["output_bytes"] = fout.tell()
+                job["processed_lines"] += len(lines)
+                job["error_lines"] += errors
+                self._write_job(job)
+        
+        return False
+    
+    def _process_chunk(
+        self,
+        lines: List[bytes],
+        first_line: int,
+        model: type,
+        run_match: Callable,
+        text_field: str,
+        sections: FrozenSet[str],
+        top_k: int
+    ) -> Tuple[bytes, int]:
+        """Match one chunk, yielding before each line; identical requests in a chunk are computed once"""
+        results: Dict[str, Any] = {}
+        output = []
+        errors = 0
+        
+        for line_number, line in enumerate(lines, first_line):
+            if not line.strip():
+                continue
+            
+            self._yield_to_interactive()
+            try:
+                request = model(**json.loads(line))
+                fields = request.model_dump(exclude={'latency_budget_ms'})
+                fields[text_field] = fields[text_field].lower()
+                key = json.dumps(fields, sort_keys=True)
+                
+                result = results.get(key)
+                if result is None:
+                    result = results[key] = run_match(request, sections, top_k=top_k)
+                output.append(orjson.dumps({"line": line_number, "result": result}))
+                
+            except Exception as e:
+                errors += 1
+                output.append(orjson.dumps({"line": line_number, "error": str(e)}))
+        
+        return b"".join(record + b"\n" for record in output), errors
+    
+    def _yield_to_interactive(self) -> None:
+        """Pause while interactive match requests are waiting or running"""
+        executor = get_match_executor()
+        waited = 0.0
+        while executor.in_flight and waited < MAX_YIELD_SECONDS and not self._stopping.is_set():
+            time.sleep(0.01)
+            waited += 0.01
+    
+    def _read_job(self, job_id: str) -> Dict[str, Any]:
+        with open(self.jobs_dir / job_id / JOB_FILE) as f:
+            return json.load(f)
+    
+    def _write_job(self, job: Dict[str, Any]) -> None:
+        """Atomically replace the job's metadata file"""
+        path = self.jobs_dir / job["id"] / JOB_FILE
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with self._meta_lock:
+            with open(tmp_path, "w") as f:
+                json.dump(job, f, indent=2)
+            os.replace(tmp_path, path)
+
+
+# Singleton instance
+_bulk_job_manager = None
+
+
+def get_bulk_job_manager() -> BulkJobManager:
+    """Get singleton bulk job manager instance"""
+    global _bulk_job_manager
+    if _bulk_job_manager is None:
+        settings = get_settings()
+        _bulk_job_manager = BulkJobManager(
+            settings.bulk_jobs_dir,
+            workers=settings.bulk_job_workers,
+            chunk_size=settings.bulk_chunk_size,
+            resume_interval=settings.bulk_resume_interval
+        )
+    return _bulk_job_manager
@@ -0,0 +1,229 @@
+"""
+CatalogImport Service - Bulk-load products or AI tools from CSV or NDJSON feeds
+"""
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import csv
+import io
+import json
+
+from pydantic import ValidationError
+
+from app.database import get_data_loader
+from app.models import Product, AITool
+from config import get_settings
+
+# kind -> (schema, catalog loader, catalog saver) attribute names
+KINDS = {
+    "products": (Product, "load_product_catalog", "save_product_catalog"),
+    "ai_tools": (AITool, "load_ai_tools_catalog", "save_ai_tools_catalog")
+}
+
+# Errors listed in a report; the count is always complete
+MAX_REPORTED_ERRORS = 1000
+
+
+def detect_format(filename: str, content_type: str) -> str:
+    """Guess the upload format from its name, then its content type"""
+    name = (filename or "").lower()
+    if name.endswith(".csv") or "csv" in (content_type or ""):
+        return "csv"
+    return "ndjson"
+
+
+def _csv_record(row: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Turn a CSV row into a catalog record
+    
+    Dotted headers nest (``technical_specs.memory``), cells holding a JSON
+    object or array are decoded, and empty cells are left out.
+    """
+    record: Dict[str, Any] = {}
+    for column, value in row.items():
+        if column is None or value is None or value == "":
+            continue
+        value = value.strip()
+        if value[:1] in ("{", "["):
+            value = json.loads(value)
+        target = record
+        *parents, leaf = column.strip().split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value
+    return record
+
+
+def _ndjson_records(text: io.TextIOBase) -> Iterator[Tuple[int, Any]]:
+    for row, line in enumerate(text, 1):
+        if line.strip():
+            try:
+                yield row, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row, e
+
+
+def _csv_records(text: io.TextIOBase) -> Iterator[Tuple[int, Any]]:
+    # Row numbers count data rows, the header being row 0
+    for row, values in enumerate(csv.DictReader(text), 1):
+        try:
+            yield row, _csv_record(values)
+        except json.JSONDecodeError as e:
+            yield row, e
+
+
+def _validate_chunk(schema: type, chunk: List[Tuple[int, Any]]) -> List[Tuple[int, Any, str]]:
+    """Validate parsed rows: (row, record dict or None, error message)"""
+    results = []
+    for row, record in chunk:
+        if isinstance(record, Exception):
+            results.append((row, None, f"Invalid JSON: {record}"))
+            continue
+        if not isinstance(record, dict):
+            results.append((row, None, "Record must be an object"))
+            continue
+        try:
+            results.append((row, schema.model_validate(record).model_dump(), ""))
+        except ValidationError as e:
+            results.append((row, None, "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}"
+                for error in e.errors()
+            )))
+    return results
+
+
+class CatalogImporter:
+    """
+    Stream records out of an upload and validate them chunk by chunk
+    
+    Parsing is lazy, and chunks are validated on a small pool while the
+    next ones are parsed, with a bounded number of chunks in flight. All
+    valid rows are then merged into the catalog by id (new ids appended,
+    known ids replaced) and written in one save, which publishes a single
+    new catalog version. The merge and save run under the catalog write
+    lock, against the latest saved catalog, so concurrent edits from this
+    or another worker are kept. Invalid rows are reported, not imported.
+    """
+    
+    def __init__(self, workers: int = 2, chunk_size: int = 1000):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="catalog-import")
+    
+    def run(
+        self,
+        kind: str,
+        upload: BinaryIO,
+        fmt: str,
+        replace_existing: bool = True,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Import an upload into the ``kind`` catalog (blocking; call off the event loop)
+        
+        Args:
+            kind: 'products' or 'ai_tools'
+            upload: Binary file object positioned at the start
+            fmt: 'csv' or 'ndjson'
+            replace_existing: Replace catalog items whose id is imported again;
+                otherwise such rows are reported as errors
+            dry_run: Validate and report without saving
+        
+        Returns:
+            Import report with per-row errors
+        """
+        schema, load, save = KINDS[kind]
+        data_loader = get_data_loader()
+        
+        text = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+        records = _csv_records(text) if fmt == "csv" else _ndjson_records(text)
+        
+        valid: Dict[str, Dict[str, Any]] = {}
+        errors: List[Dict[str, Any]] = []
+        rows = 0
+        existing_ids = {item["id"] for item in getattr(data_loader, load)()}
+        
+        try:
+            for chunk_results in self._validated_chunks(schema, records):
+                for row, record, error in chunk_results:
+                    rows += 1
+                    if not error:
+                        if record["id"] in valid:
+                            error = f"Duplicate id {record['id']} in upload"
+                        elif record["id"] in existing_ids and not replace_existing:
+                            error = f"Id {record['id']} already exists"
+                    if error:
+                        if len(errors) < MAX_REPORTED_ERRORS:
+                            errors.append({"row": row, "error": error})
+                        continue
+                    valid[record["id"]] = record
+        finally:
+            # Leave the upload open for its owner
+            text.detach()
+        
+        replaced = sum(1 for item_id in valid if item_id in existing_ids)
+        report = {
+            "kind": kind,
+            "format": fmt,
+            "rows": rows,
+            "imported": len(valid),
+            "added": len(valid) - replaced,
+            "replaced": replaced,
+            "error_count": rows - len(valid),
+            "errors": errors,
+            "dry_run": dry_run,
+            "catalog_version": data_loader.catalog_version
+        }
+        
+        if valid and not dry_run:
+            with data_loader.write_lock():
+                # Merge into the latest catalog so edits made during validation survive
+                current = getattr(data_loader, load)()
+                if not replace_existing:
+                    for item in current:
+                        if item["id"] in valid and item["id"] not in existing_ids:
+                            del valid[item["id"]]
+                            report["error_count"] += 1
+                            if len(errors) < MAX_REPORTED_ERRORS:
+                                errors.append({"row": None, "error": f"Id {item['id']} was added meanwhile"})
+                
+                replaced = sum(1 for item in current if item["id"] in valid)
+                report.update(imported=len(valid), added=len(valid) - replaced, replaced=replaced)
+                catalog = [valid.pop(item["id"]) if item["id"] in valid else item for item in current]
+                catalog.extend(valid.values())
+                getattr(data_loader, save)(catalog)
+                report["catalog_version"] = data_loader.catalog_version
+        
+        return report
+    
+    def _validated_chunks(
+        self,
+        schema: type,
+        records: Iterator[Tuple[int, Any]]
+    ) -> Iterator[List[Tuple[int, Any, str]]]:
+        """Validation results chunk by chunk, in upload order"""
+        in_flight = []
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if chunk:
+                in_flight.append(self._pool.submit(_validate_chunk, schema, chunk))
+            if in_flight and (not chunk or len(in_flight) > self.workers):
+                yield in_flight.pop(0).result()
+            elif not chunk:
+                return
+
+
+# Singleton instance
+_catalog_importer = None
+
+
+def get_catalog_importer() -> CatalogImporter:
+    """Get singleton catalog importer instance"""
+    global _catalog_importer
+    if _catalog_importer is None:
+        settings = get_settings()
+        _catalog_importer = CatalogImporter(
+            workers=settings.catalog_import_workers,
+            chunk_size=settings.catalog_import_chunk_size
+        )
+    return _catalog_importer
@@ -0,0 +1,103 @@
+"""
+CatalogWatcher Service - Follow catalog versions published by other workers
+"""
+from typing import Any, Dict, Optional
+import asyncio
+import time
+
+from app.database import DataLoader, get_data_loader
+from app.services.executor import get_match_executor
+from app.startup import worker_index
+from config import get_settings
+
+
+class CatalogWatcher:
+    """
+    Reload catalogs when another worker publishes a new version
+    
+    Polls the shared version counter, waits a per-worker stagger so workers
+    do not all rebuild at once, then loads the new catalogs on the match
+    executor and swaps them in. The worker keeps serving the previous
+    version until the swap.
+    """
+    
+    def __init__(self, data_loader: DataLoader, poll_interval: float = 1.0, stagger: float = 2.0):
+        self.data_loader = data_loader
+        self.poll_interval = poll_interval
+        self.stagger = stagger
+        self.reloads = 0
+        self.last_reload_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        if self._task is None and self.data_loader.version_channel is not None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "serving_version": self.data_loader.catalog_version,
+            "published_version": self.data_loader.shared_catalog_version(),
+            "watching": self._task is not None,
+            "reloads": self.reloads,
+            "last_reload_ms": self.last_reload_ms,
+            "last_error": self.last_error
+        }
+    
+    def _stale(self) -> bool:
+        published = self.data_loader.shared_catalog_version()
+        return published is not None and published > self.data_loader.catalog_version
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self._stale():
+                continue
+            
+            # Staggered rollout: worker N waits N * stagger seconds
+            delay = worker_index() * self.stagger
+            if delay:
+                await asyncio.sleep(delay)
+            
+            version = self.data_loader.shared_catalog_version()
+            started = time.perf_counter()
+            try:
+                await get_match_executor().run(self.data_loader.reload, version)
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Worker {worker_index()} failed to reload catalogs: {e}")
+                continue
+            
+            self.reloads += 1
+            self.last_error = None
+            self.last_reload_ms = (time.perf_counter() - started) * 1000
+            print(
+                f"Worker {worker_index()} switched to catalog version {version} "
+                f"in {self.last_reload_ms:.1f} ms"
+            )
+
+
+# Singleton instance
+_catalog_watcher = None
+
+
+def get_catalog_watcher() -> CatalogWatcher:
+    """Get singleton catalog watcher instance"""
+    global _catalog_watcher
+    if _catalog_watcher is None:
+        settings = get_settings()
+        _catalog_watcher = CatalogWatcher(
+            get_data_loader(),
+            poll_interval=settings.catalog_poll_interval,
+            stagger=settings.catalog_reload_stagger
+        )
+    return _catalog_watcher
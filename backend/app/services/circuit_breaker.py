@@ -0,0 +1,109 @@
+"""
+CircuitBreaker Service - Stop calling a dependency that keeps failing or stalling
+"""
+from typing import Any, Dict, Optional
+from collections import deque
+import time
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """The call was not attempted because the circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker over a sliding window of recent calls
+    
+    A call counts as bad when it fails or takes longer than
+    ``slow_call_seconds``. Once at least ``min_calls`` are in the window and
+    the bad share reaches ``failure_rate``, the circuit opens and callers
+    fail fast for ``open_seconds``. After that a single probe call is let
+    through (half open): success closes the circuit, failure reopens it.
+    Used from the event loop only, so no locking is needed.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        slow_call_seconds: float = 10.0,
+        open_seconds: float = 30.0
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self.rejected = 0
+        self._outcomes: deque = deque(maxlen=window)
+        self._probe_in_flight = False
+    
+    def allow(self) -> bool:
+        """Whether a call may go ahead now; every allowed call must be recorded"""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+        
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                return False
+            self._probe_in_flight = True
+        return True
+    
+    def record(self, success: bool, duration: float) -> None:
+        bad = not success or duration > self.slow_call_seconds
+        
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = False
+            if bad:
+                self._open()
+            else:
+                self.state = CLOSED
+                self._outcomes.clear()
+            return
+        
+        self._outcomes.append(bad)
+        if (
+            self.state == CLOSED
+            and len(self._outcomes) >= self.min_calls
+            and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate
+        ):
+            self._open()
+    
+    def release(self) -> None:
+        """An allowed call was abandoned before it had an outcome"""
+        self._probe_in_flight = False
+    
+    def stats(self) -> Dict[str, Any]:
+        calls = len(self._outcomes)
+        return {
+            "name": self.name,
+            "state": self.state,
+            "error_rate": sum(self._outcomes) / calls if calls else 0.0,
+            "window_calls": calls,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_in_seconds": (
+                max(self.open_seconds - (time.monotonic() - self.opened_at), 0.0)
+                if self.state == OPEN else None
+            )
+        }
+    
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._outcomes.clear()
@@ -0,0 +1,228 @@
+"""
+CommandCache Service - Persist Gemini's interpretations of admin messages in SQLite
+"""
+from typing import Any, Dict, List, Optional
+from pathlib import Path
+import json
+import sqlite3
+import threading
+import time
+
+from app.services.command_parser import CommandParser
+from config import get_settings
+
+# Parameters a mutating command needs before it can run
+REQUIRED_PARAMETERS: Dict[str, List[str]] = {
+    "add_product": ["id", "name", "category", "use_case", "technical_specs", "matching_criteria", "technical_truth"],
+    "add_ai_tool": [
+        "id", "name", "category", "use_cases", "technical_specs", "matching_criteria", "deployment_guide", "technical_truth"
+    ],
+    "update_product": ["id"],
+    "update_ai_tool": ["id"],
+    "delete_product": ["id"],
+    "delete_ai_tool": ["id"]
+}
+
+READ_ONLY_COMMANDS = frozenset({"catalog_info", "system_status", "run_tests", "git_status", "git_log"})
+
+# Cache hits recorded in memory before their use times are written out
+TOUCH_BATCH_SIZE = 50
+TOUCH_FLUSH_SECONDS = 30.0
+
+
+def is_cacheable(command_data: Dict[str, Any]) -> bool:
+    """
+    Whether an interpretation may be replayed for the same message
+    
+    Read-only commands always may. Mutating commands only when every
+    required parameter is present and no parameter was left empty, so a
+    half-understood edit is never repeated without asking Gemini again.
+    """
+    command = command_data.get("command")
+    parameters = command_data.get("parameters")
+    if not isinstance(parameters, dict):
+        return False
+    if command in READ_ONLY_COMMANDS:
+        return True
+    if command not in REQUIRED_PARAMETERS:
+        return False
+    if any(value is None or value == "" for value in parameters.values()):
+        return False
+    if command.startswith("update_") and len(parameters) < 2:
+        # An id alone says nothing about what to change
+        return False
+    return all(field in parameters for field in REQUIRED_PARAMETERS[command])
+
+
+class CommandCache:
+    """
+    Map normalized admin messages to ``{command, parameters, reasoning}``
+    
+    Entries expire after ``ttl_seconds``; past ``max_entries`` the least
+    recently used are dropped. The table lives in a small SQLite file, so
+    it is shared by all workers and survives restarts.
+    
+    A hit is a single read: its use time and hit count are kept in memory
+    and written out together with later hits, before the next store or
+    listing, or once ``TOUCH_BATCH_SIZE`` hits or ``TOUCH_FLUSH_SECONDS``
+    have built up. Every method blocks on SQLite; call them from a thread
+    in async code.
+    """
+    
+    def __init__(self, path: str, ttl_seconds: float = 86400, max_entries: int = 1000):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._touched: Dict[str, List[float]] = {}  # key -> [last used at, unwritten hits]
+        self._flushed_at = time.monotonic()
+    
+    def get(self, message: str) -> Optional[Dict[str, Any]]:
+        """Cached interpretation of ``message``, or None"""
+        key = CommandParser.normalize(message)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT interpretation FROM interpretations WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            touched = self._touched.setdefault(key, [now, 0])
+            touched[0] = now
+            touched[1] += 1
+            if (len(self._touched) >= TOUCH_BATCH_SIZE
+                    or time.monotonic() - self._flushed_at >= TOUCH_FLUSH_SECONDS):
+                self._flush_touched(conn)
+        self.hits += 1
+        return json.loads(row[0])
+    
+    def put(self, message: str, command_data: Dict[str, Any]) -> bool:
+        """Store an interpretation if it is safe to replay; returns whether it was stored"""
+        if not is_cacheable(command_data):
+            return False
+        
+        interpretation = json.dumps({
+            "command": command_data["command"],
+            "parameters": command_data["parameters"],
+            "reasoning": command_data.get("reasoning", "")
+        })
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            self._flush_touched(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO interpretations "
+                "(key, message, command, interpretation, created_at, last_used_at, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (CommandParser.normalize(message), message, command_data["command"], interpretation, now, now)
+            )
+            self._prune(conn, now)
+            conn.commit()
+        return True
+    
+    def entries(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Live entries, most recently used first"""
+        with self._lock:
+            conn = self._connect()
+            self._flush_touched(conn)
+            rows = conn.execute(
+                "SELECT key, message, command, interpretation, created_at, last_used_at, hits "
+                "FROM interpretations WHERE created_at > ? ORDER BY last_used_at DESC LIMIT ?",
+                (time.time() - self.ttl_seconds, limit)
+            ).fetchall()
+        return [
+            {
+                "key": key,
+                "message": message,
+                "command": command,
+                "parameters": json.loads(interpretation)["parameters"],
+                "created_at": created_at,
+                "last_used_at": last_used_at,
+                "hits": hits
+            }
+            for key, message, command, interpretation, created_at, last_used_at, hits in rows
+        ]
+    
+    def clear(self) -> int:
+        """Remove every entry; returns how many were removed"""
+        with self._lock:
+            conn = self._connect()
+            removed = conn.execute("DELETE FROM interpretations").rowcount
+            conn.commit()
+            self._touched.clear()
+        return removed
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = self._connect().execute("SELECT COUNT(*) FROM interpretations").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS interpretations ("
+                "key TEXT PRIMARY KEY, message TEXT NOT NULL, command TEXT NOT NULL, "
+                "interpretation TEXT NOT NULL, created_at REAL NOT NULL, "
+                "last_used_at REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS interpretations_last_used ON interpretations (last_used_at)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+    
+    def _flush_touched(self, conn: sqlite3.Connection) -> None:
+        """Write the use times and hit counts recorded since the last flush in one transaction"""
+        self._flushed_at = time.monotonic()
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, {}
+        with conn:
+            conn.executemany(
+                "UPDATE interpretations SET last_used_at = MAX(last_used_at, ?), hits = hits + ? WHERE key = ?",
+                [(last_used_at, int(hits), key) for key, (last_used_at, hits) in touched.items()]
+            )
+    
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM interpretations WHERE created_at <= ?", (now - self.ttl_seconds,))
+        conn.execute(
+            "DELETE FROM interpretations WHERE key NOT IN "
+            "(SELECT key FROM interpretations ORDER BY last_used_at DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+
+
+# Singleton instance
+_command_cache = None
+
+
+def get_command_cache() -> CommandCache:
+    """Get singleton command cache instance"""
+    global _command_cache
+    if _command_cache is None:
+        settings = get_settings()
+        _command_cache = CommandCache(
+            settings.command_cache_path,
+            ttl_seconds=settings.command_cache_ttl_seconds,
+            max_entries=settings.command_cache_max_entries
+        )
+    return _command_cache
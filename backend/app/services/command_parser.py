@@ -0,0 +1,148 @@
+"""
+CommandParser Service - Resolve common admin phrasings locally, without the LLM
+"""
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+import re
+
+from app.services.admin_processes import MAX_GIT_LOG_COUNT
+from app.services.metrics import registry
+
+ADMIN_COMMANDS = registry.counter(
+    "zd3_admin_commands_total",
+    "Admin messages by how they were interpreted",
+    ("source",)
+)
+
+# Filler stripped from the front of a message before matching
+_PREFIX = re.compile(
+    r'^(?:(?:please|pls|hey|ok|okay|can you|could you|would you|i want to|i\'d like to|'
+    r'let me see|let\'s|lets)\s+)+'
+)
+_TRAILING = re.compile(r'[\s?!.]+$')
+_SPACES = re.compile(r'\s+')
+
+
+def _no_parameters(match) -> Dict[str, Any]:
+    return {}
+
+
+def _git_log_parameters(match) -> Optional[Dict[str, Any]]:
+    count = match.group('count')
+    if count is None:
+        return {}
+    if not 1 <= int(count) <= MAX_GIT_LOG_COUNT:
+        return None
+    return {"count": int(count)}
+
+
+def _catalog_kind(match) -> Dict[str, Any]:
+    kind = match.group('kind')
+    if kind is None:
+        return {}
+    return {"kind": "products" if kind == "products" else "ai_tools"}
+
+
+# (command, pattern, parameter extractor); patterns match the whole normalized
+# message, and an extractor returning None rejects the match
+RULES: List[Tuple[str, str, Callable]] = [
+    ("system_status", r'(?:show |get |check )?(?:the )?(?:system )?(?:status|health)(?: check)?', _no_parameters),
+    ("system_status", r'(?:what\'?s|what is|how is) (?:the )?(?:system )?(?:status|health)', _no_parameters),
+    ("system_status", r'how is the system(?: doing)?', _no_parameters),
+    ("git_status", r'(?:show |get |check )?(?:the )?(?:git|repo|repository) status', _no_parameters),
+    ("git_status", r'(?:are there |any )?uncommitted changes', _no_parameters),
+    (
+        "git_log",
+        r'(?:show |list |get |view )?(?:me )?(?:the )?(?:git log|(?:last|latest|recent)(?: (?P<count>\d+))? commits)',
+        _git_log_parameters
+    ),
+    ("catalog_info", r'(?:show |list |get |view )?(?:me )?(?:the )?(?:catalog|catalogue)(?: info)?', _no_parameters),
+    (
+        "catalog_info",
+        r'(?:show |list |get |view )(?:me )?(?:all )?(?:the )?(?:(?:products|ai tools|tools) and (?:products|ai tools|tools)|(?P<kind>products|ai tools|tools))',
+        _catalog_kind
+    ),
+    ("catalog_info", r'how many (?P<kind>products|ai tools|tools)(?: are there)?', _catalog_kind),
+    ("run_tests", r'run (?:the )?(?:api )?tests', _no_parameters),
+]
+
+
+class CommandParser:
+    """
+    Deterministic parser for the admin command set
+    
+    Each rule must match the whole message after normalization, and a
+    message matching rules for different commands is left to the LLM.
+    Only read-only commands whose parameters can be read off the text are
+    handled. Adds and updates need structured fields, and deletes are too
+    costly to get wrong on a loose phrase match, so all three always go to
+    the LLM.
+    """
+    
+    def __init__(self, rules: List[Tuple[str, str, Callable]] = RULES):
+        self.rules: List[Tuple[str, Pattern, Callable]] = [
+            (command, re.compile(pattern), extract) for command, pattern, extract in rules
+        ]
+        self.messages = 0
+        self.fast_path = 0
+    
+    @staticmethod
+    def normalize(message: str) -> str:
+        """Lowercase, collapse whitespace and commas, drop filler and trailing punctuation"""
+        text = _SPACES.sub(' ', message.replace(',', ' ').strip().lower())
+        text = _TRAILING.sub('', text)
+        return _PREFIX.sub('', text)
+    
+    def parse(self, message: str) -> Optional[Dict[str, Any]]:
+        """
+        Interpret ``message`` locally
+        
+        Returns:
+            ``{command, parameters, reasoning}`` like the LLM's answer, or
+            None when the message needs the LLM
+        """
+        self.messages += 1
+        command_data = self.match(message)
+        if command_data is not None:
+            self.fast_path += 1
+        return command_data
+    
+    def match(self, message: str) -> Optional[Dict[str, Any]]:
+        """Like ``parse``, without counting the message in the stats"""
+        text = self.normalize(message)
+        
+        matches = []
+        for command, pattern, extract in self.rules:
+            match = pattern.fullmatch(text)
+            if match:
+                parameters = extract(match)
+                if parameters is not None:
+                    matches.append((command, parameters))
+        
+        if not matches or len({command for command, _ in matches}) > 1:
+            return None
+        
+        command, parameters = matches[0]
+        return {
+            "command": command,
+            "parameters": parameters,
+            "reasoning": "Matched a local command rule"
+        }
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "messages": self.messages,
+            "fast_path": self.fast_path,
+            "fast_path_ratio": self.fast_path / self.messages if self.messages else 0.0
+        }
+
+
+# Singleton instance
+_command_parser = None
+
+
+def get_command_parser() -> CommandParser:
+    """Get singleton command parser instance"""
+    global _command_parser
+    if _command_parser is None:
+        _command_parser = CommandParser()
+    return _command_parser
@@ -2,9 +2,9 @@
 CrossReferenceVault Service - Query logic vault and product ledger
 Implements the 65/35 framework for matching
 """
-from typing import List, Dict, Any, Tuple
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import List, Dict, Any, Callable, Optional, Sequence, Tuple
+import heapq
+import time
 
 
 class CrossReferenceEngine:
@@ -12,16 +12,46 @@ class CrossReferenceEngine:
     Cross-reference engine implementing 65/35 framework:
     - 65% Structural Logic: Pattern matching from successful implementations
     - 35% Original Precision: Technical truth filtering
+    
+    With a ``text_similarity_weight`` and per-item similarities of the
+    request text, the 65/35 score is blended with the similarity.
     """
     
-    def __init__(self, structural_weight: float = 0.65, precision_weight: float = 0.35):
+    # Domain compatibility matrix
+    DOMAIN_COMPATIBILITY = {
+        'customer_support': ['general purpose llm', 'safety-focused llm'],
+        'content_creation': ['general purpose llm'],
+        'data_analysis': ['general purpose llm', 'safety-focused llm'],
+        'code_automation': ['agentic workflow', 'general purpose llm'],
+        'workflow_automation': ['agentic workflow', 'no-code integration'],
+        'communication': ['general purpose llm', 'no-code integration']
+    }
+    
+    # Use case to category mapping
+    USE_CASE_CATEGORIES = {
+        'ml_development': ['extreme performance'],
+        'video_editing': ['extreme performance', 'precision creativity'],
+        'creative_work': ['precision creativity'],
+        'software_development': ['extreme performance', 'ecosystem synergy'],
+        'gaming': ['extreme performance'],
+        'general_productivity': ['ecosystem synergy', 'precision creativity']
+    }
+    
+    def __init__(
+        self,
+        structural_weight: float = 0.65,
+        precision_weight: float = 0.35,
+        text_similarity_weight: float = 0.0
+    ):
         self.structural_weight = structural_weight
         self.precision_weight = precision_weight
+        self.text_similarity_weight = text_similarity_weight
     
     def match_ai_tools(
         self,
         intent_analysis: Dict[str, Any],
-        tools_catalog: List[Dict]
+        tools_catalog: List[Dict],
+        similarities: Optional[Sequence[float]] = None
     ) -> List[Tuple[Dict, float]]:
         """
         Match AI tools to company requirements
@@ -29,42 +59,73 @@ class CrossReferenceEngine:
         Args:
             intent_analysis: Analyzed intent from AnalyzeIntent service
             tools_catalog: Available AI tools
+            similarities: Text similarity of the request to each tool
         
         Returns:
             List of (tool, score) tuples sorted by match score
         """
-        matches = []
+        return self.top_matches(self.score_ai_tools(intent_analysis, tools_catalog, similarities=similarities))
+    
+    def score_ai_tools(
+        self,
+        intent_analysis: Dict[str, Any],
+        tools_catalog: List[Dict],
+        deadline: Optional[float] = None,
+        similarities: Optional[Sequence[float]] = None
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Score every AI tool against company requirements
         
-        for tool in tools_catalog:
-            # Calculate structural logic score (65%)
-            structural_score = self._calculate_structural_match(
-                intent_analysis,
-                tool
-            )
-            
-            # Calculate precision score (35%)
-            precision_score = self._calculate_precision_match(
-                intent_analysis,
-                tool
-            )
-            
-            # Combine scores using 65/35 framework
-            final_score = (
-                structural_score * self.structural_weight +
-                precision_score * self.precision_weight
+        Args:
+            intent_analysis: Analyzed intent from AnalyzeIntent service
+            tools_catalog: Available AI tools
+            deadline: ``time.perf_counter()`` value to stop scoring at. AI tools are
+                then scored most promising first, so the ones left unscored
+                are the least likely matches
+            similarities: Text similarity of the request to each tool, blended
+                in with ``text_similarity_weight``
+        
+        Returns:
+            List of (tool, score) tuples in catalog order; shorter than the
+            catalog when the deadline cut scoring short
+        """
+        if deadline is not None:
+            return self._score_until(
+                intent_analysis, tools_catalog, self._tool_priority, self._score_tool, deadline, similarities
             )
-            
-            matches.append((tool, final_score))
         
-        # Sort by score descending
-        matches.sort(key=lambda x: x[1], reverse=True)
+        if similarities is not None:
+            return [
+                (tool, self._blend(self._score_tool(intent_analysis, tool), similarity))
+                for tool, similarity in zip(tools_catalog, similarities)
+            ]
+        return [(tool, self._score_tool(intent_analysis, tool)) for tool in tools_catalog]
+    
+    def _score_tool(self, intent_analysis: Dict[str, Any], tool: Dict) -> float:
+        """65/35 score of one AI tool"""
+        # Calculate structural logic score (65%)
+        structural_score = self._calculate_structural_match(
+            intent_analysis,
+            tool
+        )
+        
+        # Calculate precision score (35%)
+        precision_score = self._calculate_precision_match(
+            intent_analysis,
+            tool
+        )
         
-        return matches
+        # Combine scores using 65/35 framework
+        return (
+            structural_score * self.structural_weight +
+            precision_score * self.precision_weight
+        )
     
     def match_products(
         self,
         intent_analysis: Dict[str, Any],
-        products_catalog: List[Dict]
+        products_catalog: List[Dict],
+        similarities: Optional[Sequence[float]] = None
     ) -> List[Tuple[Dict, float]]:
         """
         Match products to individual requirements
@@ -72,37 +133,128 @@ class CrossReferenceEngine:
         Args:
             intent_analysis: Analyzed intent from AnalyzeIntent service
             products_catalog: Available products
+            similarities: Text similarity of the request to each product
         
         Returns:
             List of (product, score) tuples sorted by match score
         """
-        matches = []
+        return self.top_matches(self.score_products(intent_analysis, products_catalog, similarities=similarities))
+    
+    def score_products(
+        self,
+        intent_analysis: Dict[str, Any],
+        products_catalog: List[Dict],
+        deadline: Optional[float] = None,
+        similarities: Optional[Sequence[float]] = None
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Score every product against individual requirements
         
-        for product in products_catalog:
-            # Calculate structural logic score (65%)
-            structural_score = self._calculate_product_structural_match(
-                intent_analysis,
-                product
-            )
-            
-            # Calculate precision score (35%)
-            precision_score = self._calculate_product_precision_match(
-                intent_analysis,
-                product
-            )
-            
-            # Combine scores using 65/35 framework
-            final_score = (
-                structural_score * self.structural_weight +
-                precision_score * self.precision_weight
+        Args:
+            intent_analysis: Analyzed intent from AnalyzeIntent service
+            products_catalog: Available products
+            deadline: ``time.perf_counter()`` value to stop scoring at. Products are
+                then scored most promising first, so the ones left unscored
+                are the least likely matches
+            similarities: Text similarity of the request to each product,
+                blended in with ``text_similarity_weight``
+        
+        Returns:
+            List of (product, score) tuples in catalog order; shorter than the
+            catalog when the deadline cut scoring short
+        """
+        if deadline is not None:
+            return self._score_until(
+                intent_analysis, products_catalog, self._product_priority, self._score_product, deadline, similarities
             )
-            
-            matches.append((product, final_score))
         
-        # Sort by score descending
-        matches.sort(key=lambda x: x[1], reverse=True)
+        if similarities is not None:
+            return [
+                (product, self._blend(self._score_product(intent_analysis, product), similarity))
+                for product, similarity in zip(products_catalog, similarities)
+            ]
+        return [(product, self._score_product(intent_analysis, product)) for product in products_catalog]
+    
+    def _score_product(self, intent_analysis: Dict[str, Any], product: Dict) -> float:
+        """65/35 score of one product"""
+        # Calculate structural logic score (65%)
+        structural_score = self._calculate_product_structural_match(
+            intent_analysis,
+            product
+        )
+        
+        # Calculate precision score (35%)
+        precision_score = self._calculate_product_precision_match(
+            intent_analysis,
+            product
+        )
         
-        return matches
+        # Combine scores using 65/35 framework
+        return (
+            structural_score * self.structural_weight +
+            precision_score * self.precision_weight
+        )
+    
+    def _score_until(
+        self,
+        intent_analysis: Dict[str, Any],
+        catalog: List[Dict],
+        priority: Callable[[Dict[str, Any], Dict], int],
+        score: Callable[[Dict[str, Any], Dict], float],
+        deadline: float,
+        similarities: Optional[Sequence[float]] = None
+    ) -> List[Tuple[Dict, float]]:
+        """Score ``catalog`` in priority order until ``deadline``, keeping catalog order"""
+        order = sorted(range(len(catalog)), key=lambda i: priority(intent_analysis, catalog[i]))
+        
+        scored = []
+        for i in order:
+            # Always score at least one candidate
+            if scored and time.perf_counter() >= deadline:
+                break
+            item_score = score(intent_analysis, catalog[i])
+            if similarities is not None:
+                item_score = self._blend(item_score, similarities[i])
+            scored.append((i, catalog[i], item_score))
+        
+        scored.sort(key=lambda entry: entry[0])
+        return [(item, item_score) for _, item, item_score in scored]
+    
+    def _blend(self, score: float, similarity: float) -> float:
+        """Mix a 65/35 score with the request's text similarity to the item"""
+        return score * (1 - self.text_similarity_weight) + similarity * self.text_similarity_weight
+    
+    def _tool_priority(self, intent: Dict[str, Any], tool: Dict) -> int:
+        """0 for tools in a category compatible with the problem domain, else 1"""
+        compatible_categories = self.DOMAIN_COMPATIBILITY.get(intent.get('problem_domain', 'general'))
+        if compatible_categories is None:
+            return 0
+        return 0 if tool.get('category', '').lower() in compatible_categories else 1
+    
+    def _product_priority(self, intent: Dict[str, Any], product: Dict) -> int:
+        """0 for products in a category suited to the use case, else 1"""
+        suitable_categories = self.USE_CASE_CATEGORIES.get(intent.get('use_case', 'general_use'), [])
+        product_category = product.get('category', '').lower()
+        return 0 if any(cat in product_category for cat in suitable_categories) else 1
+    
+    @staticmethod
+    def top_matches(
+        matches: List[Tuple[Dict, float]],
+        top_k: Optional[int] = None
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Order scored matches by score descending, keeping catalog order on ties
+        
+        Args:
+            matches: (item, score) tuples from ``score_ai_tools``/``score_products``
+            top_k: Keep only the best ``top_k`` matches (all when None)
+        
+        Returns:
+            List of (item, score) tuples sorted by match score
+        """
+        if top_k is None or top_k >= len(matches):
+            return sorted(matches, key=lambda x: x[1], reverse=True)
+        return heapq.nlargest(top_k, matches, key=lambda x: x[1])
     
     def _calculate_structural_match(
         self,
@@ -121,17 +273,7 @@ class CrossReferenceEngine:
         problem_domain = intent.get('problem_domain', 'general')
         tool_category = tool.get('category', '').lower()
         
-        # Domain compatibility matrix
-        domain_compat = {
-            'customer_support': ['general purpose llm', 'safety-focused llm'],
-            'content_creation': ['general purpose llm'],
-            'data_analysis': ['general purpose llm', 'safety-focused llm'],
-            'code_automation': ['agentic workflow', 'general purpose llm'],
-            'workflow_automation': ['agentic workflow', 'no-code integration'],
-            'communication': ['general purpose llm', 'no-code integration']
-        }
-        
-        compatible_categories = domain_compat.get(problem_domain, [tool_category])
+        compatible_categories = self.DOMAIN_COMPATIBILITY.get(problem_domain, [tool_category])
         if tool_category in compatible_categories:
             score += domain_weight
         weights_sum += domain_weight
@@ -246,17 +388,7 @@ class CrossReferenceEngine:
         user_use_case = intent.get('use_case', 'general_use')
         product_category = product.get('category', '').lower()
         
-        # Use case to category mapping
-        use_case_mapping = {
-            'ml_development': ['extreme performance'],
-            'video_editing': ['extreme performance', 'precision creativity'],
-            'creative_work': ['precision creativity'],
-            'software_development': ['extreme performance', 'ecosystem synergy'],
-            'gaming': ['extreme performance'],
-            'general_productivity': ['ecosystem synergy', 'precision creativity']
-        }
-        
-        suitable_categories = use_case_mapping.get(user_use_case, [])
+        suitable_categories = self.USE_CASE_CATEGORIES.get(user_use_case, [])
         if any(cat in product_category for cat in suitable_categories):
             score += use_case_weight
         else:
@@ -388,5 +520,9 @@ def get_cross_reference_engine() -> CrossReferenceEngine:
     """Get singleton cross-reference engine instance"""
     global _cross_reference_engine
     if _cross_reference_engine is None:
-        _cross_reference_engine = CrossReferenceEngine()
+        from config import get_settings
+        
+        _cross_reference_engine = CrossReferenceEngine(
+            text_similarity_weight=get_settings().text_similarity_weight
+        )
     return _cross_reference_engine
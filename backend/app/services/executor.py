@@ -0,0 +1,72 @@
+"""
+Executor Service - Run CPU-bound match work off the event loop
+"""
+from typing import Any, Callable, Dict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import functools
+import threading
+
+from config import get_settings
+
+
+class MatchExecutor:
+    """Bounded thread pool for match computations"""
+    
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="match")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.running = 0
+    
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``func`` in the pool, carrying over the caller's context"""
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self._call, func, args, kwargs)
+        
+        with self._lock:
+            self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, call)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+    
+    @property
+    def queue_depth(self) -> int:
+        """Submitted jobs that have not started running yet"""
+        return max(self.in_flight - self.running, 0)
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "running": self.running,
+            "queue_depth": self.queue_depth
+        }
+    
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _call(self, func: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self.running += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+# Singleton instance
+_match_executor = None
+
+
+def get_match_executor() -> MatchExecutor:
+    """Get singleton match executor instance"""
+    global _match_executor
+    if _match_executor is None:
+        _match_executor = MatchExecutor(get_settings().match_executor_workers)
+    return _match_executor
@@ -1,29 +1,47 @@
 """
 Gemini AI Service - Natural language command execution
 """
-import google.generativeai as genai
 from typing import Dict, Any, List
-import json
-import subprocess
+import asyncio
 from datetime import datetime
 from config import get_settings
+from app.services.admin_processes import get_process_runner, command_argv, PROCESS_TIMEOUTS
+from app.services.command_parser import get_command_parser, ADMIN_COMMANDS
+from app.services.command_cache import get_command_cache, REQUIRED_PARAMETERS
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.llm_backends import create_backend, MicroBatcher, InterpretationError, LocalRuleBackend
+from app.services.tracing import get_tracer
 
 settings = get_settings()
 
 
 class GeminiAdminService:
-    """Service for executing admin commands via Gemini AI"""
+    """
+    Service for executing admin commands via Gemini AI
+    
+    Messages not resolved by the local parser or the command cache are
+    interpreted by the configured LLM backend (Gemini by default), through
+    a micro-batcher that merges concurrent messages into one call. While
+    the backend's circuit breaker is open, local rules answer instead.
+    """
     
     def __init__(self):
-        if settings.gemini_api_key:
-            genai.configure(api_key=settings.gemini_api_key)
-            self.model = genai.GenerativeModel(settings.gemini_model)
-        else:
-            self.model = None
+        self.backend = create_backend(settings.llm_backend)
+        self.batcher = MicroBatcher(
+            self.backend,
+            max_batch_size=settings.llm_batch_max_size,
+            max_wait_ms=settings.llm_batch_wait_ms
+        )
+        self.fallback = LocalRuleBackend()
+    
+    @property
+    def model(self):
+        """The Gemini model, or None when Gemini is not the configured backend"""
+        return getattr(self.backend, "model", None)
     
     async def execute_command(self, user_message: str) -> Dict[str, Any]:
         """
-        Execute admin command via Gemini AI
+        Execute admin command, interpreted locally or via Gemini AI
         
         Args:
             user_message: Natural language command from admin
@@ -31,74 +49,65 @@ class GeminiAdminService:
         Returns:
             Dict with execution results
         """
-        if not self.model:
+        # Common phrasings are resolved locally, and messages Gemini has
+        # already interpreted are replayed, both without a Gemini round-trip
+        command_data = get_command_parser().parse(user_message)
+        source = "local"
+        if command_data is None:
+            command_data = await asyncio.to_thread(get_command_cache().get, user_message)
+            source = "cache"
+        
+        if command_data is not None:
+            ADMIN_COMMANDS.inc(source)
+            result = await self._execute_admin_command(
+                command_data["command"],
+                command_data["parameters"],
+                command_data["reasoning"]
+            )
+            result["source"] = source
+            return result
+        
+        if not self.backend.available:
             return {
                 "success": False,
-                "error": "Gemini API key not configured. Please set GEMINI_API_KEY environment variable.",
+                "error": self.backend.unavailable_reason,
                 "timestamp": datetime.utcnow().isoformat()
             }
         
-        # Create context for Gemini
-        context = self._get_system_context()
-        
-        # Build prompt
-        prompt = f"""You are an AI assistant for the ZeroDay3 Matching AI system. 
-You help administrators manage the system through natural language commands.
-
-System Context:
-{context}
-
-Available Commands:
-1. catalog_info - Get information about products and AI tools
-2. add_product - Add a new product to the catalog
-3. add_ai_tool - Add a new AI tool to the catalog
-4. update_product - Update existing product
-5. update_ai_tool - Update existing AI tool
-6. delete_product - Remove a product
-7. delete_ai_tool - Remove an AI tool
-8. system_status - Get system health and statistics
-9. run_tests - Execute API tests
-10. git_status - Check repository status
-11. git_log - View recent commits
-
-User Request: {user_message}
-
-Analyze the request and return a JSON object with:
-{{
-    "command": "command_name",
-    "parameters": {{}},
-    "reasoning": "why this command was chosen"
-}}
-
-Only return valid JSON, no additional text."""
-
         try:
-            # Generate response from Gemini
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Extract JSON from response
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            command_data = json.loads(response_text.strip())
+            # Interpret with the LLM backend
+            try:
+                command_data = await self.batcher.interpret(user_message, self._get_system_context())
+                source = self.backend.name
+                if self.backend.cache_results:
+                    await asyncio.to_thread(get_command_cache().put, user_message, command_data)
+            except CircuitOpenError:
+                # The backend keeps failing: answer from local rules instead of waiting on it
+                command_data = await self.fallback.interpret(user_message, "")
+                source = "fallback"
+            ADMIN_COMMANDS.inc(source)
             
             # Execute the command
             result = await self._execute_admin_command(
-                command_data.get("command"),
-                command_data.get("parameters", {}),
-                command_data.get("reasoning", "")
+                command_data["command"],
+                command_data["parameters"],
+                command_data["reasoning"]
             )
+            result["source"] = source
             
             return result
             
-        except json.JSONDecodeError as e:
+        except asyncio.TimeoutError:
+            return {
+                "success": False,
+                "error": f"Gemini did not respond within {settings.gemini_timeout_seconds:g} seconds",
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        except InterpretationError as e:
             return {
                 "success": False,
                 "error": f"Failed to parse AI response: {str(e)}",
-                "raw_response": response_text if 'response_text' in locals() else None,
+                "raw_response": e.raw_response,
                 "timestamp": datetime.utcnow().isoformat()
             }
         except Exception as e:
@@ -139,9 +148,22 @@ Only return valid JSON, no additional text."""
             "timestamp": datetime.utcnow().isoformat()
         }
         
+        with get_tracer().span("admin.command", command=str(command)) as span:
+            await self._dispatch_command(command, parameters, result)
+            span.set_attribute("success", bool(result.get("success")))
+        
+        return result
+    
+    async def _dispatch_command(
+        self,
+        command: str,
+        parameters: Dict[str, Any],
+        result: Dict[str, Any]
+    ) -> None:
+        """Run the handler for ``command`` and merge its output into ``result``"""
         try:
             if command == "catalog_info":
-                result.update(await self._get_catalog_info())
+                result.update(await self._get_catalog_info(parameters))
             
             elif command == "add_product":
                 result.update(await self._add_product(parameters))
@@ -178,177 +200,201 @@ Only return valid JSON, no additional text."""
             
         except Exception as e:
             result["error"] = str(e)
-        
-        return result
     
-    async def _get_catalog_info(self) -> Dict[str, Any]:
-        """Get catalog information"""
+    async def _get_catalog_info(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get a page of products and/or AI tools with facet counts
+        
+        Parameters: ``kind`` ('products' or 'ai_tools', default both),
+        ``page``, ``page_size`` and facet filters such as ``category``. Without
+        ``kind``, a catalog lacking a filtered facet is left out. Parameters
+        that are not a filter of any listed catalog are ignored and returned
+        under ``ignored_parameters``.
+        
+        Each catalog keeps the original ``count`` (catalog size) and ``items``
+        keys. ``items`` holds one page, ``admin_catalog_page_size`` items by
+        default; ``matched``, ``has_more`` and ``next_page`` say what is left.
+        """
         from app.database import get_data_loader
         
         data_loader = get_data_loader()
-        products = data_loader.load_product_catalog()
-        tools = data_loader.load_ai_tools_catalog()
+        indexes = {"products": data_loader.product_index(), "ai_tools": data_loader.ai_tools_index()}
         
-        return {
-            "success": True,
-            "data": {
-                "products": {
-                    "count": len(products),
-                    "items": [{"id": p["id"], "name": p["name"], "category": p["category"]} for p in products]
-                },
-                "ai_tools": {
-                    "count": len(tools),
-                    "items": [{"id": t["id"], "name": t["name"], "category": t["category"]} for t in tools]
-                }
-            }
+        kind = parameters.get("kind")
+        if kind is not None and kind not in indexes:
+            return {"success": False, "error": f"Unknown catalog kind: {kind}"}
+        if kind is not None:
+            indexes = {kind: indexes[kind]}
+        
+        try:
+            page = int(parameters.get("page", 1))
+            page_size = min(
+                int(parameters.get("page_size", settings.admin_catalog_page_size)),
+                settings.admin_catalog_max_page_size
+            )
+        except (TypeError, ValueError):
+            return {"success": False, "error": "page and page_size must be integers"}
+        
+        facets = {facet for index in indexes.values() for facet in index.facets}
+        filters = {}
+        ignored = []
+        for key, value in parameters.items():
+            if key in ("kind", "page", "page_size") or value in (None, ""):
+                continue
+            if key in facets:
+                filters[key] = value
+            else:
+                ignored.append(key)
+        
+        data = {
+            name: index.page(filters, page=page, page_size=page_size)
+            for name, index in indexes.items()
+            if set(filters) <= set(index.facets)
         }
+        if not data:
+            return {"success": False, "error": f"No catalog has all of the filters: {', '.join(sorted(filters))}"}
+        
+        result = {"success": True, "data": data}
+        if ignored:
+            result["ignored_parameters"] = sorted(ignored)
+        return result
     
     async def _add_product(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Add a new product to catalog"""
-        import json
-        from pathlib import Path
-        
-        catalog_path = Path(__file__).parent.parent.parent / "data" / "product_catalog.json"
-        
-        with open(catalog_path, 'r') as f:
-            catalog = json.load(f)
+        from app.database import get_data_loader
         
         # Validate required fields
-        required_fields = ["id", "name", "category", "use_case", "technical_specs", "matching_criteria", "technical_truth"]
-        for field in required_fields:
+        for field in REQUIRED_PARAMETERS["add_product"]:
             if field not in parameters:
                 return {"success": False, "error": f"Missing required field: {field}"}
         
-        catalog["products"].append(parameters)
-        
-        with open(catalog_path, 'w') as f:
-            json.dump(catalog, f, indent=2)
+        def add() -> None:
+            data_loader = get_data_loader()
+            with data_loader.write_lock():
+                products = list(data_loader.load_product_catalog())
+                products.append(parameters)
+                data_loader.save_product_catalog(products)
         
+        await asyncio.to_thread(add)
         return {"success": True, "message": f"Product '{parameters['name']}' added successfully"}
     
     async def _add_ai_tool(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Add a new AI tool to catalog"""
-        import json
-        from pathlib import Path
-        
-        catalog_path = Path(__file__).parent.parent.parent / "data" / "ai_tools_catalog.json"
-        
-        with open(catalog_path, 'r') as f:
-            catalog = json.load(f)
+        from app.database import get_data_loader
         
         # Validate required fields
-        required_fields = ["id", "name", "category", "use_cases", "technical_specs", "matching_criteria", "deployment_guide", "technical_truth"]
-        for field in required_fields:
+        for field in REQUIRED_PARAMETERS["add_ai_tool"]:
             if field not in parameters:
                 return {"success": False, "error": f"Missing required field: {field}"}
         
-        catalog["ai_tools"].append(parameters)
-        
-        with open(catalog_path, 'w') as f:
-            json.dump(catalog, f, indent=2)
+        def add() -> None:
+            data_loader = get_data_loader()
+            with data_loader.write_lock():
+                tools = list(data_loader.load_ai_tools_catalog())
+                tools.append(parameters)
+                data_loader.save_ai_tools_catalog(tools)
         
+        await asyncio.to_thread(add)
         return {"success": True, "message": f"AI Tool '{parameters['name']}' added successfully"}
     
     async def _update_product(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Update existing product"""
-        import json
-        from pathlib import Path
+        from app.database import get_data_loader
         
         product_id = parameters.get("id")
         if not product_id:
             return {"success": False, "error": "Product ID required"}
         
-        catalog_path = Path(__file__).parent.parent.parent / "data" / "product_catalog.json"
-        
-        with open(catalog_path, 'r') as f:
-            catalog = json.load(f)
-        
-        # Find and update product
-        for i, product in enumerate(catalog["products"]):
-            if product["id"] == product_id:
-                catalog["products"][i].update(parameters)
-                
-                with open(catalog_path, 'w') as f:
-                    json.dump(catalog, f, indent=2)
+        def update() -> bool:
+            data_loader = get_data_loader()
+            with data_loader.write_lock():
+                position = data_loader.product_index().positions.get(product_id)
+                if position is None:
+                    return False
                 
-                return {"success": True, "message": f"Product '{product_id}' updated successfully"}
+                # Update a copy, loaded catalogs are shared
+                products = list(data_loader.load_product_catalog())
+                products[position] = {**products[position], **parameters}
+                data_loader.save_product_catalog(products)
+                return True
         
-        return {"success": False, "error": f"Product '{product_id}' not found"}
+        if not await asyncio.to_thread(update):
+            return {"success": False, "error": f"Product '{product_id}' not found"}
+        return {"success": True, "message": f"Product '{product_id}' updated successfully"}
     
     async def _update_ai_tool(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Update existing AI tool"""
-        import json
-        from pathlib import Path
+        from app.database import get_data_loader
         
         tool_id = parameters.get("id")
         if not tool_id:
             return {"success": False, "error": "Tool ID required"}
         
-        catalog_path = Path(__file__).parent.parent.parent / "data" / "ai_tools_catalog.json"
-        
-        with open(catalog_path, 'r') as f:
-            catalog = json.load(f)
-        
-        # Find and update tool
-        for i, tool in enumerate(catalog["ai_tools"]):
-            if tool["id"] == tool_id:
-                catalog["ai_tools"][i].update(parameters)
-                
-                with open(catalog_path, 'w') as f:
-                    json.dump(catalog, f, indent=2)
+        def update() -> bool:
+            data_loader = get_data_loader()
+            with data_loader.write_lock():
+                position = data_loader.ai_tools_index().positions.get(tool_id)
+                if position is None:
+                    return False
                 
-                return {"success": True, "message": f"AI Tool '{tool_id}' updated successfully"}
+                # Update a copy, loaded catalogs are shared
+                tools = list(data_loader.load_ai_tools_catalog())
+                tools[position] = {**tools[position], **parameters}
+                data_loader.save_ai_tools_catalog(tools)
+                return True
         
-        return {"success": False, "error": f"AI Tool '{tool_id}' not found"}
+        if not await asyncio.to_thread(update):
+            return {"success": False, "error": f"AI Tool '{tool_id}' not found"}
+        return {"success": True, "message": f"AI Tool '{tool_id}' updated successfully"}
     
     async def _delete_product(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Delete a product"""
-        import json
-        from pathlib import Path
+        from app.database import get_data_loader
         
         product_id = parameters.get("id")
         if not product_id:
             return {"success": False, "error": "Product ID required"}
         
-        catalog_path = Path(__file__).parent.parent.parent / "data" / "product_catalog.json"
-        
-        with open(catalog_path, 'r') as f:
-            catalog = json.load(f)
-        
-        initial_count = len(catalog["products"])
-        catalog["products"] = [p for p in catalog["products"] if p["id"] != product_id]
+        def delete() -> bool:
+            data_loader = get_data_loader()
+            with data_loader.write_lock():
+                products = data_loader.load_product_catalog()
+                
+                remaining = [p for p in products if p["id"] != product_id]
+                
+                if len(remaining) == len(products):
+                    return False
+                
+                data_loader.save_product_catalog(remaining)
+                return True
         
-        if len(catalog["products"]) == initial_count:
+        if not await asyncio.to_thread(delete):
             return {"success": False, "error": f"Product '{product_id}' not found"}
-        
-        with open(catalog_path, 'w') as f:
-            json.dump(catalog, f, indent=2)
-        
         return {"success": True, "message": f"Product '{product_id}' deleted successfully"}
     
     async def _delete_ai_tool(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Delete an AI tool"""
-        import json
-        from pathlib import Path
+        from app.database import get_data_loader
         
         tool_id = parameters.get("id")
         if not tool_id:
             return {"success": False, "error": "Tool ID required"}
         
-        catalog_path = Path(__file__).parent.parent.parent / "data" / "ai_tools_catalog.json"
-        
-        with open(catalog_path, 'r') as f:
-            catalog = json.load(f)
-        
-        initial_count = len(catalog["ai_tools"])
-        catalog["ai_tools"] = [t for t in catalog["ai_tools"] if t["id"] != tool_id]
+        def delete() -> bool:
+            data_loader = get_data_loader()
+            with data_loader.write_lock():
+                tools = data_loader.load_ai_tools_catalog()
+                
+                remaining = [t for t in tools if t["id"] != tool_id]
+                
+                if len(remaining) == len(tools):
+                    return False
+                
+                data_loader.save_ai_tools_catalog(remaining)
+                return True
         
-        if len(catalog["ai_tools"]) == initial_count:
+        if not await asyncio.to_thread(delete):
             return {"success": False, "error": f"AI Tool '{tool_id}' not found"}
-        
-        with open(catalog_path, 'w') as f:
-            json.dump(catalog, f, indent=2)
-        
         return {"success": True, "message": f"AI Tool '{tool_id}' deleted successfully"}
     
     async def _get_system_status(self) -> Dict[str, Any]:
@@ -374,61 +420,48 @@ Only return valid JSON, no additional text."""
     async def _run_tests(self) -> Dict[str, Any]:
         """Run API tests"""
         try:
-            result = subprocess.run(
-                ["python3", "test_api.py"],
-                cwd="/home/runner/work/zeroday3/zeroday3",
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            returncode, stdout, stderr = await self._run_process("run_tests", {})
             
             return {
-                "success": result.returncode == 0,
-                "output": result.stdout,
-                "error": result.stderr if result.returncode != 0 else None
+                "success": returncode == 0,
+                "output": stdout,
+                "error": stderr if returncode != 0 else None
             }
-        except subprocess.TimeoutExpired:
-            return {"success": False, "error": "Tests timed out after 30 seconds"}
+        except asyncio.TimeoutError:
+            return {"success": False, "error": f"Tests timed out after {PROCESS_TIMEOUTS['run_tests']:g} seconds"}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
     async def _git_status(self) -> Dict[str, Any]:
         """Get git repository status"""
         try:
-            result = subprocess.run(
-                ["git", "status", "--short"],
-                cwd="/home/runner/work/zeroday3/zeroday3",
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            _, stdout, _ = await self._run_process("git_status", {})
             
             return {
                 "success": True,
-                "output": result.stdout if result.stdout else "Working tree clean"
+                "output": stdout if stdout else "Working tree clean"
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
     
     async def _git_log(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Get git log"""
-        count = parameters.get("count", 5)
-        
         try:
-            result = subprocess.run(
-                ["git", "log", f"-{count}", "--oneline"],
-                cwd="/home/runner/work/zeroday3/zeroday3",
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            _, stdout, _ = await self._run_process("git_log", parameters)
             
             return {
                 "success": True,
-                "output": result.stdout
+                "output": stdout
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
+    
+    async def _run_process(self, command: str, parameters: Dict[str, Any]):
+        """Run a command's process in the repository without blocking the event loop"""
+        return await get_process_runner().run(
+            command_argv(command, parameters),
+            timeout=PROCESS_TIMEOUTS[command]
+        )
 
 
 # Singleton instance
@@ -1,12 +1,176 @@
 """
 GenerateInstructions Service - Create deployment guides and recommendations
 """
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Hashable
+from collections import OrderedDict
+import threading
+
+from app.services.tracing import current_span
+from config import get_settings
+
+
+class FragmentCache:
+    """Thread-safe LRU cache for rendered text fragments"""
+    
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_render(self, key: Hashable, render: Callable[[], Any]) -> Any:
+        """Return the cached fragment for ``key``, rendering it on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                current_span().increment('cache.hits')
+                return self._entries[key]
+            self.misses += 1
+        current_span().increment('cache.misses')
+        
+        # Render outside the lock; a concurrent miss just renders twice
+        value = render()
+        
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        
+        return value
+    
+    def clear(self) -> None:
+        """Drop all cached fragments"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
 
 
 class InstructionGenerator:
     """Generate deployment guides and product recommendations"""
     
+    # Reasoning templates
+    CONFIDENCE_TEMPLATE = "Match confidence: {score_pct}%. "
+    TOOL_DOMAIN_TEMPLATE = "Specialized for {problem_domain} with {category} capabilities"
+    TOOL_STRENGTH_TEMPLATE = "Key advantage: {strength}"
+    TOOL_AUTOMATION_TEMPLATE = "Strong automation capabilities matching {automation_potential} needs"
+    PRODUCT_USE_CASE_TEMPLATE = "Optimized for {use_case} in {category} category"
+    PRODUCT_STRENGTH_TEMPLATE = "Technical advantage: {strength}"
+    PRODUCT_PERFORMANCE_REASON = "Delivers extreme performance as prioritized"
+    PRODUCT_PORTABILITY_REASON = "Offers excellent portability as needed"
+    
+    # Domain-specific deployment instructions
+    DOMAIN_INSTRUCTIONS = {
+        'customer_support': (
+            "Configure response templates aligned with your brand voice",
+            "Set up escalation paths for complex queries the AI cannot handle"
+        ),
+        'content_creation': (
+            "Create style guide prompts for consistent content output",
+            "Implement review workflow for AI-generated content"
+        ),
+        'workflow_automation': (
+            "Map existing workflow steps and identify automation points",
+            "Set up monitoring for automated task success rates"
+        )
+    }
+    ENTERPRISE_INSTRUCTIONS = (
+        "Coordinate with IT security for enterprise policy compliance",
+        "Plan phased rollout with pilot groups before full deployment"
+    )
+    
+    # Deployment strategy templates
+    STRATEGY_INTRO_TEMPLATE = "Recommended solution for {problem_domain} optimization using {tool_name}."
+    STRATEGY_APPROACH = {
+        'high': (
+            "Deploy with full automation pipeline including monitoring, fallback handling, "
+            "and continuous improvement loops."
+        ),
+        'moderate': (
+            "Deploy in human-in-the-loop mode with AI assistance. "
+            "Gradually increase automation as confidence and metrics improve."
+        )
+    }
+    STRATEGY_APPROACH_DEFAULT = (
+        "Deploy as an assistant tool with human oversight. "
+        "Focus on augmenting rather than replacing existing processes."
+    )
+    STRATEGY_ENTERPRISE_SCALE = (
+        "For enterprise deployment: Start with pilot team, measure impact, "
+        "then roll out incrementally with proper change management."
+    )
+    STRATEGY_QUICK_SCALE = (
+        "Quick deployment recommended: Low overhead setup, fast iteration, "
+        "measure ROI early and often."
+    )
+    STRATEGY_SCALE = {
+        'enterprise': STRATEGY_ENTERPRISE_SCALE,
+        'large': STRATEGY_ENTERPRISE_SCALE,
+        'medium': STRATEGY_QUICK_SCALE,
+        'small': STRATEGY_QUICK_SCALE
+    }
+    STRATEGY_SUPPLEMENT_TEMPLATE = "Consider supplementing with {tool_name} for {category} capabilities."
+    NO_TOOLS_STRATEGY = "No suitable tools found for this use case."
+    
+    # Buying guide templates
+    BUYING_TOP_TEMPLATE = "Top recommendation: {product_name} ({category})"
+    BUYING_WHY_TEMPLATE = "This device excels at {use_case} with {strength}"
+    BUYING_LIMITATION_TEMPLATE = "Important to know: {limitation}"
+    BUYING_ALTERNATIVE_TEMPLATE = (
+        "Alternative option: {product_name} offers {category} if you need different trade-offs."
+    )
+    BUYING_ADVICE = {
+        'expert': (
+            "As an expert user, you'll appreciate the technical capabilities "
+            "and be able to leverage advanced features."
+        ),
+        'beginner': (
+            "This recommendation prioritizes ease of use while still providing "
+            "room to grow into advanced features."
+        )
+    }
+    NO_PRODUCTS_GUIDE = "No suitable products found matching your criteria."
+    
+    # Impact estimates by problem domain and automation potential
+    IMPACT_ESTIMATES = {
+        'customer_support': {
+            'high': 'Expected 60-80% reduction in response time, 40-60% reduction in support costs',
+            'moderate': 'Expected 30-50% improvement in response quality, 20-30% efficiency gain',
+            'low': 'Expected 15-25% time savings for support agents'
+        },
+        'content_creation': {
+            'high': 'Expected 70-85% reduction in content creation time, 50-70% increase in output',
+            'moderate': 'Expected 40-60% faster content production, improved consistency',
+            'low': 'Expected 20-30% time savings, better ideation support'
+        },
+        'workflow_automation': {
+            'high': 'Expected 80-95% automation of repetitive tasks, significant error reduction',
+            'moderate': 'Expected 50-70% time savings on automated workflows',
+            'low': 'Expected 25-40% efficiency improvement in selected processes'
+        }
+    }
+    DEFAULT_IMPACT_ESTIMATES = {
+        'high': 'Expected 50-70% efficiency improvement',
+        'moderate': 'Expected 30-50% productivity gain',
+        'low': 'Expected 15-30% time savings'
+    }
+    NO_TOOLS_IMPACT = "Unable to estimate impact without suitable tools."
+    
+    def __init__(self, cache_size: int = 4096):
+        self.cache = FragmentCache(cache_size)
+    
     def generate_deployment_guide(
         self,
         tool: Dict,
@@ -24,35 +188,25 @@ class InstructionGenerator:
         Returns:
             Comprehensive deployment guide
         """
-        tool_name = tool.get('name', 'Unknown Tool')
-        deployment_guide = tool.get('deployment_guide', {})
-        technical_truth = tool.get('technical_truth', {})
-        
-        # Generate reasoning
-        reasoning = self._generate_tool_reasoning(tool, intent_analysis, match_score)
+        problem_domain = intent_analysis.get('problem_domain', 'general')
+        automation_potential = intent_analysis.get('automation_potential', 'moderate')
+        company_size = intent_analysis.get('company_context', {}).get('size', 'unknown')
         
-        # Create custom instruction set
-        custom_instructions = self._create_custom_instructions(
-            tool,
-            intent_analysis
+        # Everything except the score only depends on the tool and these fields
+        body = self._cached(
+            ('tool', tool.get('id'), problem_domain, automation_potential, company_size),
+            tool.get('id'),
+            lambda: self._render_tool_body(tool, problem_domain, automation_potential, company_size)
         )
         
         return {
-            'tool_id': tool.get('id'),
-            'tool_name': tool_name,
-            'category': tool.get('category'),
+            'tool_id': body['tool_id'],
+            'tool_name': body['tool_name'],
+            'category': body['category'],
             'match_score': match_score,
-            'reasoning': reasoning,
-            'deployment_guide': {
-                'setup_steps': deployment_guide.get('setup_steps', []),
-                'best_practices': deployment_guide.get('best_practices', []),
-                'custom_instructions': custom_instructions
-            },
-            'technical_truth': {
-                'strength': technical_truth.get('strength', ''),
-                'limitation': technical_truth.get('limitation', ''),
-                'ideal_for': technical_truth.get('ideal_for', '')
-            }
+            'reasoning': self._confidence(match_score) + body['reasoning'],
+            'deployment_guide': body['deployment_guide'],
+            'technical_truth': body['technical_truth']
         }
     
     def generate_product_recommendation(
@@ -72,24 +226,23 @@ class InstructionGenerator:
         Returns:
             Detailed product recommendation
         """
-        product_name = product.get('name', 'Unknown Product')
-        technical_truth = product.get('technical_truth', {})
+        use_case = intent_analysis.get('use_case', 'general_use')
+        priorities = tuple(intent_analysis.get('priorities', []))
         
-        # Generate reasoning
-        reasoning = self._generate_product_reasoning(product, intent_analysis, match_score)
+        body = self._cached(
+            ('product', product.get('id'), use_case, priorities),
+            product.get('id'),
+            lambda: self._render_product_body(product, use_case, priorities)
+        )
         
         return {
-            'product_id': product.get('id'),
-            'product_name': product_name,
-            'category': product.get('category'),
+            'product_id': body['product_id'],
+            'product_name': body['product_name'],
+            'category': body['category'],
             'match_score': match_score,
-            'reasoning': reasoning,
-            'technical_specs': product.get('technical_specs', {}),
-            'technical_truth': {
-                'strength': technical_truth.get('strength', ''),
-                'limitation': technical_truth.get('limitation', ''),
-                'ideal_for': technical_truth.get('ideal_for', '')
-            }
+            'reasoning': self._confidence(match_score) + body['reasoning'],
+            'technical_specs': body['technical_specs'],
+            'technical_truth': body['technical_truth']
         }
     
     def generate_deployment_strategy(
@@ -108,57 +261,28 @@ class InstructionGenerator:
             Deployment strategy text
         """
         if not recommendations:
-            return "No suitable tools found for this use case."
+            return self.NO_TOOLS_STRATEGY
         
         top_tool = recommendations[0]
+        second_tool = recommendations[1] if len(recommendations) > 1 else None
         problem_domain = intent_analysis.get('problem_domain', 'general')
         automation_potential = intent_analysis.get('automation_potential', 'moderate')
         company_size = intent_analysis.get('company_context', {}).get('size', 'unknown')
         
-        strategy_parts = []
-        
-        # Introduction
-        strategy_parts.append(
-            f"Recommended solution for {problem_domain} optimization using {top_tool['tool_name']}."
-        )
-        
-        # Deployment approach
-        if automation_potential == 'high':
-            strategy_parts.append(
-                "Deploy with full automation pipeline including monitoring, fallback handling, "
-                "and continuous improvement loops."
-            )
-        elif automation_potential == 'moderate':
-            strategy_parts.append(
-                "Deploy in human-in-the-loop mode with AI assistance. "
-                "Gradually increase automation as confidence and metrics improve."
-            )
-        else:
-            strategy_parts.append(
-                "Deploy as an assistant tool with human oversight. "
-                "Focus on augmenting rather than replacing existing processes."
-            )
-        
-        # Scale considerations
-        if company_size in ['enterprise', 'large']:
-            strategy_parts.append(
-                "For enterprise deployment: Start with pilot team, measure impact, "
-                "then roll out incrementally with proper change management."
-            )
-        elif company_size in ['medium', 'small']:
-            strategy_parts.append(
-                "Quick deployment recommended: Low overhead setup, fast iteration, "
-                "measure ROI early and often."
+        return self._cached(
+            (
+                'strategy',
+                top_tool.get('tool_id'),
+                second_tool.get('tool_id') if second_tool else None,
+                problem_domain,
+                automation_potential,
+                company_size
+            ),
+            top_tool.get('tool_id'),
+            lambda: self._render_strategy(
+                top_tool, second_tool, problem_domain, automation_potential, company_size
             )
-        
-        # Integration notes
-        if len(recommendations) > 1:
-            strategy_parts.append(
-                f"Consider supplementing with {recommendations[1]['tool_name']} "
-                f"for {recommendations[1]['category']} capabilities."
-            )
-        
-        return " ".join(strategy_parts)
+        )
     
     def generate_buying_guide(
         self,
@@ -176,53 +300,24 @@ class InstructionGenerator:
             Buying guide text
         """
         if not recommendations:
-            return "No suitable products found matching your criteria."
+            return self.NO_PRODUCTS_GUIDE
         
         top_product = recommendations[0]
+        alt_product = recommendations[1] if len(recommendations) > 1 else None
         use_case = intent_analysis.get('use_case', 'general_use')
         sophistication = intent_analysis.get('sophistication_level', 'intermediate')
         
-        guide_parts = []
-        
-        # Primary recommendation
-        guide_parts.append(
-            f"Top recommendation: {top_product['product_name']} "
-            f"({top_product['category']})"
-        )
-        
-        # Why this product
-        guide_parts.append(
-            f"This device excels at {use_case.replace('_', ' ')} with "
-            f"{top_product['technical_truth']['strength']}"
-        )
-        
-        # Key considerations
-        guide_parts.append(
-            f"Important to know: {top_product['technical_truth']['limitation']}"
+        return self._cached(
+            (
+                'buying',
+                top_product.get('product_id'),
+                alt_product.get('product_id') if alt_product else None,
+                use_case,
+                sophistication
+            ),
+            top_product.get('product_id'),
+            lambda: self._render_buying_guide(top_product, alt_product, use_case, sophistication)
         )
-        
-        # Alternatives
-        if len(recommendations) > 1:
-            alt_product = recommendations[1]
-            guide_parts.append(
-                f"Alternative option: {alt_product['product_name']} offers "
-                f"{alt_product['category']} if you need "
-                f"different trade-offs."
-            )
-        
-        # Final advice
-        if sophistication == 'expert':
-            guide_parts.append(
-                "As an expert user, you'll appreciate the technical capabilities "
-                "and be able to leverage advanced features."
-            )
-        elif sophistication == 'beginner':
-            guide_parts.append(
-                "This recommendation prioritizes ease of use while still providing "
-                "room to grow into advanced features."
-            )
-        
-        return " ".join(guide_parts)
     
     def estimate_impact(
         self,
@@ -240,150 +335,219 @@ class InstructionGenerator:
             Impact estimation text
         """
         if not recommendations:
-            return "Unable to estimate impact without suitable tools."
+            return self.NO_TOOLS_IMPACT
         
         automation_potential = intent_analysis.get('automation_potential', 'moderate')
         problem_domain = intent_analysis.get('problem_domain', 'general')
         
-        impact_estimates = {
-            'customer_support': {
-                'high': 'Expected 60-80% reduction in response time, 40-60% reduction in support costs',
-                'moderate': 'Expected 30-50% improvement in response quality, 20-30% efficiency gain',
-                'low': 'Expected 15-25% time savings for support agents'
-            },
-            'content_creation': {
-                'high': 'Expected 70-85% reduction in content creation time, 50-70% increase in output',
-                'moderate': 'Expected 40-60% faster content production, improved consistency',
-                'low': 'Expected 20-30% time savings, better ideation support'
+        domain_estimates = self.IMPACT_ESTIMATES.get(problem_domain, self.DEFAULT_IMPACT_ESTIMATES)
+        
+        return domain_estimates.get(automation_potential, 'Impact varies by implementation')
+    
+    def _cached(self, key: tuple, item_id: Any, render: Callable[[], Any]) -> Any:
+        """
+        Look up a rendered fragment keyed by item, catalog version and intent
+        
+        Cached fragments are shared between requests and must not be mutated.
+        Items without an id cannot be told apart and are always rendered.
+        """
+        if item_id is None:
+            return render()
+        
+        from app.database import get_data_loader
+        
+        return self.cache.get_or_render(
+            (get_data_loader().catalog_version,) + key,
+            render
+        )
+    
+    def _confidence(self, match_score: float) -> str:
+        """Render the score-dependent reasoning prefix"""
+        return self.CONFIDENCE_TEMPLATE.format(score_pct=int(match_score * 100))
+    
+    def _render_tool_body(
+        self,
+        tool: Dict,
+        problem_domain: str,
+        automation_potential: str,
+        company_size: str
+    ) -> Dict[str, Any]:
+        """Render the score-independent part of a deployment guide"""
+        deployment_guide = tool.get('deployment_guide', {})
+        technical_truth = tool.get('technical_truth', {})
+        
+        return {
+            'tool_id': tool.get('id'),
+            'tool_name': tool.get('name', 'Unknown Tool'),
+            'category': tool.get('category'),
+            'reasoning': self._generate_tool_reasoning(tool, problem_domain, automation_potential),
+            'deployment_guide': {
+                'setup_steps': deployment_guide.get('setup_steps', []),
+                'best_practices': deployment_guide.get('best_practices', []),
+                'custom_instructions': self._create_custom_instructions(problem_domain, company_size)
             },
-            'workflow_automation': {
-                'high': 'Expected 80-95% automation of repetitive tasks, significant error reduction',
-                'moderate': 'Expected 50-70% time savings on automated workflows',
-                'low': 'Expected 25-40% efficiency improvement in selected processes'
+            'technical_truth': {
+                'strength': technical_truth.get('strength', ''),
+                'limitation': technical_truth.get('limitation', ''),
+                'ideal_for': technical_truth.get('ideal_for', '')
             }
         }
+    
+    def _render_product_body(
+        self,
+        product: Dict,
+        use_case: str,
+        priorities: tuple
+    ) -> Dict[str, Any]:
+        """Render the score-independent part of a product recommendation"""
+        technical_truth = product.get('technical_truth', {})
         
-        domain_estimates = impact_estimates.get(
-            problem_domain,
-            {
-                'high': 'Expected 50-70% efficiency improvement',
-                'moderate': 'Expected 30-50% productivity gain',
-                'low': 'Expected 15-30% time savings'
+        return {
+            'product_id': product.get('id'),
+            'product_name': product.get('name', 'Unknown Product'),
+            'category': product.get('category'),
+            'reasoning': self._generate_product_reasoning(product, use_case, priorities),
+            'technical_specs': product.get('technical_specs', {}),
+            'technical_truth': {
+                'strength': technical_truth.get('strength', ''),
+                'limitation': technical_truth.get('limitation', ''),
+                'ideal_for': technical_truth.get('ideal_for', '')
             }
-        )
+        }
+    
+    def _render_strategy(
+        self,
+        top_tool: Dict,
+        second_tool: Dict,
+        problem_domain: str,
+        automation_potential: str,
+        company_size: str
+    ) -> str:
+        """Render deployment strategy text"""
+        strategy_parts = [
+            self.STRATEGY_INTRO_TEMPLATE.format(
+                problem_domain=problem_domain,
+                tool_name=top_tool['tool_name']
+            ),
+            self.STRATEGY_APPROACH.get(automation_potential, self.STRATEGY_APPROACH_DEFAULT)
+        ]
+        
+        if company_size in self.STRATEGY_SCALE:
+            strategy_parts.append(self.STRATEGY_SCALE[company_size])
+        
+        if second_tool:
+            strategy_parts.append(
+                self.STRATEGY_SUPPLEMENT_TEMPLATE.format(
+                    tool_name=second_tool['tool_name'],
+                    category=second_tool['category']
+                )
+            )
         
-        return domain_estimates.get(automation_potential, 'Impact varies by implementation')
+        return " ".join(strategy_parts)
     
-    def _generate_tool_reasoning(
+    def _render_buying_guide(
         self,
-        tool: Dict,
-        intent_analysis: Dict[str, Any],
-        match_score: float
+        top_product: Dict,
+        alt_product: Dict,
+        use_case: str,
+        sophistication: str
     ) -> str:
-        """Generate reasoning for tool selection"""
-        reasons = []
+        """Render buying guide text"""
+        guide_parts = [
+            self.BUYING_TOP_TEMPLATE.format(
+                product_name=top_product['product_name'],
+                category=top_product['category']
+            ),
+            self.BUYING_WHY_TEMPLATE.format(
+                use_case=use_case.replace('_', ' '),
+                strength=top_product['technical_truth']['strength']
+            ),
+            self.BUYING_LIMITATION_TEMPLATE.format(
+                limitation=top_product['technical_truth']['limitation']
+            )
+        ]
         
-        # Score explanation
-        score_pct = int(match_score * 100)
-        reasons.append(f"Match confidence: {score_pct}%")
+        if alt_product:
+            guide_parts.append(
+                self.BUYING_ALTERNATIVE_TEMPLATE.format(
+                    product_name=alt_product['product_name'],
+                    category=alt_product['category']
+                )
+            )
         
-        # Domain alignment
-        problem_domain = intent_analysis.get('problem_domain', 'general')
-        reasons.append(
-            f"Specialized for {problem_domain} with {tool.get('category')} capabilities"
-        )
+        if sophistication in self.BUYING_ADVICE:
+            guide_parts.append(self.BUYING_ADVICE[sophistication])
+        
+        return " ".join(guide_parts)
+    
+    def _generate_tool_reasoning(
+        self,
+        tool: Dict,
+        problem_domain: str,
+        automation_potential: str
+    ) -> str:
+        """Generate reasoning for tool selection (without the score prefix)"""
+        reasons = [
+            self.TOOL_DOMAIN_TEMPLATE.format(
+                problem_domain=problem_domain,
+                category=tool.get('category')
+            )
+        ]
         
         # Key strength
         strength = tool.get('technical_truth', {}).get('strength', '')
         if strength:
-            reasons.append(f"Key advantage: {strength}")
+            reasons.append(self.TOOL_STRENGTH_TEMPLATE.format(strength=strength))
         
         # Automation fit
-        automation_potential = intent_analysis.get('automation_potential', 'moderate')
         tool_automation = tool.get('matching_criteria', {}).get('automation_potential', 'moderate')
         if tool_automation in ['excellent', 'high']:
-            reasons.append(f"Strong automation capabilities matching {automation_potential} needs")
+            reasons.append(
+                self.TOOL_AUTOMATION_TEMPLATE.format(automation_potential=automation_potential)
+            )
         
         return ". ".join(reasons) + "."
     
     def _generate_product_reasoning(
         self,
         product: Dict,
-        intent_analysis: Dict[str, Any],
-        match_score: float
+        use_case: str,
+        priorities: tuple
     ) -> str:
-        """Generate reasoning for product selection"""
-        reasons = []
-        
-        # Score explanation
-        score_pct = int(match_score * 100)
-        reasons.append(f"Match confidence: {score_pct}%")
-        
-        # Use case alignment
-        use_case = intent_analysis.get('use_case', 'general_use')
-        reasons.append(
-            f"Optimized for {use_case.replace('_', ' ')} in {product.get('category')} category"
-        )
+        """Generate reasoning for product selection (without the score prefix)"""
+        reasons = [
+            self.PRODUCT_USE_CASE_TEMPLATE.format(
+                use_case=use_case.replace('_', ' '),
+                category=product.get('category')
+            )
+        ]
         
         # Key strength
         strength = product.get('technical_truth', {}).get('strength', '')
         if strength:
-            reasons.append(f"Technical advantage: {strength}")
+            reasons.append(self.PRODUCT_STRENGTH_TEMPLATE.format(strength=strength))
         
         # Priority match
-        priorities = intent_analysis.get('priorities', [])
         criteria = product.get('matching_criteria', {})
         
         if 'performance' in priorities and criteria.get('performance_tier') in ['extreme', 'high']:
-            reasons.append("Delivers extreme performance as prioritized")
+            reasons.append(self.PRODUCT_PERFORMANCE_REASON)
         elif 'portability' in priorities and criteria.get('portability') in ['excellent', 'good']:
-            reasons.append("Offers excellent portability as needed")
+            reasons.append(self.PRODUCT_PORTABILITY_REASON)
         
         return ". ".join(reasons) + "."
     
     def _create_custom_instructions(
         self,
-        tool: Dict,
-        intent_analysis: Dict[str, Any]
+        problem_domain: str,
+        company_size: str
     ) -> List[str]:
         """Create custom deployment instructions based on specific use case"""
-        base_steps = tool.get('deployment_guide', {}).get('setup_steps', [])
-        custom_steps = []
-        
-        problem_domain = intent_analysis.get('problem_domain', 'general')
-        
-        # Add domain-specific instructions
-        if problem_domain == 'customer_support':
-            custom_steps.append(
-                "Configure response templates aligned with your brand voice"
-            )
-            custom_steps.append(
-                "Set up escalation paths for complex queries the AI cannot handle"
-            )
-        elif problem_domain == 'content_creation':
-            custom_steps.append(
-                "Create style guide prompts for consistent content output"
-            )
-            custom_steps.append(
-                "Implement review workflow for AI-generated content"
-            )
-        elif problem_domain == 'workflow_automation':
-            custom_steps.append(
-                "Map existing workflow steps and identify automation points"
-            )
-            custom_steps.append(
-                "Set up monitoring for automated task success rates"
-            )
+        custom_steps = list(self.DOMAIN_INSTRUCTIONS.get(problem_domain, ()))
         
         # Add company size considerations
-        company_size = intent_analysis.get('company_context', {}).get('size', 'unknown')
         if company_size == 'enterprise':
-            custom_steps.append(
-                "Coordinate with IT security for enterprise policy compliance"
-            )
-            custom_steps.append(
-                "Plan phased rollout with pilot groups before full deployment"
-            )
+            custom_steps.extend(self.ENTERPRISE_INSTRUCTIONS)
         
         return custom_steps
 
@@ -396,5 +560,7 @@ def get_instruction_generator() -> InstructionGenerator:
     """Get singleton instruction generator instance"""
     global _instruction_generator
     if _instruction_generator is None:
-        _instruction_generator = InstructionGenerator()
+        _instruction_generator = InstructionGenerator(
+            cache_size=get_settings().instruction_cache_size
+        )
     return _instruction_generator
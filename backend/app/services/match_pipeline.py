@@ -0,0 +1,433 @@
+"""
+MatchPipeline Service - Run the analyze / cross-reference / instruct workflow
+Builds responses as plain dicts shaped like the response models
+"""
+from typing import Dict, List, Any, Iterator, Optional, Tuple, FrozenSet
+from contextlib import contextmanager
+import time
+
+from app.models import CompanyMatchRequest, IndividualMatchRequest
+from app.services.analyze_intent import get_intent_analyzer
+from app.services.cross_reference import get_cross_reference_engine
+from app.services.generate_instructions import get_instruction_generator
+from app.services.metrics import MATCH_STAGE_SECONDS
+from app.services.text_similarity import get_text_similarity
+from app.services.tracing import get_tracer
+from app.database import get_data_loader
+
+
+# Sections that need the instruction generator per recommendation
+COMPANY_GENERATED_SECTIONS = frozenset(
+    {'reasoning', 'deployment_guide', 'technical_truth', 'deployment_strategy'}
+)
+INDIVIDUAL_GENERATED_SECTIONS = frozenset(
+    {'reasoning', 'technical_specs', 'technical_truth', 'buying_guide'}
+)
+
+
+@contextmanager
+def stage(track: str, name: str, **attributes) -> Iterator[Any]:
+    """Time a pipeline stage in the stage histogram and as a trace span"""
+    with MATCH_STAGE_SECONDS.time(track, name), \
+            get_tracer().span(f'match.{name}', track=track, **attributes) as span:
+        yield span
+
+
+def analyze_company(request: CompanyMatchRequest) -> Dict[str, Any]:
+    """Step 1 of the company workflow"""
+    with stage('company', 'intent', text_length=len(request.friction_point)) as span:
+        intent_analysis = get_intent_analyzer().analyze_company_intent(
+            request.friction_point,
+            company_size=request.company_size,
+            industry=request.industry,
+            technical_constraints=request.technical_constraints
+        )
+        span.set_attribute('intent.problem_domain', intent_analysis.get('problem_domain'))
+        span.set_attribute('intent.automation_potential', intent_analysis.get('automation_potential'))
+        return intent_analysis
+
+
+def analyze_individual(request: IndividualMatchRequest) -> Dict[str, Any]:
+    """Step 1 of the individual workflow"""
+    with stage('individual', 'intent', text_length=len(request.need)) as span:
+        intent_analysis = get_intent_analyzer().analyze_individual_intent(
+            request.need,
+            budget_range=request.budget_range,
+            ecosystem_preference=request.ecosystem_preference,
+            primary_use_cases=request.primary_use_cases
+        )
+        span.set_attribute('intent.use_case', intent_analysis.get('use_case'))
+        return intent_analysis
+
+
+def text_similarities(
+    kind: str,
+    text: Optional[str],
+    items: Optional[List[Dict]] = None,
+    deadline: Optional[float] = None
+) -> Optional[List[float]]:
+    """
+    TF-IDF similarity of ``text`` to ``items`` (default: the whole ``kind`` catalog)
+    
+    None when text similarity is disabled, there is no text to compare, or
+    the deadline leaves no time for it.
+    """
+    if not text or get_cross_reference_engine().text_similarity_weight <= 0:
+        return None
+    data_loader = get_data_loader()
+    catalog = data_loader.load_product_catalog() if kind == 'products' else data_loader.load_ai_tools_catalog()
+    return get_text_similarity().similarities(kind, catalog, data_loader.catalog_version, text, items, deadline)
+
+
+def _similarity_skipped(text: Optional[str], similarities: Optional[List[float]], deadline: Optional[float]) -> bool:
+    """True when a deadline made the ranking leave out text similarity it would otherwise blend in"""
+    return (
+        deadline is not None and similarities is None and bool(text and text.strip())
+        and get_cross_reference_engine().text_similarity_weight > 0
+    )
+
+
+def rank_ai_tools(
+    intent_analysis: Dict[str, Any],
+    top_k: Optional[int] = None,
+    deadline: Optional[float] = None,
+    text: Optional[str] = None,
+    track: str = 'company'
+) -> Tuple[List[Tuple[Dict, float]], bool]:
+    """
+    Step 2 of the company workflow
+    
+    ``text`` (the friction point) is blended in by TF-IDF similarity.
+    ``track`` labels the stage metrics and spans.
+    
+    Returns:
+        (best matches, whether the deadline left part of the catalog unscored)
+    """
+    engine = get_cross_reference_engine()
+    ai_tools = get_data_loader().load_ai_tools_catalog()
+    
+    with stage(track, 'scoring', catalog_size=len(ai_tools)) as span:
+        similarities = text_similarities('ai_tools', text, ai_tools, deadline)
+        matches = engine.score_ai_tools(intent_analysis, ai_tools, deadline, similarities)
+        partial = len(matches) < len(ai_tools) or _similarity_skipped(text, similarities, deadline)
+        span.set_attribute('partial', partial)
+    with stage(track, 'topk', candidates=len(matches), top_k=top_k or len(matches)):
+        return engine.top_matches(matches, top_k), partial
+
+
+def rank_products(
+    intent_analysis: Dict[str, Any],
+    top_k: Optional[int] = None,
+    deadline: Optional[float] = None,
+    text: Optional[str] = None,
+    track: str = 'individual'
+) -> Tuple[List[Tuple[Dict, float]], bool]:
+    """
+    Step 2 of the individual workflow
+    
+    ``text`` (the need) is blended in by TF-IDF similarity.
+    ``track`` labels the stage metrics and spans.
+    
+    Returns:
+        (best matches, whether the deadline left part of the catalog unscored)
+    """
+    engine = get_cross_reference_engine()
+    products = get_data_loader().load_product_catalog()
+    
+    with stage(track, 'scoring', catalog_size=len(products)) as span:
+        similarities = text_similarities('products', text, products, deadline)
+        matches = engine.score_products(intent_analysis, products, deadline, similarities)
+        partial = len(matches) < len(products) or _similarity_skipped(text, similarities, deadline)
+        span.set_attribute('partial', partial)
+    with stage(track, 'topk', candidates=len(matches), top_k=top_k or len(matches)):
+        return engine.top_matches(matches, top_k), partial
+
+
+def tool_recommendation(
+    tool: Dict,
+    score: float,
+    intent_analysis: Dict[str, Any],
+    sections: FrozenSet[str]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Build one AI tool recommendation
+    
+    Returns:
+        (recommendation restricted to ``sections``, full generator output or
+        the bare identity fields when nothing needed generating)
+    """
+    if sections & COMPANY_GENERATED_SECTIONS:
+        with get_tracer().span('instructions.deployment_guide', tool_id=tool.get('id'), match_score=score):
+            info = get_instruction_generator().generate_deployment_guide(tool, intent_analysis, score)
+    else:
+        info = {
+            'tool_id': tool.get('id'),
+            'tool_name': tool.get('name', 'Unknown Tool'),
+            'category': tool.get('category'),
+            'match_score': score
+        }
+    
+    recommendation = {
+        'tool_id': info['tool_id'],
+        'tool_name': info['tool_name'],
+        'category': info['category'],
+        'match_score': info['match_score']
+    }
+    for section in ('reasoning', 'deployment_guide', 'technical_truth'):
+        if section in sections:
+            recommendation[section] = info[section]
+    
+    return recommendation, info
+
+
+def product_recommendation(
+    product: Dict,
+    score: float,
+    intent_analysis: Dict[str, Any],
+    sections: FrozenSet[str]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Build one product recommendation (see ``tool_recommendation``)"""
+    if sections & INDIVIDUAL_GENERATED_SECTIONS:
+        with get_tracer().span('instructions.product_recommendation', product_id=product.get('id'), match_score=score):
+            info = get_instruction_generator().generate_product_recommendation(
+                product, intent_analysis, score
+            )
+    else:
+        info = {
+            'product_id': product.get('id'),
+            'product_name': product.get('name', 'Unknown Product'),
+            'category': product.get('category'),
+            'match_score': score
+        }
+    
+    recommendation = {
+        'product_id': info['product_id'],
+        'product_name': info['product_name'],
+        'category': info['category'],
+        'match_score': info['match_score']
+    }
+    for section in ('reasoning', 'technical_specs', 'technical_truth'):
+        if section in sections:
+            recommendation[section] = info[section]
+    
+    return recommendation, info
+
+
+def company_summary(
+    infos: List[Dict[str, Any]],
+    intent_analysis: Dict[str, Any],
+    sections: FrozenSet[str]
+) -> Dict[str, Any]:
+    """Aggregate company sections built from the top recommendations"""
+    instruction_generator = get_instruction_generator()
+    summary = {}
+    
+    # Generate overall strategy
+    if 'deployment_strategy' in sections:
+        summary['deployment_strategy'] = instruction_generator.generate_deployment_strategy(
+            infos, intent_analysis
+        )
+    
+    # Estimate impact
+    if 'estimated_impact' in sections:
+        summary['estimated_impact'] = instruction_generator.estimate_impact(
+            intent_analysis, infos
+        )
+    
+    return summary
+
+
+def individual_summary(
+    infos: List[Dict[str, Any]],
+    intent_analysis: Dict[str, Any],
+    sections: FrozenSet[str]
+) -> Dict[str, Any]:
+    """Aggregate individual sections built from the top recommendations"""
+    summary = {}
+    
+    # Create comparison matrix if multiple recommendations
+    if 'comparison_matrix' in sections:
+        comparison_matrix = None
+        if len(infos) > 1:
+            comparison_matrix = {
+                'products': [info['product_name'] for info in infos],
+                'categories': [info['category'] for info in infos],
+                'match_scores': [info['match_score'] for info in infos]
+            }
+        summary['comparison_matrix'] = comparison_matrix
+    
+    # Generate buying guide
+    if 'buying_guide' in sections:
+        summary['buying_guide'] = get_instruction_generator().generate_buying_guide(
+            infos, intent_analysis
+        )
+    
+    return summary
+
+
+def run_company_match(
+    request: CompanyMatchRequest,
+    sections: FrozenSet[str],
+    top_k: int = 3,
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Run the full company workflow and return a CompanyMatchResponse-shaped dict
+    
+    With a ``deadline`` (a ``time.perf_counter()`` value) scoring stops at
+    the deadline, generated sections are skipped once it has passed, and
+    the payload's ``partial`` flag says whether either happened.
+    """
+    intent_analysis = analyze_company(request)
+    matches, partial = rank_ai_tools(intent_analysis, top_k, deadline, request.friction_point)
+    
+    if deadline is not None and time.perf_counter() >= deadline:
+        # Budget spent: ids and scores only
+        sections = frozenset()
+        partial = True
+    
+    with stage('company', 'generation', recommendations=len(matches), sections=sorted(sections)):
+        recommendations = []
+        infos = []
+        for tool, score in matches:
+            recommendation, info = tool_recommendation(tool, score, intent_analysis, sections)
+            recommendations.append(recommendation)
+            infos.append(info)
+        summary = company_summary(infos, intent_analysis, sections)
+    
+    if deadline is not None:
+        summary['partial'] = partial
+    
+    return {
+        'intent_analysis': intent_analysis,
+        'recommendations': recommendations,
+        **summary
+    }
+
+
+def run_individual_match(
+    request: IndividualMatchRequest,
+    sections: FrozenSet[str],
+    top_k: int = 3,
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Run the full individual workflow and return an IndividualMatchResponse-shaped dict
+    
+    ``deadline`` works as in ``run_company_match``.
+    """
+    intent_analysis = analyze_individual(request)
+    matches, partial = rank_products(intent_analysis, top_k, deadline, request.need)
+    
+    if deadline is not None and time.perf_counter() >= deadline:
+        # Budget spent: ids and scores only
+        sections = frozenset()
+        partial = True
+    
+    with stage('individual', 'generation', recommendations=len(matches), sections=sorted(sections)):
+        recommendations = []
+        infos = []
+        for product, score in matches:
+            recommendation, info = product_recommendation(product, score, intent_analysis, sections)
+            recommendations.append(recommendation)
+            infos.append(info)
+        summary = individual_summary(infos, intent_analysis, sections)
+    
+    if deadline is not None:
+        summary['partial'] = partial
+    
+    return {
+        'intent_analysis': intent_analysis,
+        'recommendations': recommendations,
+        **summary
+    }
+
+
+# Summaries read full details of the first two recommendations only
+SUMMARY_DETAIL_COUNT = 2
+
+TOOL_IDENTITY_FIELDS = ('tool_id', 'tool_name', 'category', 'match_score')
+PRODUCT_IDENTITY_FIELDS = ('product_id', 'product_name', 'category', 'match_score')
+
+
+def stream_company_match(
+    request: CompanyMatchRequest,
+    sections: FrozenSet[str],
+    top_k: int = 3
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Run the company workflow, yielding each part as soon as it is ready
+    
+    Yields ``('intent', ...)``, then one ``('recommendation', ...)`` per
+    match in rank order, then ``('summary', ...)`` with the aggregate
+    sections. Only the details the summary needs are kept between steps,
+    so large ``top_k`` values stream in constant memory per recommendation.
+    """
+    intent_analysis = analyze_company(request)
+    yield 'intent', {'intent_analysis': intent_analysis}
+    
+    matches, _ = rank_ai_tools(intent_analysis, top_k, text=request.friction_point)
+    
+    infos = []
+    for rank, (tool, score) in enumerate(matches, 1):
+        with stage('company', 'generation', recommendations=1):
+            recommendation, info = tool_recommendation(tool, score, intent_analysis, sections)
+        if rank > SUMMARY_DETAIL_COUNT:
+            info = {field: info[field] for field in TOOL_IDENTITY_FIELDS}
+        infos.append(info)
+        yield 'recommendation', {'rank': rank, **recommendation}
+    
+    with stage('company', 'generation', recommendations=0):
+        summary = company_summary(infos, intent_analysis, sections)
+    yield 'summary', summary
+
+
+def stream_individual_match(
+    request: IndividualMatchRequest,
+    sections: FrozenSet[str],
+    top_k: int = 3
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Run the individual workflow step by step (see ``stream_company_match``)"""
+    intent_analysis = analyze_individual(request)
+    yield 'intent', {'intent_analysis': intent_analysis}
+    
+    matches, _ = rank_products(intent_analysis, top_k, text=request.need)
+    
+    infos = []
+    for rank, (product, score) in enumerate(matches, 1):
+        with stage('individual', 'generation', recommendations=1):
+            recommendation, info = product_recommendation(product, score, intent_analysis, sections)
+        if rank > SUMMARY_DETAIL_COUNT:
+            info = {field: info[field] for field in PRODUCT_IDENTITY_FIELDS}
+        infos.append(info)
+        yield 'recommendation', {'rank': rank, **recommendation}
+    
+    with stage('individual', 'generation', recommendations=0):
+        summary = individual_summary(infos, intent_analysis, sections)
+    yield 'summary', summary
+
+
+def preview_candidates(
+    track: str,
+    intent_analysis: Dict[str, Any],
+    top_k: int = 3,
+    text: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Score the catalog for an as-you-type preview and return the top candidates
+    
+    Scores are computed exactly as for a match request on ``text`` (the
+    text typed so far), so the preview ranks like the final match. Stage
+    metrics are recorded under ``<track>_preview``.
+    """
+    rank = rank_ai_tools if track == 'company' else rank_products
+    
+    return [
+        {
+            'id': item.get('id'),
+            'name': item.get('name'),
+            'category': item.get('category'),
+            'match_score': score
+        }
+        for item, score in rank(intent_analysis, top_k, text=text, track=f'{track}_preview')[0]
+    ]
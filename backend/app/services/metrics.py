@@ -0,0 +1,315 @@
+"""
+Metrics Service - Low-overhead counters and histograms in Prometheus text format
+"""
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from bisect import bisect_left
+from contextlib import contextmanager
+import os
+import threading
+import time
+
+
+# Latency buckets in seconds, from 50 µs to 10 s
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# LLM round-trips, from 50 ms to 60 s
+LLM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _ThreadSharded:
+    """
+    Per-thread storage for metric updates
+    
+    Each thread writes only to its own dict, so recording needs no lock;
+    the shards are summed when the metrics are scraped.
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Dict] = []
+        self._lock = threading.Lock()
+    
+    def _shard(self) -> Dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+    
+    def _snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [dict(shard) for shard in self._shards]
+
+
+class Counter(_ThreadSharded):
+    """Monotonic counter with optional labels"""
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__()
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+    
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        shard = self._shard()
+        shard[labelvalues] = shard.get(labelvalues, 0.0) + amount
+    
+    def collect(self) -> Iterator[str]:
+        totals: Dict[Tuple[str, ...], float] = {}
+        for shard in self._snapshot():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0.0) + value
+        for labels, value in sorted(totals.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+
+class Histogram(_ThreadSharded):
+    """Cumulative-bucket histogram with optional labels"""
+    
+    kind = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__()
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+    
+    def observe(self, value: float, *labelvalues: str) -> None:
+        shard = self._shard()
+        series = shard.get(labelvalues)
+        if series is None:
+            # Bucket counts, then +Inf, then sum
+            series = shard[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+    
+    @contextmanager
+    def time(self, *labelvalues: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the enclosed block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labelvalues)
+    
+    def collect(self) -> Iterator[str]:
+        totals: Dict[Tuple[str, ...], List[float]] = {}
+        for shard in self._snapshot():
+            for labels, series in shard.items():
+                total = totals.setdefault(labels, [0] * len(series))
+                for i, value in enumerate(series):
+                    total[i] += value
+        
+        for labels, series in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _format_labels(self.labelnames, labels, 'le="%s"' % le)
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {series[-1]}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Gauge:
+    """Value read from a callback at scrape time"""
+    
+    kind = "gauge"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[Tuple[str, ...], float]],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge"
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelnames = tuple(labelnames)
+        self.kind = kind
+    
+    def collect(self) -> Iterator[str]:
+        for labels, value in sorted(self.callback().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+
+class MetricsRegistry:
+    """Set of metrics rendered together"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+    
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets or DEFAULT_BUCKETS))
+    
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[Tuple[str, ...], float]],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge"
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, callback, labelnames, kind))
+    
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            try:
+                lines.extend(metric.collect())
+            except Exception:
+                # A failing callback must not break the whole scrape
+                continue
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# Match pipeline
+MATCH_STAGE_SECONDS = registry.histogram(
+    "zd3_match_stage_seconds",
+    "Time spent in each match pipeline stage",
+    ("track", "stage")
+)
+MATCH_REQUEST_SECONDS = registry.histogram(
+    "zd3_match_request_seconds",
+    "End-to-end match request handling time",
+    ("track",)
+)
+MATCH_REQUESTS = registry.counter(
+    "zd3_match_requests_total",
+    "Match requests by outcome",
+    ("track", "outcome")
+)
+
+# Catalogs
+CATALOG_LOAD_SECONDS = registry.histogram(
+    "zd3_catalog_load_seconds",
+    "Time to read and parse a catalog file",
+    ("catalog",)
+)
+CATALOG_RELOAD_SECONDS = registry.histogram(
+    "zd3_catalog_reload_seconds",
+    "Time to reload both catalogs after a published version change"
+)
+
+# Admin LLM calls, kept apart from match latency
+LLM_REQUEST_SECONDS = registry.histogram(
+    "zd3_llm_request_seconds",
+    "Time waiting for an LLM response, including queueing for a call slot",
+    ("model", "outcome"),
+    buckets=LLM_BUCKETS
+)
+
+
+def _instruction_cache_stats() -> Dict[str, float]:
+    from app.services.generate_instructions import get_instruction_generator
+    return get_instruction_generator().cache.stats()
+
+
+def _executor_stats() -> Dict[str, float]:
+    from app.services.executor import get_match_executor
+    return get_match_executor().stats()
+
+
+def _single_flight_stats() -> Dict[str, float]:
+    from app.services.single_flight import get_single_flight
+    return get_single_flight().stats()
+
+
+def _worker_info() -> Dict[Tuple[str, ...], float]:
+    from app.startup import worker_index
+    return {(str(worker_index()), str(os.getpid())): 1}
+
+
+def _catalog_version() -> int:
+    from app.database import get_data_loader
+    return get_data_loader().catalog_version
+
+
+registry.gauge(
+    "zd3_worker_info",
+    "Worker process that served this scrape",
+    _worker_info,
+    ("worker", "pid")
+)
+registry.gauge(
+    "zd3_instruction_cache_lookups_total",
+    "Instruction fragment cache lookups by result",
+    lambda: {
+        ("hit",): _instruction_cache_stats()["hits"],
+        ("miss",): _instruction_cache_stats()["misses"]
+    },
+    ("result",),
+    kind="counter"
+)
+registry.gauge(
+    "zd3_instruction_cache_entries",
+    "Rendered fragments held in the instruction cache",
+    lambda: {(): _instruction_cache_stats()["size"]}
+)
+registry.gauge(
+    "zd3_match_executor_queue_depth",
+    "Match jobs waiting for an executor thread",
+    lambda: {(): _executor_stats()["queue_depth"]}
+)
+registry.gauge(
+    "zd3_match_executor_running",
+    "Match jobs currently running on executor threads",
+    lambda: {(): _executor_stats()["running"]}
+)
+registry.gauge(
+    "zd3_match_coalesced_total",
+    "Match calls served by another request's in-flight computation",
+    lambda: {(): _single_flight_stats()["coalesced"]},
+    kind="counter"
+)
+registry.gauge(
+    "zd3_match_calls_total",
+    "Match calls seen by the request coalescer",
+    lambda: {(): _single_flight_stats()["calls"]},
+    kind="counter"
+)
+registry.gauge(
+    "zd3_catalog_version",
+    "Catalog version served by this worker",
+    lambda: {(): _catalog_version()}
+)
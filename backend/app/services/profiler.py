@@ -0,0 +1,148 @@
+"""
+RequestProfiler Service - Profile single requests on demand and keep the reports
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pathlib import Path
+import cProfile
+import pstats
+import re
+import threading
+import time
+import uuid
+
+from config import get_settings
+
+_REPORT_ID = re.compile(r'^[0-9]{8}T[0-9]{12}-[0-9a-f]{8}$')
+
+# Functions from these packages are reported by default
+APP_PACKAGES = ('app/services/', 'app/routers/', 'app/database/')
+
+
+class RequestProfiler:
+    """
+    Run one call under cProfile and store the stats as a .prof file
+    
+    Reports are named by a sortable id and the directory keeps only the
+    newest ``keep`` files. Profiling is serialized: the interpreter allows
+    one active profiler at a time, and a profiled request is rare.
+    """
+    
+    def __init__(self, profile_dir: str, keep: int = 50):
+        self.profile_dir = Path(profile_dir)
+        self.keep = max(keep, 1)  # The report just written is always kept
+        self._lock = threading.Lock()
+    
+    def run(self, func: Callable, *args, **kwargs) -> Tuple[Any, str]:
+        """
+        Call ``func`` under the profiler
+        
+        Returns:
+            (func's result, report id)
+        """
+        now = time.time()
+        report_id = (
+            f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(now))}"
+            f"{int(now % 1 * 1e6):06d}-{uuid.uuid4().hex[:8]}"
+        )
+        profile = cProfile.Profile()
+        
+        with self._lock:
+            profile.enable()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                profile.disable()
+                self._save(profile, report_id)
+        
+        return result, report_id
+    
+    def list_reports(self) -> List[Dict[str, Any]]:
+        """Stored reports, newest first"""
+        return [
+            {
+                'id': path.stem,
+                'size_bytes': path.stat().st_size,
+                'created': path.stat().st_mtime
+            }
+            for path in reversed(self._report_paths())
+        ]
+    
+    def report(
+        self,
+        report_id: str,
+        limit: int = 25,
+        sort: str = 'tottime',
+        app_only: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Summarize a stored profile
+        
+        Args:
+            report_id: Id returned by ``run``
+            limit: Number of functions to return
+            sort: 'tottime' (own time) or 'cumtime' (including callees)
+            app_only: Only report functions from the app's services, routers and database
+        
+        Returns:
+            Report with the hottest functions, or None if the id is unknown
+        """
+        path = self._path(report_id)
+        if path is None or not path.exists():
+            return None
+        
+        stats = pstats.Stats(str(path))
+        functions = []
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            if app_only and not any(package in filename.replace('\\', '/') for package in APP_PACKAGES):
+                continue
+            functions.append({
+                'function': name,
+                'file': filename,
+                'line': line,
+                'calls': calls,
+                'tottime_ms': round(tottime * 1000, 3),
+                'cumtime_ms': round(cumtime * 1000, 3)
+            })
+        
+        key = 'cumtime_ms' if sort == 'cumtime' else 'tottime_ms'
+        functions.sort(key=lambda f: f[key], reverse=True)
+        
+        return {
+            'id': report_id,
+            'total_ms': round(stats.total_tt * 1000, 3),
+            'total_calls': stats.total_calls,
+            'sort': key,
+            'functions': functions[:limit]
+        }
+    
+    def _path(self, report_id: str) -> Optional[Path]:
+        if not _REPORT_ID.match(report_id):
+            return None
+        return self.profile_dir / f"{report_id}.prof"
+    
+    def _report_paths(self) -> List[Path]:
+        if not self.profile_dir.exists():
+            return []
+        return sorted(self.profile_dir.glob('*.prof'))
+    
+    def _save(self, profile: cProfile.Profile, report_id: str) -> None:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(str(self.profile_dir / f"{report_id}.prof"))
+        
+        # Rotate: ids sort by creation time
+        paths = self._report_paths()
+        for old in paths[:max(len(paths) - self.keep, 0)]:
+            old.unlink(missing_ok=True)
+
+
+# Singleton instance
+_request_profiler = None
+
+
+def get_request_profiler() -> RequestProfiler:
+    """Get singleton request profiler instance"""
+    global _request_profiler
+    if _request_profiler is None:
+        settings = get_settings()
+        _request_profiler = RequestProfiler(settings.profile_dir, settings.profile_keep)
+    return _request_profiler
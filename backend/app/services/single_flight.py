@@ -0,0 +1,69 @@
+"""
+SingleFlight Service - Coalesce concurrent identical computations
+"""
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+
+
+class SingleFlight:
+    """
+    Share one in-flight computation between concurrent callers
+    
+    The first caller for a key starts the computation as its own task;
+    callers arriving while it runs await the same task. A caller that goes
+    away (client disconnect) does not cancel the work for the others.
+    """
+    
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+    
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of ``func()``, shared with concurrent callers of ``key``"""
+        self.calls += 1
+        
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        
+        return await asyncio.shield(task)
+    
+    def is_in_flight(self, key: Hashable) -> bool:
+        """Whether a computation for ``key`` is running right now"""
+        return key in self._in_flight
+    
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        # Mark a failure as retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
+    
+    @property
+    def coalesced(self) -> int:
+        """Calls that were served by another caller's computation"""
+        return self.calls - self.executions
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalescing_ratio": self.coalesced / self.calls if self.calls else 0.0,
+            "in_flight": len(self._in_flight)
+        }
+
+
+# Singleton instance
+_single_flight = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Get singleton single-flight instance for the match pipeline"""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
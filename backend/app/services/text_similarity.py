@@ -0,0 +1,196 @@
+"""
+TextSimilarity Service - TF-IDF similarity between a request's free text and catalog items
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import threading
+import time
+
+from app.services.tracing import get_tracer
+
+# Catalog -> paths of the free-text fields describing an item
+TEXT_FIELDS: Dict[str, Tuple[Tuple[str, ...], ...]] = {
+    'products': (
+        ('use_case',),
+        ('technical_truth', 'strength'),
+        ('technical_truth', 'ideal_for')
+    ),
+    'ai_tools': (
+        ('use_cases',),
+        ('technical_truth', 'strength'),
+        ('technical_truth', 'ideal_for')
+    )
+}
+
+
+def item_text(item: Dict, paths: Sequence[Tuple[str, ...]]) -> str:
+    """Free text of an item: the fields at ``paths`` joined, lists flattened"""
+    parts = []
+    for path in paths:
+        value: Any = item
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if isinstance(value, str):
+            parts.append(value)
+        elif isinstance(value, list):
+            parts.extend(part for part in value if isinstance(part, str))
+    return ' '.join(parts)
+
+
+class _Model:
+    """Vectorizer and L2-normalized TF-IDF rows fitted on one catalog list"""
+    
+    def __init__(self, items: List[Dict], version: int, vectorizer, matrix):
+        self.items = items
+        self.version = version
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        self.rows: Dict[str, int] = {}
+        for row, item in enumerate(items):
+            # First occurrence wins, as in the catalog index
+            self.rows.setdefault(item.get('id'), row)
+
+
+class TextSimilarity:
+    """
+    Cosine similarity of request text to every item of a catalog
+    
+    A TF-IDF model is fitted per catalog and catalog version, on first use,
+    and kept until the catalog changes. Scoring a request transforms its
+    text once and compares it to the whole sparse matrix in one call.
+    scikit-learn is imported on the first fit. A request with a deadline
+    never waits for a fit: the model is fitted in the background and the
+    request is answered without text similarity.
+    """
+    
+    def __init__(self):
+        self._models: Dict[str, _Model] = {}
+        self._lock = threading.Lock()
+        self._background_fits: set = set()
+        self.fits = 0
+        self.skipped = 0
+    
+    def similarities(
+        self,
+        kind: str,
+        catalog: List[Dict],
+        version: int,
+        text: str,
+        items: Optional[List[Dict]] = None,
+        deadline: Optional[float] = None
+    ) -> Optional[List[float]]:
+        """
+        Similarity in [0, 1] of ``text`` to each item
+        
+        Args:
+            kind: 'products' or 'ai_tools'
+            catalog: The full loaded catalog the model is fitted on
+            version: Catalog version of ``catalog``
+            text: The request's free text
+            items: Items to score, by id (default: the whole catalog, in order)
+            deadline: ``time.perf_counter()`` value past which the request is
+                answered without similarity
+        
+        Returns:
+            One similarity per item (0 for ids not in the catalog), or None
+            when there is nothing to compare or no time to compare it
+        """
+        if not text or not text.strip():
+            return None
+        if deadline is not None:
+            model = self._fitted(kind, catalog, version)
+            if model is None:
+                self._fit_in_background(kind, catalog, version)
+            if model is None or time.perf_counter() >= deadline:
+                self.skipped += 1
+                return None
+        else:
+            model = self._model(kind, catalog, version)
+        if model is None:
+            return None
+        
+        from sklearn.metrics.pairwise import cosine_similarity
+        
+        with get_tracer().span('match.text_similarity', catalog=kind, catalog_size=len(catalog)):
+            row = cosine_similarity(model.vectorizer.transform([text]), model.matrix)[0]
+        
+        if items is None or items is model.items:
+            return row.tolist()
+        return [
+            float(row[model.rows[item.get('id')]]) if item.get('id') in model.rows else 0.0
+            for item in items
+        ]
+    
+    def fit(self, kind: str, catalog: List[Dict], version: int) -> bool:
+        """Fit the model for ``catalog`` ahead of the first request; False if it has no usable text"""
+        return self._model(kind, catalog, version) is not None
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "fits": self.fits,
+            "skipped": self.skipped,
+            "models": {
+                kind: {"version": model.version, "items": len(model.items), "terms": model.matrix.shape[1]}
+                for kind, model in self._models.items()
+            }
+        }
+    
+    def _fitted(self, kind: str, catalog: List[Dict], version: int) -> Optional[_Model]:
+        model = self._models.get(kind)
+        if model is not None and model.items is catalog and model.version == version:
+            return model
+        return None
+    
+    def _fit_in_background(self, kind: str, catalog: List[Dict], version: int) -> None:
+        key = (kind, version)
+        with self._lock:
+            if key in self._background_fits:
+                return
+            self._background_fits.add(key)
+        
+        def fit():
+            try:
+                self._model(kind, catalog, version)
+            finally:
+                self._background_fits.discard(key)
+        
+        threading.Thread(target=fit, name=f"text-similarity-fit-{kind}", daemon=True).start()
+    
+    def _model(self, kind: str, catalog: List[Dict], version: int) -> Optional[_Model]:
+        model = self._fitted(kind, catalog, version)
+        if model is not None:
+            return model
+        
+        with self._lock:
+            model = self._models.get(kind)
+            if model is not None and model.items is catalog and model.version == version:
+                return model
+            
+            # Heavy import, only paid for once a request needs it
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            
+            texts = [item_text(item, TEXT_FIELDS[kind]) for item in catalog]
+            vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True, ngram_range=(1, 2))
+            with get_tracer().span('text_similarity.fit', catalog=kind, catalog_size=len(catalog)):
+                try:
+                    matrix = vectorizer.fit_transform(texts)
+                except ValueError:
+                    # Empty catalog or no usable terms
+                    self._models.pop(kind, None)
+                    return None
+            
+            model = _Model(catalog, version, vectorizer, matrix)
+            self._models[kind] = model
+            self.fits += 1
+            return model
+
+
+# Singleton instance
+_text_similarity = None
+
+
+def get_text_similarity() -> TextSimilarity:
+    """Get singleton text similarity instance"""
+    global _text_similarity
+    if _text_similarity is None:
+        _text_similarity = TextSimilarity()
+    return _text_similarity
@@ -0,0 +1,357 @@
+"""
+Tracing Service - Nested spans exported as OpenTelemetry-compatible JSON
+"""
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import os
+import queue
+import threading
+import time
+
+from config import get_settings
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+SERVICE_NAME = "zeroday3-backend"
+
+# Traces whose spans outlive their root (abandoned requests) are dropped past this
+MAX_PENDING_TRACES = 1000
+
+# Finished traces waiting for the export thread; more are dropped
+EXPORT_QUEUE_SIZE = 1000
+
+# Most traces appended to the export file in one write
+EXPORT_BATCH_SIZE = 100
+
+
+def _otel_value(value: Any) -> Dict[str, Any]:
+    """Wrap a Python value as an OTLP AnyValue"""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP JSON encodes 64-bit integers as strings
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple, frozenset, set)):
+        return {"arrayValue": {"values": [_otel_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+class Span:
+    """One timed operation within a trace"""
+    
+    __slots__ = (
+        'name', 'kind', 'trace_id', 'span_id', 'parent_span_id',
+        'start_ns', 'end_ns', 'attributes', 'status_code', 'status_message'
+    )
+    
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_span_id: Optional[str] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None
+    ):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status_code = 0
+        self.status_message = ""
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+    
+    def increment(self, key: str, amount: int = 1) -> None:
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+    
+    def set_error(self, error: BaseException) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = f"{type(error).__name__}: {error}"
+    
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+    
+    def to_otel(self) -> Dict[str, Any]:
+        """Span in OTLP/JSON form"""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [
+                {"key": key, "value": _otel_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": self.status_code or STATUS_OK}
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class _NoopSpan:
+    """Stand-in used when tracing is disabled or no trace is active"""
+    
+    trace_id = None
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+    
+    def increment(self, key: str, amount: int = 1) -> None:
+        pass
+    
+    def set_error(self, error: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+
+def current_span():
+    """The innermost active span, or a no-op span outside any trace"""
+    return _current_span.get() or NOOP_SPAN
+
+
+class TraceExporter:
+    """
+    Append finished traces to a JSON Lines file from a background thread
+    
+    ``submit()`` only puts the trace on a bounded queue, so requests never
+    wait on the file. The thread serializes whatever has queued up and
+    appends it in one write. When the queue is full the trace is dropped
+    and counted. The thread is started on first use in each process, so
+    forked workers get their own.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        document: Callable[[List[Span]], Dict[str, Any]],
+        queue_size: int = EXPORT_QUEUE_SIZE
+    ):
+        self.path = path
+        self.exported = 0
+        self.dropped = 0
+        self._document = document
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    def submit(self, spans: List[Span]) -> None:
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+    
+    def close(self, timeout: float = 5.0) -> None:
+        """Write what is still queued and stop the thread"""
+        thread = self._thread
+        if thread is None or self._pid != os.getpid():
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+        self._thread = None
+    
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._thread.start()
+    
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < EXPORT_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = None in batch
+            self._write([spans for spans in batch if spans is not None])
+            if stop:
+                return
+    
+    def _write(self, batch: List[List[Span]]) -> None:
+        if not batch:
+            return
+        try:
+            lines = "".join(
+                json.dumps(self._document(spans), separators=(",", ":")) + "\n"
+                for spans in batch
+            )
+            with open(self.path, "a") as f:
+                f.write(lines)
+            self.exported += len(batch)
+        except OSError as e:
+            self.dropped += len(batch)
+            print(f"Failed to export traces: {e}")
+
+
+class Tracer:
+    """
+    Create nested spans and export each finished trace
+    
+    The active span lives in a context variable, so spans opened on the
+    match executor (which copies the caller's context) nest under the
+    request's span. When the root span ends, the whole trace is kept in a
+    ring buffer and, if configured, handed to a ``TraceExporter`` that
+    appends one OTLP ``resourceSpans`` document per trace to a JSON Lines
+    file off the request path.
+    """
+    
+    def __init__(self, enabled: bool = True, buffer_size: int = 200, export_path: str = ""):
+        self.enabled = enabled
+        self.export_path = export_path
+        self.exporter = TraceExporter(export_path, self._document) if export_path else None
+        self._traces: deque = deque(maxlen=buffer_size)
+        self._pending: Dict[str, List[Span]] = {}
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def span(self, name: str, root: bool = False, **attributes) -> Iterator[Any]:
+        """
+        Time the enclosed block as a span
+        
+        Args:
+            name: Span name
+            root: Start a new trace here; otherwise the span is only
+                recorded inside an active trace
+            **attributes: Initial span attributes
+        
+        Yields:
+            The span (a no-op span when nothing is recorded)
+        """
+        parent = _current_span.get()
+        if not self.enabled or (parent is None and not root):
+            yield NOOP_SPAN
+            return
+        
+        if parent is None:
+            span = Span(name, os.urandom(16).hex(), kind=SPAN_KIND_SERVER, attributes=attributes)
+        else:
+            span = Span(name, parent.trace_id, parent.span_id, attributes=attributes)
+        
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self._finish(span)
+    
+    def traces(
+        self,
+        limit: int = 50,
+        name: Optional[str] = None,
+        min_duration_ms: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """Summaries of buffered traces, newest first"""
+        summaries = []
+        for spans in reversed(self._traces):
+            root = spans[-1]
+            if name and root.name != name:
+                continue
+            if root.duration_ms < min_duration_ms:
+                continue
+            summaries.append({
+                "trace_id": root.trace_id,
+                "name": root.name,
+                "start_time_unix_nano": str(root.start_ns),
+                "duration_ms": round(root.duration_ms, 3),
+                "span_count": len(spans),
+                "error": root.status_code == STATUS_ERROR,
+                "attributes": dict(root.attributes)
+            })
+            if len(summaries) >= limit:
+                break
+        return summaries
+    
+    def get_trace(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """One buffered trace as an OTLP/JSON document"""
+        for spans in self._traces:
+            if spans[-1].trace_id == trace_id:
+                return self._document(spans)
+        return None
+    
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            if span.parent_span_id is not None:
+                self._pending.setdefault(span.trace_id, []).append(span)
+                if len(self._pending) > MAX_PENDING_TRACES:
+                    self._pending.pop(next(iter(self._pending)))
+                return
+            spans = self._pending.pop(span.trace_id, [])
+            spans.append(span)
+            self._traces.append(spans)
+        
+        if self.exporter is not None:
+            self.exporter.submit(spans)
+    
+    def close(self) -> None:
+        """Flush traces still waiting to be exported"""
+        if self.exporter is not None:
+            self.exporter.close()
+    
+    def _document(self, spans: List[Span]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": SERVICE_NAME}},
+                        {"key": "process.pid", "value": {"intValue": str(os.getpid())}}
+                    ]
+                },
+                "scopeSpans": [{
+                    "scope": {"name": "app.services.tracing"},
+                    "spans": [span.to_otel() for span in spans]
+                }]
+            }]
+        }
+
+
+# Singleton instance
+_tracer = None
+
+
+def get_tracer() -> Tracer:
+    """Get singleton tracer instance"""
+    global _tracer
+    if _tracer is None:
+        settings = get_settings()
+        _tracer = Tracer(
+            enabled=settings.tracing_enabled,
+            buffer_size=settings.trace_buffer_size,
+            export_path=settings.trace_export_path
+        )
+    return _tracer
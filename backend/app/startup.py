@@ -0,0 +1,157 @@
+"""
+Startup helpers - preload shared state and report per-process memory
+"""
+from typing import Dict, Iterator, List, Tuple
+from contextlib import contextmanager
+import os
+import resource
+import time
+
+# Set by the pre-fork server in each worker process
+WORKER_INDEX_ENV = "ZD3_WORKER_INDEX"
+
+
+class StartupReport:
+    """Wall-clock time spent in each startup stage"""
+    
+    def __init__(self):
+        self.stages: List[Tuple[str, float]] = []
+    
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as stage ``name``"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, (time.perf_counter() - started) * 1000))
+    
+    def totals(self) -> Dict[str, float]:
+        """Milliseconds per stage; ``import:x`` stages also add up under ``import``"""
+        totals: Dict[str, float] = {}
+        for name, ms in self.stages:
+            totals[name] = totals.get(name, 0.0) + ms
+            group, _, _ = name.partition(':')
+            if group != name:
+                totals[group] = totals.get(group, 0.0) + ms
+        return {name: round(ms, 1) for name, ms in totals.items()}
+    
+    def summary(self) -> str:
+        return ", ".join(f"{name} {ms:.1f} ms" for name, ms in self.totals().items())
+
+
+startup_report = StartupReport()
+
+_warmed_up = False
+
+
+def preload() -> Dict[str, int]:
+    """
+    Load catalogs, build their indexes and the match service singletons
+    
+    Safe to call more than once; everything is cached after the first
+    call. The pre-fork server calls it in the parent so workers inherit
+    the loaded state instead of rebuilding it. The text similarity models
+    are only fitted (and scikit-learn imported) when text similarity is
+    blended into match scores.
+    """
+    from app.database import get_data_loader
+    from app.services.analyze_intent import get_intent_analyzer
+    from app.services.cross_reference import get_cross_reference_engine
+    from app.services.generate_instructions import get_instruction_generator
+    from app.services.text_similarity import get_text_similarity
+    
+    with startup_report.stage("catalog_load"):
+        data_loader = get_data_loader()
+        products = data_loader.load_product_catalog()
+        tools = data_loader.load_ai_tools_catalog()
+    
+    with startup_report.stage("index_build"):
+        data_loader.product_index()
+        data_loader.ai_tools_index()
+        get_intent_analyzer()
+        engine = get_cross_reference_engine()
+        get_instruction_generator()
+    
+    if engine.text_similarity_weight > 0:
+        with startup_report.stage("text_similarity_fit"):
+            text_similarity = get_text_similarity()
+            text_similarity.fit("products", products, data_loader.catalog_version)
+            text_similarity.fit("ai_tools", tools, data_loader.catalog_version)
+    
+    return {"products": len(products), "ai_tools": len(tools)}
+
+
+def warm_up() -> None:
+    """
+    Exercise both match paths once before the worker reports ready
+    
+    Pulls in lazily imported code and fills the instruction cache for a
+    typical request. Runs once per process tree; forked workers inherit it.
+    """
+    global _warmed_up
+    if _warmed_up:
+        return
+    
+    from app.models import (
+        CompanyMatchRequest,
+        IndividualMatchRequest,
+        COMPANY_RESPONSE_SECTIONS,
+        INDIVIDUAL_RESPONSE_SECTIONS
+    )
+    from app.services import match_pipeline
+    
+    with startup_report.stage("warm_up"):
+        match_pipeline.run_company_match(
+            CompanyMatchRequest(
+                friction_point="Customer support latency issues with repetitive questions",
+                company_size="medium"
+            ),
+            frozenset(COMPANY_RESPONSE_SECTIONS)
+        )
+        match_pipeline.run_individual_match(
+            IndividualMatchRequest(
+                need="Best laptop for machine learning development",
+                budget_range="premium"
+            ),
+            frozenset(INDIVIDUAL_RESPONSE_SECTIONS)
+        )
+    
+    _warmed_up = True
+
+
+def worker_index() -> int:
+    """Index of this worker under the pre-fork server (0 when standalone)"""
+    return int(os.environ.get(WORKER_INDEX_ENV, "0"))
+
+
+def memory_usage() -> Dict[str, int]:
+    """
+    Resident and shared memory of this process in kB
+    
+    Uses /proc/self/smaps_rollup where available (Linux); shared pages are
+    the copy-on-write pages still shared with the parent and siblings.
+    Elsewhere only the peak resident size is known.
+    """
+    fields = {
+        "Rss": "rss_kb",
+        "Pss": "pss_kb",
+        "Shared_Clean": "shared_clean_kb",
+        "Shared_Dirty": "shared_dirty_kb",
+        "Private_Clean": "private_clean_kb",
+        "Private_Dirty": "private_dirty_kb"
+    }
+    usage = {"pid": os.getpid()}
+    
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in fields:
+                    usage[fields[name]] = int(value.split()[0])
+    except OSError:
+        usage["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage
+    
+    usage["shared_kb"] = usage.get("shared_clean_kb", 0) + usage.get("shared_dirty_kb", 0)
+    return usage
@@ -1,3 +1,4 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -8,9 +9,21 @@ class Settings(BaseSettings):
     app_name: str = "ZeroDay3 Matching AI"
     app_version: str = "1.0.0"
     
+    # Debug mode (enables response schema checks on fast paths)
+    debug: bool = False
+    
     # API Configuration
     api_prefix: str = "/api"
     
+    # Server (python -m app.server)
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 1  # Pre-forked worker processes sharing preloaded catalogs
+    worker_restart_delay: float = 0.5  # First delay before restarting a crashed worker; doubles per crash
+    worker_restart_max_delay: float = 30.0  # Longest delay between restarts
+    worker_max_restarts: int = 5  # Crashes of one worker within the window before it is given up
+    worker_restart_window: float = 60.0  # Seconds; a worker that ran this long resets its backoff
+    
     # CORS Configuration
     cors_origins: list = [
         "http://localhost:3000",
@@ -24,13 +37,86 @@ class Settings(BaseSettings):
     product_catalog_path: str = "../data/product_catalog.json"
     ai_tools_catalog_path: str = "../data/ai_tools_catalog.json"
     
+    # Catalog rollout across workers
+    catalog_poll_interval: float = 1.0  # Seconds between shared version checks
+    catalog_reload_stagger: float = 2.0  # Extra delay per worker index before reloading
+    
     # Matching Algorithm Parameters (65/35 Framework)
     structural_logic_weight: float = 0.65  # Structural logic weight
     precision_weight: float = 0.35  # Original precision weight
+    text_similarity_weight: float = 0.0  # Share of TF-IDF text similarity in match scores; 0 disables it
+    
+    # Instruction generation
+    instruction_cache_size: int = 4096  # Rendered fragments kept in the LRU cache
+    
+    # Match execution
+    match_executor_workers: int = 4  # Threads running CPU-bound match work
+    
+    # Admission control for /match (per worker)
+    match_max_concurrent: int = 32  # Requests served in full
+    match_max_degraded: int = 32  # Further requests served ids and scores only; beyond that, 503
+    match_max_queue_depth: int = 16  # Executor backlog at which new requests are degraded
+    
+    # Bulk matching jobs (/jobs)
+    bulk_jobs_dir: str = "./jobs"
+    bulk_job_workers: int = 1  # Jobs processed at once per worker process
+    bulk_chunk_size: int = 500  # Input lines per checkpointed chunk
+    bulk_max_upload_mb: int = 100
+    bulk_resume_interval: float = 30.0  # Seconds between scans for jobs left by a worker that died
+    
+    # Catalog bulk import (/api/admin/catalog/import)
+    catalog_import_workers: int = 2  # Threads validating chunks
+    catalog_import_chunk_size: int = 1000  # Rows per validation chunk
+    catalog_import_max_mb: int = 200
+    
+    # Per-request profiling (X-Profile: 1 with an admin token)
+    profile_dir: str = "./profiles"
+    profile_keep: int = Field(50, ge=1)  # Newest reports kept on disk, at least 1
+    
+    # Tracing (GET /api/admin/traces)
+    tracing_enabled: bool = True
+    trace_buffer_size: int = 200  # Recent traces kept in memory
+    trace_export_path: str = ""  # Append OTLP JSON lines here when set
     
     # Gemini API Configuration
     gemini_api_key: str = ""
     gemini_model: str = "gemini-pro"
+    gemini_timeout_seconds: float = 20.0  # Per call, including time spent waiting for a slot
+    gemini_max_concurrency: int = 4  # Concurrent Gemini calls per worker
+    gemini_breaker_failure_rate: float = 0.5  # Share of failed or slow calls that opens the circuit
+    gemini_breaker_window: int = 20  # Recent calls the failure rate is taken over
+    gemini_breaker_min_calls: int = 5
+    gemini_breaker_slow_call_seconds: float = 10.0  # Slower successful calls count as failures
+    gemini_breaker_open_seconds: float = 30.0  # Fail fast this long before probing again
+    gemini_hedging: bool = False  # Send a second attempt when a call passes the recent p95
+    gemini_hedge_min_delay_seconds: float = 1.0
+    
+    # Admin command interpretation: "gemini" or "local_rules" (offline, deterministic)
+    llm_backend: str = "gemini"
+    llm_batch_max_size: int = 8  # Concurrent messages merged into one backend call
+    llm_batch_wait_ms: float = 20.0  # How long the first message waits for others
+    
+    # Cache of Gemini command interpretations (shared by workers)
+    command_cache_path: str = "./command_cache.sqlite3"
+    command_cache_ttl_seconds: float = 86400.0
+    command_cache_max_entries: int = 1000
+    
+    # Admin commands that run processes (tests, git)
+    repository_path: str = ".."  # Repository root; relative paths are taken from the backend directory
+    admin_max_subprocesses: int = 2  # Concurrent admin processes per worker; more wait
+    
+    # Admin catalog listings (catalog_info, GET /api/admin/catalog)
+    admin_catalog_page_size: int = 50
+    admin_catalog_max_page_size: int = 500
+    
+    # Audit log of admin commands (GET /api/admin/audit)
+    audit_log_path: str = "./audit_log.sqlite3"
+    audit_queue_size: int = 1000  # Records waiting to be written
+    audit_batch_size: int = 100  # Records per write transaction
+    audit_flush_interval_seconds: float = 1.0  # How long a partial batch waits to fill
+    audit_enqueue_timeout_ms: float = 50.0  # Wait for room in a full queue before dropping
+    audit_retention_days: float = 30.0
+    audit_max_records: int = 100000
     
     # Admin Authentication
     admin_secret_key: str = "your-secret-key-change-in-production"
@@ -0,0 +1,28 @@
+"""
+Shared fixtures for the backend unit tests
+
+Run from the backend directory: ``python -m pytest tests``
+"""
+from pathlib import Path
+import shutil
+import sys
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BACKEND_DIR.parent / "data"
+
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture
+def data_loader(tmp_path, monkeypatch):
+    """A DataLoader over a scratch copy of the seed catalogs, installed as the singleton"""
+    import app.database
+    
+    for name in (app.database.DataLoader.PRODUCT_CATALOG_FILE, app.database.DataLoader.AI_TOOLS_CATALOG_FILE):
+        shutil.copy(DATA_DIR / name, tmp_path / name)
+    loader = app.database.DataLoader(str(tmp_path))
+    monkeypatch.setattr(app.database, "_data_loader", loader)
+    return loader
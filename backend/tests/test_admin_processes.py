@@ -0,0 +1,140 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from app.services.admin_processes import (
+    BACKEND_DIR,
+    MAX_GIT_LOG_COUNT,
+    ProcessRunner,
+    command_argv,
+    resolve_repository_path
+)
+
+
+def _python(code):
+    return [sys.executable, "-c", code]
+
+
+def test_relative_paths_are_resolved_from_the_backend_directory(tmp_path):
+    assert resolve_repository_path(".") == BACKEND_DIR
+    assert resolve_repository_path("..") == BACKEND_DIR.parent
+    assert resolve_repository_path(str(tmp_path)) == tmp_path.resolve()
+
+
+def test_processes_run_in_the_repository_path(tmp_path):
+    runner = ProcessRunner(str(tmp_path))
+    
+    code, stdout, stderr = asyncio.run(runner.run(_python("import os; print(os.getcwd())"), timeout=10))
+    
+    assert (code, stdout.strip(), stderr) == (0, str(tmp_path.resolve()), "")
+
+
+def test_git_commands_are_refused_outside_a_git_repository(tmp_path):
+    runner = ProcessRunner(str(tmp_path))
+    
+    with pytest.raises(OSError, match="not a git repository"):
+        asyncio.run(runner.run(command_argv("git_status"), timeout=10))
+    assert runner.stats()["started"] == 0
+    
+    (tmp_path / ".git").mkdir()
+    assert ProcessRunner(str(tmp_path)).is_git_repository
+
+
+def test_git_log_count_is_bounded():
+    assert command_argv("git_log", {"count": "3"})[2] == "-3"
+    for count in (0, MAX_GIT_LOG_COUNT + 1, "many"):
+        with pytest.raises(ValueError):
+            command_argv("git_log", {"count": count})
+    with pytest.raises(ValueError):
+        command_argv("system_status")
+
+
+def test_concurrent_processes_are_capped(tmp_path):
+    runner = ProcessRunner(str(tmp_path), max_concurrent=2)
+    most_running = 0
+    
+    async def run():
+        nonlocal most_running
+        jobs = asyncio.gather(*(runner.run(_python("import time; time.sleep(0.3)"), timeout=10) for _ in range(4)))
+        while not jobs.done():
+            most_running = max(most_running, runner.running)
+            await asyncio.sleep(0.01)
+        return await jobs
+    
+    results = asyncio.run(run())
+    
+    assert [code for code, _, _ in results] == [0] * 4
+    assert most_running == 2
+    assert (runner.started, runner.running, runner.killed) == (4, 0, 0)
+
+
+def test_process_is_killed_after_its_timeout(tmp_path):
+    runner = ProcessRunner(str(tmp_path))
+    started = time.monotonic()
+    
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(runner.run(_python("import time; time.sleep(30)"), timeout=0.2))
+    
+    assert time.monotonic() - started < 10
+    assert (runner.running, runner.killed) == (0, 1)
+
+
+def test_stream_yields_lines_then_the_exit_code(tmp_path):
+    runner = ProcessRunner(str(tmp_path))
+    code = "import sys; print('one'); print('two', file=sys.stderr, flush=True); sys.exit(3)"
+    
+    async def run():
+        return [event async for event in runner.stream(_python(code), timeout=10)]
+    
+    assert asyncio.run(run()) == [("line", "one"), ("line", "two"), ("exit", 3)]
+    assert runner.killed == 0
+
+
+def test_stream_times_out_and_kills_the_process(tmp_path):
+    runner = ProcessRunner(str(tmp_path))
+    
+    async def run():
+        async for _ in runner.stream(_python("import time; time.sleep(30)"), timeout=0.2):
+            pass
+    
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run())
+    assert (runner.running, runner.killed) == (0, 1)
+
+
+def test_closing_a_stream_early_kills_the_process(tmp_path):
+    runner = ProcessRunner(str(tmp_path))
+    code = "import time; print('ready', flush=True); time.sleep(30)"
+    
+    async def run():
+        events = runner.stream(_python(code), timeout=30)
+        first = await events.__anext__()
+        await events.aclose()
+        return first
+    
+    started = time.monotonic()
+    assert asyncio.run(run()) == ("line", "ready")
+    assert time.monotonic() - started < 10
+    assert (runner.running, runner.killed) == (0, 1)
+
+
+def test_cancelling_a_stream_consumer_kills_the_process(tmp_path):
+    runner = ProcessRunner(str(tmp_path))
+    code = "import time; print('ready', flush=True); time.sleep(30)"
+    
+    async def consume(ready):
+        async for _ in runner.stream(_python(code), timeout=30):
+            ready.set()
+    
+    async def run():
+        ready = asyncio.Event()
+        task = asyncio.create_task(consume(ready))
+        await ready.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    
+    asyncio.run(run())
+    assert (runner.running, runner.killed) == (0, 1)
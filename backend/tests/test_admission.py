@@ -0,0 +1,43 @@
+from app.services.admission import AdmissionController, ADMIT, DEGRADE, REJECT
+
+
+def test_full_then_degraded_then_rejected():
+    controller = AdmissionController(max_concurrent=2, max_degraded=1, max_queue_depth=10)
+    
+    decisions = [controller.acquire() for _ in range(4)]
+    
+    assert decisions == [ADMIT, ADMIT, DEGRADE, REJECT]
+    assert controller.stats()["in_flight"] == 3
+
+
+def test_release_frees_full_slots():
+    controller = AdmissionController(max_concurrent=1, max_degraded=1, max_queue_depth=10)
+    first = controller.acquire()
+    assert controller.acquire() == DEGRADE
+    
+    controller.release(first)
+    
+    assert controller.acquire() == ADMIT
+
+
+def test_rejected_decisions_hold_nothing():
+    controller = AdmissionController(max_concurrent=0, max_degraded=0)
+    
+    decision = controller.acquire()
+    controller.release(decision)
+    
+    assert decision == REJECT
+    assert controller.in_flight == 0
+
+
+def test_executor_backlog_degrades_new_requests():
+    depth = 0
+    controller = AdmissionController(
+        max_concurrent=10, max_degraded=10, max_queue_depth=4, queue_depth=lambda: depth
+    )
+    assert controller.acquire() == ADMIT
+    
+    depth = 4
+    
+    assert controller.acquire() == DEGRADE
+    assert controller.stats()["shed_ratio"] == 0.5
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+from app.services import audit_log as audit_log_module
+from app.services.audit_log import AuditLog, MAX_TEXT_CHARS
+
+OK = {"command": "system_status", "parameters": {}, "source": "local", "success": True, "message": "All good"}
+FAILED = {"command": "git_log", "parameters": {"count": 5}, "source": "gemini", "success": False, "error": "boom"}
+
+
+def _audit_log(tmp_path, **kwargs):
+    return AuditLog(str(tmp_path / "audit.db"), **kwargs)
+
+
+def test_records_are_written_in_one_batch(tmp_path):
+    log = _audit_log(tmp_path, batch_size=10, flush_interval=0.01)
+    
+    async def run():
+        log.start()
+        for i in range(3):
+            assert await log.record(f"message {i}", OK, latency_ms=1.23456)
+        while log.written < 3:
+            await asyncio.sleep(0.01)
+        await log.stop()
+    
+    asyncio.run(run())
+    
+    records = log.query()
+    assert [record["message"] for record in records] == ["message 2", "message 1", "message 0"]
+    assert records[0]["success"] and records[0]["result"] == "All good"
+    assert records[0]["latency_ms"] == 1.235
+    assert log.stats()["batches"] == 1
+
+
+def test_stop_writes_whatever_is_queued(tmp_path):
+    log = _audit_log(tmp_path)
+    
+    async def run():
+        await log.record("never flushed", FAILED, latency_ms=2)
+        await log.stop()
+    
+    asyncio.run(run())
+    
+    [record] = log.query()
+    assert record["parameters"] == {"count": 5}
+    assert not record["success"] and record["error"] == "boom"
+
+
+def test_query_filters_by_time_range_and_command(tmp_path):
+    log = _audit_log(tmp_path)
+    now = time.time()
+    
+    async def run():
+        await log.record("old", OK, latency_ms=1, ts=now - 100)
+        await log.record("recent", OK, latency_ms=1, ts=now - 10)
+        await log.record("failed", FAILED, latency_ms=1, ts=now - 5)
+        await log.stop()
+    
+    asyncio.run(run())
+    
+    assert [record["message"] for record in log.query(since=now - 50)] == ["failed", "recent"]
+    assert [record["message"] for record in log.query(until=now - 10)] == ["old"]
+    assert [record["message"] for record in log.query(command="system_status")] == ["recent", "old"]
+    assert len(log.query(limit=1)) == 1
+
+
+def test_long_output_is_truncated(tmp_path):
+    log = _audit_log(tmp_path)
+    
+    async def run():
+        await log.record("long", dict(OK, message="x" * (MAX_TEXT_CHARS + 10)), latency_ms=1)
+        await log.stop()
+    
+    asyncio.run(run())
+    
+    assert log.query()[0]["result"].endswith("... [10 more characters]")
+
+
+def test_records_are_dropped_when_the_queue_stays_full(tmp_path):
+    log = _audit_log(tmp_path, queue_size=2, enqueue_timeout=0.01)
+    
+    async def run():
+        return [await log.record(f"message {i}", OK, latency_ms=1) for i in range(3)]
+    
+    assert asyncio.run(run()) == [True, True, False]
+    assert log.stats()["dropped"] == 1
+    assert log.stats()["queued"] == 2
+
+
+def test_old_and_excess_records_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(audit_log_module, "PRUNE_EVERY", 1)
+    log = _audit_log(tmp_path, retention_days=1, max_records=2)
+    now = time.time()
+    
+    async def run():
+        await log.record("expired", OK, latency_ms=1, ts=now - 2 * 86400)
+        await log.stop()
+        for i in range(3):
+            await log.record(f"message {i}", OK, latency_ms=1, ts=now + i)
+        await log.stop()
+    
+    asyncio.run(run())
+    
+    assert [record["message"] for record in log.query()] == ["message 2", "message 1"]
@@ -0,0 +1,140 @@
+from types import SimpleNamespace
+import fcntl
+import json
+import os
+import time
+
+from app.models import COMPANY_RESPONSE_SECTIONS
+from app.services import bulk_jobs
+from app.services.bulk_jobs import BulkJobManager, COMPLETED, RUNNING, LOCK_FILE
+
+# Five input lines: the third is not JSON, the fourth repeats the first
+INPUT_LINES = [
+    b'{"friction_point": "Customer support latency issues with repetitive questions"}',
+    b'{"friction_point": "Slow manual invoice processing across departments"}',
+    b'not json',
+    b'{"friction_point": "Customer support latency issues with repetitive questions"}',
+    b'{"friction_point": "Engineers spend hours searching internal documentation"}'
+]
+
+
+def _job(manager, lines):
+    job = manager.create_job("company", COMPANY_RESPONSE_SECTIONS, top_k=1)
+    data = b"".join(line + b"\n" for line in lines)
+    manager.input_path(job["id"]).write_bytes(data)
+    job["input_bytes"] = len(data)
+    job["input_lines"] = len(lines)
+    manager._write_job(job)
+    return job
+
+
+def _output(manager, job_id):
+    return [json.loads(line) for line in manager.output_path(job_id).read_bytes().splitlines()]
+
+
+def test_job_runs_to_completion(tmp_path, data_loader):
+    manager = BulkJobManager(str(tmp_path / "jobs"), chunk_size=2, resume_interval=0)
+    job = _job(manager, INPUT_LINES)
+    
+    manager._run(job["id"])
+    
+    job = manager.get_job(job["id"])
+    assert job["status"] == COMPLETED
+    assert job["processed_lines"] == 5
+    assert job["error_lines"] == 1
+    assert job["progress"] == 1.0
+    output = _output(manager, job["id"])
+    assert [record["line"] for record in output] == [1, 2, 3, 4, 5]
+    assert "error" in output[2]
+    assert output[0]["result"] == output[3]["result"]
+
+
+def test_resume_continues_from_checkpoint_without_duplicates(tmp_path, data_loader):
+    jobs_dir = str(tmp_path / "jobs")
+    first = BulkJobManager(jobs_dir, chunk_size=2, resume_interval=0)
+    job = _job(first, INPUT_LINES)
+    write_job = first._write_job
+    
+    def stop_after_first_chunk(job):
+        write_job(job)
+        if job["processed_lines"]:
+            first._stopping.set()
+    
+    first._write_job = stop_after_first_chunk
+    first._run(job["id"])
+    
+    interrupted = first.get_job(job["id"])
+    assert interrupted["status"] == RUNNING
+    assert interrupted["processed_lines"] == 2
+    # Output of a chunk that was written but never checkpointed
+    with open(first.output_path(job["id"]), "ab") as f:
+        f.write(b'{"line": 3, "result": "lost"}\n')
+    
+    second = BulkJobManager(jobs_dir, chunk_size=2, resume_interval=0)
+    second._run(job["id"])
+    
+    job = second.get_job(job["id"])
+    assert job["status"] == COMPLETED
+    assert job["processed_lines"] == 5
+    assert [record["line"] for record in _output(second, job["id"])] == [1, 2, 3, 4, 5]
+
+
+def test_job_locked_by_another_process_is_left_alone(tmp_path, data_loader):
+    manager = BulkJobManager(str(tmp_path / "jobs"), resume_interval=0)
+    job = _job(manager, INPUT_LINES)
+    lock_fd = os.open(tmp_path / "jobs" / job["id"] / LOCK_FILE, os.O_RDWR | os.O_CREAT)
+    fcntl.flock(lock_fd, fcntl.LOCK_EX)
+    try:
+        manager._run(job["id"])
+    finally:
+        os.close(lock_fd)
+    
+    job = manager.get_job(job["id"])
+    assert job["status"] != COMPLETED
+    assert job["processed_lines"] == 0
+
+
+def test_resume_queues_only_unfinished_jobs_once(tmp_path, data_loader):
+    manager = BulkJobManager(str(tmp_path / "jobs"), resume_interval=0)
+    unfinished = _job(manager, INPUT_LINES)
+    finished = _job(manager, INPUT_LINES)
+    finished["status"] = COMPLETED
+    manager._write_job(finished)
+    ran = []
+    manager._run = ran.append
+    
+    assert manager.resume() == 1
+    assert manager.resume() == 0
+    manager._pool.shutdown(wait=True)
+    assert ran == [unfinished["id"]]
+
+
+def test_every_line_yields_to_interactive_requests(tmp_path, data_loader):
+    manager = BulkJobManager(str(tmp_path / "jobs"), chunk_size=500, resume_interval=0)
+    job = _job(manager, INPUT_LINES[:2] + [b""] + INPUT_LINES[2:])
+    yield_to_interactive = manager._yield_to_interactive
+    yields = []
+    
+    def count_yields():
+        yields.append(job["id"])
+        yield_to_interactive()
+    
+    manager._yield_to_interactive = count_yields
+    manager._run(job["id"])
+    
+    assert manager.get_job(job["id"])["status"] == COMPLETED
+    # One chunk, but a yield before each of its five non-blank lines
+    assert len(yields) == 5
+
+
+def test_busy_executor_pauses_each_line(tmp_path, data_loader, monkeypatch):
+    monkeypatch.setattr(bulk_jobs, "get_match_executor", lambda: SimpleNamespace(in_flight=1))
+    monkeypatch.setattr(bulk_jobs, "MAX_YIELD_SECONDS", 0.05)
+    manager = BulkJobManager(str(tmp_path / "jobs"), chunk_size=500, resume_interval=0)
+    job = _job(manager, INPUT_LINES)
+    
+    started = time.monotonic()
+    manager._run(job["id"])
+    
+    assert manager.get_job(job["id"])["status"] == COMPLETED
+    assert time.monotonic() - started >= 5 * 0.05
@@ -0,0 +1,176 @@
+import asyncio
+import copy
+import csv
+import io
+import json
+import threading
+
+import pytest
+
+from app.database import DataLoader
+from app.services.catalog_import import CatalogImporter, detect_format
+from app.services.gemini_admin import GeminiAdminService
+
+
+def _product(data_loader, item_id, name=None):
+    product = copy.deepcopy(data_loader.load_product_catalog()[0])
+    product["id"] = item_id
+    product["name"] = name or item_id
+    return product
+
+
+def _ndjson(*lines):
+    return io.BytesIO("".join(
+        (line if isinstance(line, str) else json.dumps(line)) + "\n" for line in lines
+    ).encode())
+
+
+@pytest.fixture
+def importer():
+    return CatalogImporter(workers=2, chunk_size=2)
+
+
+def test_ndjson_rows_are_validated_and_merged(data_loader, importer):
+    existing = data_loader.load_product_catalog()[0]
+    replacement = dict(existing, name="Renamed")
+    upload = _ndjson(
+        _product(data_loader, "new-1"),
+        "{not json",
+        {"id": "missing-fields"},
+        replacement,
+        _product(data_loader, "new-1"),
+        ["not", "an", "object"]
+    )
+    version = data_loader.catalog_version
+    
+    report = importer.run("products", upload, "ndjson")
+    
+    assert (report["rows"], report["imported"], report["added"], report["replaced"]) == (6, 2, 1, 1)
+    assert [error["row"] for error in report["errors"]] == [2, 3, 5, 6]
+    assert report["errors"][0]["error"].startswith("Invalid JSON")
+    assert "Duplicate id new-1" in report["errors"][2]["error"]
+    assert report["catalog_version"] > version
+    catalog = data_loader.load_product_catalog()
+    assert catalog[0]["name"] == "Renamed"
+    assert catalog[-1]["id"] == "new-1"
+
+
+def test_csv_rows_nest_dotted_headers_and_decode_json(data_loader, importer):
+    product = _product(data_loader, "csv-1")
+    columns = [key for key in product if not isinstance(product[key], dict)]
+    nested = [key for key in product if isinstance(product[key], dict)]
+    header = columns + [f"{key}.{field}" for key in nested for field in product[key]]
+    values = (
+        [json.dumps(product[key]) if isinstance(product[key], list) else str(product[key]) for key in columns]
+        + [
+            json.dumps(value) if isinstance(value, (list, dict)) else str(value)
+            for key in nested for value in product[key].values()
+        ]
+    )
+    upload = io.StringIO()
+    writer = csv.writer(upload)
+    writer.writerow(header)
+    writer.writerow(values)
+    
+    report = importer.run("products", io.BytesIO(upload.getvalue().encode()), "csv")
+    
+    assert report["errors"] == []
+    assert data_loader.load_product_catalog()[-1]["id"] == "csv-1"
+
+
+def test_existing_ids_rejected_without_replace(data_loader, importer):
+    existing = data_loader.load_product_catalog()[0]
+    size = len(data_loader.load_product_catalog())
+    
+    upload = _ndjson(existing, _product(data_loader, "new-1"))
+    
+    report = importer.run("products", upload, "ndjson", replace_existing=False)
+    
+    assert report["imported"] == 1
+    assert report["errors"] == [{"row": 1, "error": f"Id {existing['id']} already exists"}]
+    assert len(data_loader.load_product_catalog()) == size + 1
+
+
+def test_dry_run_saves_nothing(data_loader, importer):
+    version = data_loader.catalog_version
+    size = len(data_loader.load_product_catalog())
+    
+    report = importer.run("products", _ndjson(_product(data_loader, "new-1")), "ndjson", dry_run=True)
+    
+    assert report["dry_run"] and report["added"] == 1
+    assert data_loader.catalog_version == version
+    assert len(data_loader.load_product_catalog()) == size
+
+
+def test_save_made_during_validation_is_kept(data_loader, importer, tmp_path):
+    other_worker = DataLoader(str(tmp_path))
+    validated_chunks = importer._validated_chunks
+    
+    def save_meanwhile(schema, records):
+        catalog = other_worker.load_product_catalog()
+        other_worker.save_product_catalog(catalog + [_product(data_loader, "concurrent")])
+        yield from validated_chunks(schema, records)
+    
+    importer._validated_chunks = save_meanwhile
+    
+    report = importer.run("products", _ndjson(_product(data_loader, "imported")), "ndjson")
+    
+    assert report["added"] == 1
+    for loader in (data_loader, DataLoader(str(tmp_path))):
+        assert [item["id"] for item in loader.load_product_catalog()][-2:] == ["concurrent", "imported"]
+
+
+def test_id_added_meanwhile_is_not_replaced(data_loader, importer, tmp_path):
+    other_worker = DataLoader(str(tmp_path))
+    validated_chunks = importer._validated_chunks
+    
+    def add_same_id(schema, records):
+        catalog = other_worker.load_product_catalog()
+        other_worker.save_product_catalog(catalog + [_product(data_loader, "contested", name="Theirs")])
+        yield from validated_chunks(schema, records)
+    
+    importer._validated_chunks = add_same_id
+    
+    report = importer.run(
+        "products", _ndjson(_product(data_loader, "contested", name="Ours")), "ndjson", replace_existing=False
+    )
+    
+    assert report["imported"] == 0
+    assert report["errors"] == [{"row": None, "error": "Id contested was added meanwhile"}]
+    assert data_loader.load_product_catalog()[-1]["name"] == "Theirs"
+
+
+def test_detect_format():
+    assert detect_format("feed.CSV", "") == "csv"
+    assert detect_format("upload", "text/csv") == "csv"
+    assert detect_format("feed.ndjson", "application/x-ndjson") == "ndjson"
+
+
+def test_admin_edits_wait_for_the_write_lock_off_the_event_loop(data_loader):
+    service = GeminiAdminService()
+    product = _product(data_loader, "admin-added")
+    locked = threading.Event()
+    release = threading.Event()
+    
+    def hold_lock():
+        with data_loader.write_lock():
+            locked.set()
+            release.wait(5)
+    
+    async def run():
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        locked.wait(5)
+        add = asyncio.create_task(service._add_product(product))
+        # The loop keeps serving other work while the add waits for the lock
+        await asyncio.sleep(0.05)
+        assert not add.done()
+        release.set()
+        result = await add
+        holder.join()
+        return result
+    
+    assert asyncio.run(run())["success"]
+    assert data_loader.load_product_catalog()[-1]["id"] == "admin-added"
+    assert asyncio.run(service._delete_product({"id": "admin-added"}))["success"]
+    assert not asyncio.run(service._update_product({"id": "admin-added", "name": "Gone"}))["success"]
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from app.database.catalog_index import CatalogIndex, UNSPECIFIED
+from app.services.gemini_admin import GeminiAdminService
+from config import get_settings
+
+settings = get_settings()
+
+FACETS = {'category': ('category',), 'ecosystem': ('matching_criteria', 'ecosystem')}
+
+ITEMS = [
+    {'id': 'a', 'name': 'A', 'category': 'Laptop', 'matching_criteria': {'ecosystem': 'apple'}},
+    {'id': 'b', 'name': 'B', 'category': 'laptop', 'matching_criteria': {'ecosystem': 'windows'}},
+    {'id': 'c', 'name': 'C', 'category': 'Tablet', 'matching_criteria': {'ecosystem': 'apple'}},
+    {'id': 'd', 'name': 'D', 'category': 'Laptop', 'matching_criteria': {'ecosystem': 'Apple'}},
+    {'id': 'a', 'name': 'Second A', 'category': 'Phone'},
+]
+
+
+@pytest.fixture
+def index():
+    return CatalogIndex(ITEMS, FACETS)
+
+
+def test_first_occurrence_of_an_id_wins(index):
+    assert index.get('a')['name'] == 'A'
+    assert index.get('missing') is None
+
+
+def test_counts_are_case_insensitive_and_largest_first(index):
+    counts = index.counts()
+    
+    assert counts['category'] == {'Laptop': 3, 'Tablet': 1, 'Phone': 1}
+    assert list(counts['category'])[0] == 'Laptop'
+    assert counts['ecosystem'] == {'apple': 3, 'windows': 1, UNSPECIFIED: 1}
+
+
+def test_query_intersects_filters_in_catalog_order(index):
+    matched, items = index.query({'category': 'LAPTOP', 'ecosystem': 'apple'})
+    
+    assert matched == 2
+    assert [item['id'] for item in items] == ['a', 'd']
+
+
+def test_query_pages_and_ignores_empty_filters(index):
+    assert index.query({'category': ''}, offset=1, limit=2) == (5, ITEMS[1:3])
+    assert index.query({'category': 'laptop'}, offset=2, limit=2)[1] == [ITEMS[3]]
+    assert index.query({'category': 'unknown'}) == (0, [])
+
+
+def test_unknown_filter_is_an_error(index):
+    with pytest.raises(ValueError, match='price_range'):
+        index.query({'price_range': 'budget'})
+
+
+def test_page_math(index):
+    page = index.page({'category': 'laptop'}, page=2, page_size=2)
+    
+    assert (page['count'], page['matched'], page['page'], page['pages']) == (5, 3, 2, 2)
+    assert (page['has_more'], page['next_page']) == (False, None)
+    assert index.page(page=1, page_size=2)['next_page'] == 2
+    assert page['items'] == [{'id': 'd', 'name': 'D', 'category': 'Laptop'}]
+    with pytest.raises(ValueError):
+        index.page(page=0)
+
+
+def test_data_loader_rebuilds_index_on_save(data_loader):
+    index = data_loader.product_index()
+    assert data_loader.product_index() is index
+    
+    data_loader.save_product_catalog(data_loader.load_product_catalog()[:1])
+    
+    assert data_loader.product_index() is not index
+    assert len(data_loader.product_index()) == 1
+
+
+def _catalog_info(parameters):
+    return asyncio.run(GeminiAdminService()._get_catalog_info(parameters))
+
+
+def test_catalog_info_returns_one_page_by_default(data_loader, monkeypatch):
+    monkeypatch.setattr(settings, 'admin_catalog_page_size', 2)
+    products = data_loader.load_product_catalog()
+    
+    result = _catalog_info({})
+    
+    assert result['success']
+    listing = result['data']['products']
+    assert listing['count'] == listing['matched'] == len(products)
+    assert [item['id'] for item in listing['items']] == [product['id'] for product in products[:2]]
+    assert listing['has_more'] == (len(products) > 2)
+    assert listing['next_page'] == (2 if len(products) > 2 else None)
+    assert 'ai_tools' in result['data']
+
+
+def test_catalog_info_paginates_on_request(data_loader):
+    result = _catalog_info({'kind': 'products', 'page_size': 1})
+    
+    assert list(result['data']) == ['products']
+    assert len(result['data']['products']['items']) == 1
+    assert result['data']['products']['pages'] == len(data_loader.load_product_catalog())
+
+
+def test_catalog_info_skips_catalogs_without_the_filtered_facet(data_loader):
+    result = _catalog_info({'ecosystem': 'apple'})
+    
+    assert list(result['data']) == ['products']
+
+
+def test_catalog_info_ignores_unknown_parameters(data_loader):
+    result = _catalog_info({'kind': 'ai_tools', 'nonsense': 'x', 'ecosystem': 'apple', 'category': ''})
+    
+    assert result['success']
+    assert result['ignored_parameters'] == ['ecosystem', 'nonsense']
+    assert result['data']['ai_tools']['matched'] == len(data_loader.load_ai_tools_catalog())
+    assert 'ignored_parameters' not in _catalog_info({})
@@ -0,0 +1,90 @@
+import asyncio
+import copy
+import subprocess
+import sys
+from pathlib import Path
+
+from app.database import DataLoader
+from app.database.version_channel import CatalogVersionChannel
+from app.services.catalog_watcher import CatalogWatcher
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def test_channel_is_shared_through_the_file(tmp_path):
+    first = CatalogVersionChannel(tmp_path / "version")
+    second = CatalogVersionChannel(tmp_path / "version")
+    
+    assert first.publish() == 1
+    assert second.read() == 1
+    assert second.publish() == 2
+    assert first.read() == 2
+
+
+def test_channel_sees_versions_published_by_another_process(tmp_path):
+    channel = CatalogVersionChannel(tmp_path / "version")
+    script = (
+        "import sys; from app.database.version_channel import CatalogVersionChannel; "
+        "channel = CatalogVersionChannel(sys.argv[1]); [channel.publish() for _ in range(3)]"
+    )
+    
+    subprocess.run([sys.executable, "-c", script, str(tmp_path / "version")], check=True, cwd=BACKEND_DIR)
+    
+    assert channel.read() == 3
+
+
+def test_save_publishes_a_version_other_loaders_see(data_loader, tmp_path):
+    other_worker = DataLoader(str(tmp_path))
+    other_worker.load_product_catalog()
+    
+    data_loader.save_product_catalog(data_loader.load_product_catalog()[:1])
+    
+    assert other_worker.shared_catalog_version() == data_loader.catalog_version
+    assert other_worker.catalog_version < data_loader.catalog_version
+    
+    other_worker.reload(other_worker.shared_catalog_version())
+    
+    assert other_worker.catalog_version == data_loader.catalog_version
+    assert len(other_worker.load_product_catalog()) == 1
+
+
+def _watch(watcher, until):
+    async def run():
+        watcher.start()
+        try:
+            for _ in range(200):
+                if until():
+                    return
+                await asyncio.sleep(0.01)
+        finally:
+            await watcher.stop()
+    asyncio.run(run())
+
+
+def test_watcher_reloads_a_stale_loader(data_loader, tmp_path):
+    other_worker = DataLoader(str(tmp_path))
+    served = other_worker.load_product_catalog()
+    watcher = CatalogWatcher(other_worker, poll_interval=0.01, stagger=0)
+    
+    product = dict(copy.deepcopy(served[0]), id="published-elsewhere")
+    data_loader.save_product_catalog(data_loader.load_product_catalog() + [product])
+    _watch(watcher, lambda: watcher.reloads)
+    
+    assert watcher.reloads == 1
+    assert other_worker.catalog_version == data_loader.catalog_version
+    assert other_worker.load_product_catalog()[-1]["id"] == "published-elsewhere"
+    assert watcher.stats()["serving_version"] == watcher.stats()["published_version"]
+
+
+def test_watcher_keeps_serving_when_a_reload_fails(data_loader, tmp_path):
+    other_worker = DataLoader(str(tmp_path))
+    served = other_worker.load_product_catalog()
+    watcher = CatalogWatcher(other_worker, poll_interval=0.01, stagger=0)
+    
+    data_loader.save_product_catalog(data_loader.load_product_catalog())
+    other_worker.product_catalog_path.write_text("{not json")
+    _watch(watcher, lambda: watcher.last_error)
+    
+    assert watcher.last_error
+    assert watcher.reloads == 0
+    assert other_worker.load_product_catalog() is served
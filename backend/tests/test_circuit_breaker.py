@@ -0,0 +1,151 @@
+from types import SimpleNamespace
+import asyncio
+import time
+
+import pytest
+
+from app.services import circuit_breaker
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+from app.services.llm_backends import GeminiBackend, HEDGE_MIN_SAMPLES
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def test_stays_closed_below_min_calls():
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_calls=5)
+    
+    for _ in range(4):
+        assert breaker.allow()
+        breaker.record(False, 0.1)
+    
+    assert breaker.state == CLOSED
+
+
+def test_opens_at_failure_rate_and_fails_fast(clock):
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_calls=4, open_seconds=30)
+    for success in (True, False, True, False):
+        breaker.allow()
+        breaker.record(success, 0.1)
+    
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+    assert breaker.stats()["retry_in_seconds"] == 30
+
+
+def test_slow_calls_count_as_bad():
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_calls=2, slow_call_seconds=1.0)
+    
+    for _ in range(2):
+        breaker.allow()
+        breaker.record(True, 5.0)
+    
+    assert breaker.state == OPEN
+
+
+def test_single_probe_after_open_period(clock):
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_calls=1, open_seconds=30)
+    breaker.allow()
+    breaker.record(False, 0.1)
+    
+    clock.now += 30
+    
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_probe_success_closes_and_failure_reopens(clock):
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_calls=1, open_seconds=30)
+    breaker.allow()
+    breaker.record(False, 0.1)
+    
+    clock.now += 30
+    breaker.allow()
+    breaker.record(False, 0.1)
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+    
+    clock.now += 30
+    breaker.allow()
+    breaker.record(True, 0.1)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 0
+
+
+def test_released_probe_lets_the_next_one_through(clock):
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_calls=1, open_seconds=30)
+    breaker.allow()
+    breaker.record(False, 0.1)
+    clock.now += 30
+    assert breaker.allow()
+    
+    breaker.release()
+    
+    assert breaker.allow()
+
+
+class _FakeGemini(GeminiBackend):
+    """GeminiBackend whose client answers from a list of (delay, result) pairs"""
+    
+    def __init__(self, responses, **kwargs):
+        super().__init__(api_key="", model_name="test", **kwargs)
+        self.responses = list(responses)
+    
+    def _generate_sync(self, prompt: str) -> str:
+        delay, result = self.responses.pop(0)
+        time.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_open_circuit_is_not_attempted():
+    backend = _FakeGemini([], breaker=CircuitBreaker("test", min_calls=1))
+    backend.breaker.record(False, 0.1)
+    
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(backend.generate("prompt"))
+
+
+def test_failures_are_recorded_on_the_breaker():
+    backend = _FakeGemini(
+        [(0, RuntimeError("boom"))] * 2, breaker=CircuitBreaker("test", failure_rate=0.5, min_calls=2)
+    )
+    
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            asyncio.run(backend.generate("prompt"))
+    
+    assert backend.breaker.state == OPEN
+
+
+def test_hedge_waits_for_warm_latencies():
+    backend = _FakeGemini([], hedging=True, hedge_min_delay=0.01)
+    assert backend.hedge_delay() is None
+    
+    backend._latencies.extend([0.02] * HEDGE_MIN_SAMPLES)
+    
+    assert backend.hedge_delay() == 0.02
+
+
+def test_slow_call_is_hedged_and_second_attempt_wins():
+    backend = _FakeGemini([(0.5, "slow"), (0, "fast")], hedging=True, hedge_min_delay=0.01)
+    backend._latencies.extend([0.01] * HEDGE_MIN_SAMPLES)
+    
+    assert asyncio.run(backend.generate("prompt")) == "fast"
+    assert backend.hedged == 1
+    assert backend.hedge_wins == 1
@@ -0,0 +1,89 @@
+import time
+
+import pytest
+
+from app.services.command_cache import CommandCache, is_cacheable
+
+STATUS = {"command": "system_status", "parameters": {}, "reasoning": "Asked for status"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CommandCache(str(tmp_path / "cache.db"), ttl_seconds=60, max_entries=3)
+
+
+def test_round_trip_uses_normalized_message(cache):
+    assert cache.put("Show the system status", STATUS)
+    
+    assert cache.get("  please show the SYSTEM status?") == STATUS
+    assert cache.get("git log") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_entries_are_misses(cache, monkeypatch):
+    cache.put("status", STATUS)
+    
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    
+    assert cache.get("status") is None
+    assert cache.entries() == []
+
+
+def test_least_recently_used_are_pruned(cache):
+    for message in ("one", "two", "three"):
+        cache.put(message, STATUS)
+    cache.get("one")
+    
+    cache.put("four", STATUS)
+    
+    assert {entry["key"] for entry in cache.entries()} == {"one", "three", "four"}
+
+
+def test_hits_are_flushed_before_listing(cache):
+    cache.put("status", STATUS)
+    cache.get("status")
+    cache.get("status")
+    
+    [entry] = cache.entries()
+    
+    assert entry["hits"] == 2
+    assert entry["last_used_at"] >= entry["created_at"]
+
+
+def test_cache_is_shared_through_the_file(cache, tmp_path):
+    cache.put("status", STATUS)
+    cache.get("status")
+    
+    other = CommandCache(str(tmp_path / "cache.db"))
+    
+    assert other.get("status") == STATUS
+
+
+def test_clear(cache):
+    cache.put("status", STATUS)
+    cache.put("git log", {"command": "git_log", "parameters": {}})
+    
+    assert cache.clear() == 2
+    assert cache.get("status") is None
+
+
+@pytest.mark.parametrize("command_data, cacheable", [
+    (STATUS, True),
+    ({"command": "git_log", "parameters": {"count": 5}}, True),
+    ({"command": "system_status"}, False),
+    ({"command": "delete_product", "parameters": {"id": "macbook-air-m2"}}, True),
+    ({"command": "delete_product", "parameters": {"id": ""}}, False),
+    ({"command": "update_product", "parameters": {"id": "macbook-air-m2"}}, False),
+    ({"command": "update_product", "parameters": {"id": "macbook-air-m2", "name": "MacBook Air"}}, True),
+    ({"command": "add_product", "parameters": {"id": "foo", "name": "Foo"}}, False),
+    ({"command": "unknown", "parameters": {}}, False)
+])
+def test_is_cacheable(command_data, cacheable):
+    assert is_cacheable(command_data) is cacheable
+
+
+def test_unsafe_interpretations_are_not_stored(cache):
+    assert not cache.put("update macbook", {"command": "update_product", "parameters": {"id": "macbook-air-m2"}})
+    assert cache.stats()["size"] == 0
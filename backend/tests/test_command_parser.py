@@ -0,0 +1,75 @@
+import pytest
+
+from app.services.admin_processes import MAX_GIT_LOG_COUNT
+from app.services.command_parser import CommandParser
+
+
+@pytest.fixture
+def parser():
+    return CommandParser()
+
+
+@pytest.mark.parametrize("message", [
+    "status",
+    "Show the system status",
+    "What's the system health?",
+    "hey, how is the system doing",
+    "Please check status."
+])
+def test_status_phrasings(parser, message):
+    assert parser.parse(message)["command"] == "system_status"
+
+
+@pytest.mark.parametrize("message, command", [
+    ("git status", "git_status"),
+    ("any uncommitted changes?", "git_status"),
+    ("run the tests", "run_tests"),
+    ("show me the catalog", "catalog_info")
+])
+def test_read_only_commands(parser, message, command):
+    assert parser.parse(message)["command"] == command
+
+
+def test_git_log_count(parser):
+    assert parser.parse("show the last 5 commits")["parameters"] == {"count": 5}
+    assert parser.parse("git log")["parameters"] == {}
+    assert parser.parse(f"last {MAX_GIT_LOG_COUNT} commits")["parameters"] == {"count": MAX_GIT_LOG_COUNT}
+
+
+@pytest.mark.parametrize("count", [0, MAX_GIT_LOG_COUNT + 1])
+def test_git_log_count_out_of_range_goes_to_llm(parser, count):
+    assert parser.parse(f"show the last {count} commits") is None
+
+
+def test_catalog_kind(parser):
+    assert parser.parse("how many ai tools are there")["parameters"] == {"kind": "ai_tools"}
+    assert parser.parse("list products")["parameters"] == {"kind": "products"}
+    assert parser.parse("show products and tools")["parameters"] == {}
+
+
+@pytest.mark.parametrize("message", [
+    "remove tool openai-gpt4",
+    "delete product macbook-air-m2",
+    "add a new product called Foo",
+    "update the price of macbook-air-m2",
+    "status and git log"
+])
+def test_mutations_and_ambiguous_messages_go_to_llm(parser, message):
+    assert parser.parse(message) is None
+
+
+def test_ambiguous_rules_are_not_resolved():
+    parser = CommandParser([
+        ("system_status", r'status', lambda match: {}),
+        ("git_status", r'status', lambda match: {})
+    ])
+    
+    assert parser.parse("status") is None
+
+
+def test_stats_count_fast_path(parser):
+    parser.parse("status")
+    parser.parse("remove tool openai-gpt4")
+    parser.match("status")
+    
+    assert parser.stats() == {"messages": 2, "fast_path": 1, "fast_path_ratio": 0.5}
@@ -0,0 +1,66 @@
+import time
+
+from app.models import CompanyMatchRequest, COMPANY_RESPONSE_SECTIONS
+from app.services import match_pipeline
+from app.services.analyze_intent import IntentAnalyzer
+from app.services.cross_reference import CrossReferenceEngine
+
+
+def _company_intent(friction_point="Customer support latency issues with repetitive questions"):
+    return IntentAnalyzer().analyze_company_intent(friction_point, company_size="medium")
+
+
+def test_generous_deadline_scores_like_no_deadline(data_loader):
+    engine = CrossReferenceEngine()
+    intent = _company_intent()
+    tools = data_loader.load_ai_tools_catalog()
+    
+    assert engine.score_ai_tools(intent, tools, time.perf_counter() + 60) == engine.score_ai_tools(intent, tools)
+
+
+def test_passed_deadline_scores_one_compatible_tool(data_loader):
+    engine = CrossReferenceEngine()
+    intent = _company_intent()
+    tools = data_loader.load_ai_tools_catalog()
+    
+    matches = engine.score_ai_tools(intent, tools, time.perf_counter() - 1)
+    
+    assert len(matches) == 1
+    [(tool, score)] = matches
+    assert engine._tool_priority(intent, tool) == 0
+    assert score == engine.score_ai_tools(intent, [tool])[0][1]
+
+
+def test_partial_scoring_keeps_catalog_order(data_loader):
+    engine = CrossReferenceEngine()
+    intent = _company_intent()
+    tools = data_loader.load_ai_tools_catalog()
+    calls = 0
+    score_tool = engine._score_tool
+    
+    def slow_after_two(intent_analysis, tool):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            time.sleep(0.02)
+        return score_tool(intent_analysis, tool)
+    
+    engine._score_tool = slow_after_two
+    matches = engine.score_ai_tools(intent, tools, time.perf_counter() + 0.01)
+    
+    assert len(matches) == 2
+    positions = [tools.index(tool) for tool, _ in matches]
+    assert positions == sorted(positions)
+
+
+def test_run_match_flags_partial_only_with_a_budget(data_loader):
+    request = CompanyMatchRequest(friction_point="Automate our code reviews", company_size="startup")
+    sections = frozenset(COMPANY_RESPONSE_SECTIONS)
+    
+    assert 'partial' not in match_pipeline.run_company_match(request, sections)
+    assert match_pipeline.run_company_match(request, sections, deadline=time.perf_counter() + 60)['partial'] is False
+    
+    spent = match_pipeline.run_company_match(request, sections, deadline=time.perf_counter() - 1)
+    assert spent['partial'] is True
+    assert len(spent['recommendations']) == 1
+    assert 'deployment_guide' not in spent['recommendations'][0]
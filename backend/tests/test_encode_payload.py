@@ -0,0 +1,79 @@
+import time
+
+import orjson
+import pytest
+
+from app.models import (
+    CompanyMatchRequest,
+    IndividualMatchRequest,
+    CompanyMatchResponse,
+    IndividualMatchResponse,
+    AIToolRecommendation,
+    ProductRecommendation,
+    COMPANY_RESPONSE_SECTIONS,
+    INDIVIDUAL_RESPONSE_SECTIONS
+)
+from app.routers import matching
+from app.routers.matching import encode_payload, parse_include
+from app.services import match_pipeline
+
+INCLUDES = [None, 'all', 'none', 'reasoning', 'technical_truth,reasoning']
+
+TRACKS = {
+    'company': (
+        CompanyMatchRequest(friction_point="Customer support latency issues with repetitive questions"),
+        match_pipeline.run_company_match, COMPANY_RESPONSE_SECTIONS, CompanyMatchResponse, AIToolRecommendation
+    ),
+    'individual': (
+        IndividualMatchRequest(need="A quiet laptop for video editing on the go"),
+        match_pipeline.run_individual_match, INDIVIDUAL_RESPONSE_SECTIONS, IndividualMatchResponse,
+        ProductRecommendation
+    )
+}
+
+
+@pytest.fixture(autouse=True)
+def no_debug_validation(monkeypatch):
+    # Production path: encode_payload does not validate by itself
+    monkeypatch.setattr(matching.settings, 'debug', False)
+
+
+def _check(body, model, recommendation_model):
+    response = model.model_validate_json(body)
+    payload = orjson.loads(body)
+    # Validation ignores unknown keys; drift in names must fail too
+    assert set(payload) <= set(model.model_fields)
+    for recommendation in payload['recommendations']:
+        assert set(recommendation) <= set(recommendation_model.model_fields)
+    return response
+
+
+@pytest.mark.parametrize('track', TRACKS)
+@pytest.mark.parametrize('include', INCLUDES)
+def test_payload_matches_response_model(data_loader, track, include):
+    request, run_match, available, model, recommendation_model = TRACKS[track]
+    sections = parse_include(include, available)
+    
+    body = encode_payload(run_match(request, sections, top_k=3), model)
+    
+    response = _check(body, model, recommendation_model)
+    assert len(response.recommendations) == 3
+    assert response.partial is None
+
+
+@pytest.mark.parametrize('track', TRACKS)
+def test_every_single_section_matches_response_model(data_loader, track):
+    request, run_match, available, model, recommendation_model = TRACKS[track]
+    
+    for section in available:
+        body = encode_payload(run_match(request, frozenset([section]), top_k=2), model)
+        _check(body, model, recommendation_model)
+
+
+@pytest.mark.parametrize('track', TRACKS)
+def test_partial_payload_matches_response_model(data_loader, track):
+    request, run_match, available, model, recommendation_model = TRACKS[track]
+    
+    body = encode_payload(run_match(request, frozenset(available), top_k=3, deadline=time.perf_counter() - 1), model)
+    
+    assert _check(body, model, recommendation_model).partial is True
@@ -0,0 +1,129 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from app.models import CompanyMatchRequest
+from app.routers import matching
+from app.services import match_pipeline
+from app.services.analyze_intent import IntentAnalyzer, IncrementalIntentState
+
+COMPANY_TEXT = (
+    "Our customer support team drowns in repetitive tickets; we need real-time automation "
+    "with high accuracy, on-premise for compliance, and integration with our CRM"
+)
+INDIVIDUAL_TEXT = "I need a portable laptop for video editing and gaming that runs all day on battery"
+
+
+def _full(analyzer, track, text, **kwargs):
+    if track == 'company':
+        return analyzer.analyze_company_intent(text, **kwargs)
+    return analyzer.analyze_individual_intent(text, **kwargs)
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize('track, text', [('company', COMPANY_TEXT), ('individual', INDIVIDUAL_TEXT)])
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 1000])
+def test_chunked_input_matches_full_analysis(track, text, size):
+    analyzer = IntentAnalyzer()
+    state = analyzer.start_session(track)
+    
+    for chunk in _chunks(text, size):
+        state.append(chunk)
+    
+    assert state.analyze() == _full(analyzer, track, text)
+    assert state.length == len(text)
+
+
+def test_every_split_point_finds_every_keyword():
+    analyzer = IntentAnalyzer()
+    text = COMPANY_TEXT.upper()
+    expected = {keyword for keyword in analyzer.keyword_vocabulary('company') if keyword in text.lower()}
+    
+    for split in range(len(text) + 1):
+        state = analyzer.start_session('company')
+        state.append(text[:split])
+        state.append(text[split:])
+        assert state.hits == expected, split
+
+
+def test_keyword_split_across_appends_is_found_through_the_tail():
+    analyzer = IntentAnalyzer()
+    keyword = max(analyzer.keyword_vocabulary('company'), key=len)
+    state = analyzer.start_session('company')
+    
+    # Leading filler pushes the first half of the keyword into the tail only
+    assert not state.append('x' * 50 + keyword[:-1])
+    assert state.append(keyword[-1])
+    assert keyword in state.hits
+
+
+def test_context_is_passed_through():
+    analyzer = IntentAnalyzer()
+    state = analyzer.start_session('company')
+    state.append(COMPANY_TEXT)
+    
+    assert state.analyze(company_size='enterprise') == _full(
+        analyzer, 'company', COMPANY_TEXT, company_size='enterprise'
+    )
+
+
+def test_reset_forgets_earlier_text():
+    analyzer = IntentAnalyzer()
+    state = analyzer.start_session('company')
+    state.append(COMPANY_TEXT)
+    
+    state.reset()
+    state.append('need faster invoices')
+    
+    assert state.length == len('need faster invoices')
+    assert state.analyze() == _full(analyzer, 'company', 'need faster invoices')
+
+
+def test_unknown_track_is_rejected():
+    with pytest.raises(ValueError):
+        IncrementalIntentState(IntentAnalyzer(), 'team')
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(matching.router)
+    return TestClient(app)
+
+
+def test_preview_socket_ranks_like_match(data_loader, client):
+    context = {'company_size': 'medium', 'industry': 'retail', 'technical_constraints': ['on-premise']}
+    with client.websocket_connect('/match/preview?track=company') as websocket:
+        websocket.send_json({'context': context})
+        websocket.receive_json()
+        for chunk in _chunks(COMPANY_TEXT, 20):
+            websocket.send_json({'append': chunk})
+            snapshot = websocket.receive_json()
+        websocket.send_json({'append': ''})
+        unchanged = websocket.receive_json()
+    
+    request = CompanyMatchRequest(friction_point=COMPANY_TEXT, **context)
+    expected = match_pipeline.run_company_match(request, frozenset(), top_k=3)
+    assert snapshot['length'] == len(COMPANY_TEXT)
+    assert snapshot['intent_analysis'] == expected['intent_analysis']
+    assert [candidate['id'] for candidate in snapshot['candidates']] == [
+        recommendation['tool_id'] for recommendation in expected['recommendations']
+    ]
+    assert not unchanged['changed']
+
+
+def test_preview_socket_reset_and_bad_messages(data_loader, client):
+    with client.websocket_connect('/match/preview?track=individual') as websocket:
+        websocket.send_text('not json')
+        assert websocket.receive_json() == {'error': 'Expected a JSON object'}
+        
+        websocket.send_json({'append': INDIVIDUAL_TEXT})
+        websocket.receive_json()
+        websocket.send_json({'reset': True, 'append': 'gaming'})
+        snapshot = websocket.receive_json()
+    
+    assert snapshot['changed'] and snapshot['length'] == len('gaming')
+    assert snapshot['intent_analysis'] == IntentAnalyzer().analyze_individual_intent('gaming')
@@ -0,0 +1,89 @@
+import asyncio
+
+import orjson
+
+from app.models import (
+    CompanyMatchRequest,
+    IndividualMatchRequest,
+    COMPANY_RESPONSE_SECTIONS,
+    INDIVIDUAL_RESPONSE_SECTIONS
+)
+from app.routers.matching import sse_events
+from app.services import match_pipeline
+
+COMPANY_SECTIONS = frozenset(COMPANY_RESPONSE_SECTIONS)
+INDIVIDUAL_SECTIONS = frozenset(INDIVIDUAL_RESPONSE_SECTIONS)
+
+
+def _reassemble(events):
+    """Rebuild the regular endpoint's payload from streamed events"""
+    payload = {'recommendations': []}
+    for event, data in events:
+        if event == 'recommendation':
+            data = dict(data)
+            assert data.pop('rank') == len(payload['recommendations']) + 1
+            payload['recommendations'].append(data)
+        else:
+            payload.update(data)
+    return payload
+
+
+def test_company_stream_matches_regular_payload(data_loader):
+    request = CompanyMatchRequest(friction_point="Customer support latency issues with repetitive questions")
+    
+    events = list(match_pipeline.stream_company_match(request, COMPANY_SECTIONS, top_k=5))
+    
+    assert [event for event, _ in events] == ['intent'] + ['recommendation'] * 5 + ['summary']
+    assert _reassemble(events) == match_pipeline.run_company_match(request, COMPANY_SECTIONS, top_k=5)
+
+
+def test_individual_stream_matches_regular_payload(data_loader):
+    request = IndividualMatchRequest(need="A quiet laptop for video editing on the go")
+    
+    events = list(match_pipeline.stream_individual_match(request, INDIVIDUAL_SECTIONS, top_k=5))
+    
+    assert events[0][0] == 'intent' and events[-1][0] == 'summary'
+    assert _reassemble(events) == match_pipeline.run_individual_match(
+        request, INDIVIDUAL_SECTIONS, top_k=5
+    )
+
+
+def test_stream_honours_sections(data_loader):
+    request = CompanyMatchRequest(friction_point="Customer support latency issues with repetitive questions")
+    sections = frozenset()
+    
+    events = list(match_pipeline.stream_company_match(request, sections, top_k=2))
+    
+    assert _reassemble(events) == match_pipeline.run_company_match(request, sections, top_k=2)
+
+
+def _collect(track, events):
+    async def collect():
+        return [message async for message in sse_events(track, events)]
+    return asyncio.run(collect())
+
+
+def _decode(message):
+    event_line, data_line = message.decode().strip().split('\n')
+    return event_line[len('event: '):], orjson.loads(data_line[len('data: '):])
+
+
+def test_sse_events_encode_every_event_then_done(data_loader):
+    request = CompanyMatchRequest(friction_point="Customer support latency issues with repetitive questions")
+    
+    messages = _collect('company', match_pipeline.stream_company_match(request, COMPANY_SECTIONS, 3))
+    
+    decoded = [_decode(message) for message in messages]
+    assert [event for event, _ in decoded] == ['intent'] + ['recommendation'] * 3 + ['summary', 'done']
+    assert decoded[-1][1] == {'recommendations': 3}
+
+
+def test_pipeline_failure_ends_with_error_event():
+    def events():
+        yield 'intent', {'intent_analysis': {}}
+        raise RuntimeError("catalog missing")
+    
+    decoded = [_decode(message) for message in _collect('company', events())]
+    
+    assert [event for event, _ in decoded] == ['intent', 'error']
+    assert 'catalog missing' in decoded[-1][1]['detail']
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import re
+
+import pytest
+
+from app.services.llm_backends import GeminiBackend, InterpretationError, LLMBackend, MicroBatcher
+
+
+class _EchoBackend(LLMBackend):
+    """Answers each message with itself and records every call"""
+    
+    name = "echo"
+    supports_batching = True
+    
+    def __init__(self, fail_batches: bool = False):
+        self.fail_batches = fail_batches
+        self.calls = []
+    
+    async def interpret(self, message, context):
+        self.calls.append(("single", context, [message]))
+        return {"command": message, "parameters": {"context": context}}
+    
+    async def interpret_batch(self, messages, context):
+        self.calls.append(("batch", context, list(messages)))
+        if self.fail_batches:
+            raise InterpretationError("Answer ids do not match the requests")
+        return [{"command": message, "parameters": {"context": context}} for message in messages]
+
+
+def _interpret_all(batcher, requests):
+    async def run():
+        return await asyncio.gather(*(batcher.interpret(message, context) for message, context in requests))
+    return asyncio.run(run())
+
+
+def test_batches_never_mix_contexts():
+    backend = _EchoBackend()
+    batcher = MicroBatcher(backend, max_batch_size=8, max_wait_ms=5)
+    
+    results = _interpret_all(batcher, [("a1", "A"), ("b1", "B"), ("a2", "A"), ("b2", "B"), ("a3", "A")])
+    
+    assert [result["command"] for result in results] == ["a1", "b1", "a2", "b2", "a3"]
+    assert all(result["parameters"]["context"] == result["command"][0].upper() for result in results)
+    assert sorted(backend.calls) == [("batch", "A", ["a1", "a2", "a3"]), ("batch", "B", ["b1", "b2"])]
+    assert batcher.stats()["batches"] == 2
+
+
+def test_full_batch_is_sent_at_once():
+    backend = _EchoBackend()
+    batcher = MicroBatcher(backend, max_batch_size=2, max_wait_ms=10000)
+    
+    results = _interpret_all(batcher, [("m1", "A"), ("m2", "A")])
+    
+    assert [result["command"] for result in results] == ["m1", "m2"]
+    assert backend.calls == [("batch", "A", ["m1", "m2"])]
+
+
+def test_unsplittable_batch_answer_falls_back_to_single_calls():
+    backend = _EchoBackend(fail_batches=True)
+    batcher = MicroBatcher(backend, max_batch_size=8, max_wait_ms=5)
+    
+    results = _interpret_all(batcher, [("m1", "A"), ("m2", "A")])
+    
+    assert [result["command"] for result in results] == ["m1", "m2"]
+    assert [kind for kind, _, _ in backend.calls] == ["batch", "single", "single"]
+
+
+def test_backends_without_batching_are_called_directly():
+    backend = _EchoBackend()
+    backend.supports_batching = False
+    batcher = MicroBatcher(backend, max_batch_size=8, max_wait_ms=5)
+    
+    _interpret_all(batcher, [("m1", "A"), ("m2", "A")])
+    
+    assert backend.calls == [("single", "A", ["m1"]), ("single", "A", ["m2"])]
+    assert batcher.stats()["batches"] == 0
+
+
+class _ScriptedGemini(GeminiBackend):
+    """GeminiBackend answering batch prompts with ``answer(ids)``"""
+    
+    def __init__(self, answer):
+        super().__init__(api_key="", model_name="test")
+        self.answer = answer
+    
+    async def generate(self, prompt):
+        ids = re.findall(r'"id": "([0-9a-f]{8})"', prompt)
+        return json.dumps(self.answer(ids))
+
+
+def _batch(backend, messages):
+    return asyncio.run(backend.interpret_batch(messages, "context"))
+
+
+def test_batch_answers_are_matched_by_id():
+    backend = _ScriptedGemini(lambda ids: [
+        {"id": request_id, "command": f"command_{i}", "parameters": {}}
+        for i, request_id in reversed(list(enumerate(ids)))
+    ])
+    
+    results = _batch(backend, ["first", "second", "third"])
+    
+    assert [result["command"] for result in results] == ["command_0", "command_1", "command_2"]
+
+
+@pytest.mark.parametrize("answer", [
+    lambda ids: [{"id": request_id, "command": "system_status", "parameters": {}} for request_id in ids[:-1]],
+    lambda ids: [{"id": "deadbeef", "command": "system_status", "parameters": {}} for _ in ids],
+    lambda ids: [{"id": ids[0], "command": "system_status", "parameters": {}} for _ in ids],
+    lambda ids: {"command": "system_status", "parameters": {}}
+])
+def test_mismatched_batch_answers_are_rejected(answer):
+    with pytest.raises(InterpretationError):
+        _batch(_ScriptedGemini(answer), ["first", "second"])
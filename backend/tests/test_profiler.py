@@ -0,0 +1,20 @@
+import pytest
+from pydantic import ValidationError
+
+from app.services.profiler import RequestProfiler
+from config import Settings
+
+
+@pytest.mark.parametrize("keep, kept", [(2, 2), (1, 1), (0, 1)])
+def test_only_the_newest_reports_are_kept(tmp_path, keep, kept):
+    profiler = RequestProfiler(str(tmp_path), keep=keep)
+    
+    report_ids = [profiler.run(sum, [1, 2])[1] for _ in range(4)]
+    
+    assert [report["id"] for report in profiler.list_reports()] == report_ids[::-1][:kept]
+    assert profiler.report(report_ids[-1]) is not None
+
+
+def test_profile_keep_must_be_positive():
+    with pytest.raises(ValidationError):
+        Settings(profile_keep=0)
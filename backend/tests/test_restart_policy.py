@@ -0,0 +1,52 @@
+from app.server import RestartPolicy
+
+
+def _policy(**kwargs):
+    settings = dict(delay=1.0, max_delay=8.0, max_restarts=10, window=60.0)
+    settings.update(kwargs)
+    return RestartPolicy(**settings)
+
+
+def test_delay_doubles_up_to_the_cap():
+    policy = _policy()
+    
+    delays = [policy.next_delay(0, uptime=1.0, now=float(i)) for i in range(6)]
+    
+    assert delays == [1.0, 2.0, 4.0, 8.0, 8.0, 8.0]
+
+
+def test_a_worker_that_ran_for_the_window_starts_over():
+    policy = _policy()
+    policy.next_delay(0, uptime=1.0, now=0.0)
+    policy.next_delay(0, uptime=1.0, now=1.0)
+    
+    assert policy.next_delay(0, uptime=60.0, now=100.0) == 1.0
+    assert policy.next_delay(0, uptime=1.0, now=101.0) == 2.0
+
+
+def test_workers_back_off_independently():
+    policy = _policy()
+    policy.next_delay(0, uptime=1.0, now=0.0)
+    policy.next_delay(0, uptime=1.0, now=1.0)
+    
+    assert policy.next_delay(1, uptime=1.0, now=2.0) == 1.0
+
+
+def test_crash_loop_is_given_up_past_max_restarts():
+    policy = _policy(max_restarts=3, window=60.0)
+    
+    delays = [policy.next_delay(0, uptime=1.0, now=float(i)) for i in range(4)]
+    
+    assert delays[:3] == [1.0, 2.0, 4.0]
+    assert delays[3] == -1
+
+
+def test_crashes_outside_the_window_do_not_count():
+    policy = _policy(max_restarts=3, window=60.0)
+    for now in (0.0, 1.0, 2.0):
+        policy.next_delay(0, uptime=1.0, now=now)
+    
+    # The first crash has left the window, so this is the third within it
+    assert policy.next_delay(0, uptime=1.0, now=60.0) >= 0
+    assert policy.next_delay(0, uptime=1.0, now=61.5) >= 0
+    assert policy.next_delay(0, uptime=1.0, now=61.8) == -1
@@ -0,0 +1,69 @@
+import asyncio
+
+from app.services.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_execution():
+    single_flight = SingleFlight()
+    runs = 0
+    
+    async def compute():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.01)
+        return "result"
+    
+    async def main():
+        return await asyncio.gather(*(single_flight.do("key", compute) for _ in range(5)))
+    
+    assert asyncio.run(main()) == ["result"] * 5
+    assert runs == 1
+    assert single_flight.stats()["coalesced"] == 4
+    assert not single_flight.is_in_flight("key")
+
+
+def test_different_keys_run_separately():
+    single_flight = SingleFlight()
+    
+    async def main():
+        return await asyncio.gather(
+            single_flight.do("a", lambda: asyncio.sleep(0, result="a")),
+            single_flight.do("b", lambda: asyncio.sleep(0, result="b"))
+        )
+    
+    assert asyncio.run(main()) == ["a", "b"]
+    assert single_flight.executions == 2
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    single_flight = SingleFlight()
+    
+    async def compute():
+        await asyncio.sleep(0.02)
+        return 42
+    
+    async def main():
+        first = asyncio.ensure_future(single_flight.do("key", compute))
+        second = asyncio.ensure_future(single_flight.do("key", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+    
+    assert asyncio.run(main()) == 42
+
+
+def test_failure_reaches_every_caller_and_is_not_cached():
+    single_flight = SingleFlight()
+    
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+    
+    async def main():
+        results = await asyncio.gather(
+            single_flight.do("key", fail), single_flight.do("key", fail), return_exceptions=True
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+        return await single_flight.do("key", lambda: asyncio.sleep(0, result="ok"))
+    
+    assert asyncio.run(main()) == "ok"
@@ -0,0 +1,130 @@
+import time
+
+import pytest
+
+from app.services import match_pipeline
+from app.services.analyze_intent import IntentAnalyzer
+from app.services.cross_reference import CrossReferenceEngine, get_cross_reference_engine
+from app.services.text_similarity import TextSimilarity, item_text
+
+CATALOG = [
+    {'id': 'support', 'use_cases': ['Customer support automation', 'Ticket triage']},
+    {'id': 'code', 'use_cases': ['Code review', 'Refactoring legacy code']},
+    {'id': 'docs', 'technical_truth': {'strength': 'Searching internal documentation'}},
+    {'id': 'support', 'use_cases': ['Video editing']},
+]
+
+
+def test_item_text_joins_fields_and_flattens_lists():
+    item = {'use_cases': ['a', 'b', 3], 'technical_truth': {'strength': 'c'}}
+    
+    assert item_text(item, (('use_cases',), ('technical_truth', 'strength'), ('missing',))) == 'a b c'
+
+
+def test_similarities_are_bounded_and_rank_the_relevant_item_first():
+    similarity = TextSimilarity()
+    
+    scores = similarity.similarities('ai_tools', CATALOG, 1, 'automate customer support tickets')
+    
+    assert len(scores) == len(CATALOG)
+    assert all(0.0 <= score <= 1.0 for score in scores)
+    assert scores.index(max(scores)) == 0
+    assert scores[1] == 0.0
+
+
+def test_first_duplicate_id_wins_for_item_lookups():
+    similarity = TextSimilarity()
+    text = 'automate customer support tickets'
+    full = similarity.similarities('ai_tools', CATALOG, 1, text)
+    
+    scores = similarity.similarities('ai_tools', CATALOG, 1, text, items=[{'id': 'support'}, {'id': 'unknown'}])
+    
+    assert scores == [full[0], 0.0]
+
+
+def test_model_is_fitted_once_per_catalog_version():
+    similarity = TextSimilarity()
+    
+    similarity.similarities('ai_tools', CATALOG, 1, 'code review')
+    similarity.similarities('ai_tools', CATALOG, 1, 'documentation')
+    assert similarity.fits == 1
+    
+    similarity.similarities('ai_tools', CATALOG, 2, 'code review')
+    assert similarity.fits == 2
+
+
+def test_blank_text_or_unusable_catalog_gives_none():
+    similarity = TextSimilarity()
+    
+    assert similarity.similarities('ai_tools', CATALOG, 1, '   ') is None
+    assert similarity.similarities('ai_tools', [], 1, 'code review') is None
+    assert not similarity.fit('ai_tools', [{'id': 'empty'}], 1)
+
+
+def test_deadline_never_waits_for_a_fit():
+    similarity = TextSimilarity()
+    fitted = []
+    similarity._fit_in_background = lambda kind, catalog, version: fitted.append((kind, version))
+    
+    assert similarity.similarities('ai_tools', CATALOG, 1, 'code review', deadline=time.perf_counter() + 60) is None
+    assert fitted == [('ai_tools', 1)]
+    assert similarity.fits == 0
+    assert similarity.stats()['skipped'] == 1
+
+
+def test_deadline_uses_a_fitted_model_while_time_is_left():
+    similarity = TextSimilarity()
+    similarity.fit('ai_tools', CATALOG, 1)
+    
+    assert similarity.similarities('ai_tools', CATALOG, 1, 'code review', deadline=time.perf_counter() + 60)
+    assert similarity.similarities('ai_tools', CATALOG, 1, 'code review', deadline=time.perf_counter() - 1) is None
+
+
+def test_background_fit_makes_later_requests_use_similarity():
+    similarity = TextSimilarity()
+    similarity.similarities('ai_tools', CATALOG, 1, 'code review', deadline=time.perf_counter() + 60)
+    
+    deadline = time.monotonic() + 10
+    while similarity.fits == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    
+    assert similarity.similarities('ai_tools', CATALOG, 1, 'code review', deadline=time.perf_counter() + 60)
+
+
+def test_blend_weights_score_and_similarity():
+    engine = CrossReferenceEngine(text_similarity_weight=0.25)
+    
+    assert engine._blend(0.8, 0.4) == pytest.approx(0.7)
+    assert CrossReferenceEngine()._blend(0.8, 0.4) == 0.8
+
+
+def test_similarities_are_blended_into_tool_scores(data_loader):
+    intent = IntentAnalyzer().analyze_company_intent("Customer support latency issues with repetitive questions")
+    tools = data_loader.load_ai_tools_catalog()
+    engine = CrossReferenceEngine(text_similarity_weight=0.5)
+    similarities = [1.0 if i == len(tools) - 1 else 0.0 for i in range(len(tools))]
+    
+    blended = engine.score_ai_tools(intent, tools, similarities=similarities)
+    plain = CrossReferenceEngine().score_ai_tools(intent, tools)
+    
+    for (_, score), (_, base), similarity in zip(blended, plain, similarities):
+        assert score == pytest.approx(engine._blend(base, similarity), abs=1e-3)
+
+
+def test_pipeline_skips_similarity_at_zero_weight(data_loader, monkeypatch):
+    monkeypatch.setattr(get_cross_reference_engine(), 'text_similarity_weight', 0.0)
+    
+    assert match_pipeline.text_similarities('ai_tools', 'customer support') is None
+
+
+def test_pipeline_marks_skipped_similarity_as_partial(data_loader, monkeypatch):
+    monkeypatch.setattr(get_cross_reference_engine(), 'text_similarity_weight', 0.3)
+    monkeypatch.setattr(match_pipeline, 'get_text_similarity', lambda: TextSimilarity())
+    intent = IntentAnalyzer().analyze_company_intent("Customer support latency issues with repetitive questions")
+    
+    matches, partial = match_pipeline.rank_ai_tools(
+        intent, 3, time.perf_counter() + 60, "Customer support latency issues with repetitive questions"
+    )
+    
+    assert partial
+    assert len(matches) == 3